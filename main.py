@@ -1,18 +1,35 @@
+import os
+import sys
+
+# Headless runs (CI, profiling nodes) use SDL's dummy video/audio drivers;
+# these must be set before pygame initializes
+HEADLESS = "--headless" in sys.argv
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 import pygame
 import numpy as np
-import sounddevice as sd
+try:
+    import sounddevice as sd
+except (ImportError, OSError):  # no PortAudio on this machine
+    sd = None
 import math
-from collections import deque
+from collections import deque, defaultdict, OrderedDict
 from scipy import signal, fft
+from scipy.io import wavfile
 import json
 import datetime
-import os
 import random
 import csv
 import time
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Tuple, Optional
 import threading
+import heapq
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
 
 # ============================================================================
 # CONFIGURATION & CONSTANTS
@@ -46,6 +63,105 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
 pygame.display.set_caption("Advanced Naval Acoustic Radar - Multi-Mode System v2.0")
 clock = pygame.time.Clock()
 
+class SimulationClock:
+    """Fixed-step simulation time, decoupled from the render frame rate"""
+    
+    def __init__(self, update_hz=60, max_frame_time=0.25, time_scale=1.0):
+        self.update_hz = update_hz
+        self.step_seconds = 1.0 / update_hz
+        self.max_frame_time = max_frame_time  # clamp after stalls and pauses
+        self.time_scale = time_scale  # > 1 runs replays faster than real time
+        self.epoch = time.time()
+        self.sim_seconds = 0.0
+        self.accumulator = 0.0
+        self.alpha = 0.0  # render position between the last two steps (0..1)
+        self.steps = 0
+        self.last_real = None
+    
+    def now(self):
+        """Simulation time in seconds, anchored so it reads like time.time()"""
+        return self.epoch + self.sim_seconds
+    
+    def ticks(self):
+        """Simulation time in milliseconds since start, like pygame.time.get_ticks()"""
+        return int(self.sim_seconds * 1000)
+    
+    def advance(self, real_dt=None):
+        """Feed elapsed real time (measured if not given); returns the number of steps due"""
+        real_now = time.perf_counter()
+        if real_dt is None:
+            real_dt = 0.0 if self.last_real is None else real_now - self.last_real
+        self.last_real = real_now
+        
+        self.accumulator += min(real_dt, self.max_frame_time) * self.time_scale
+        steps = int(self.accumulator / self.step_seconds + 1e-9)
+        self.accumulator = max(0.0, self.accumulator - steps * self.step_seconds)
+        self.alpha = min(1.0, self.accumulator / self.step_seconds)
+        return steps
+    
+    def hold(self):
+        """Don't count real time until the next advance (used while paused)"""
+        self.last_real = None
+        self.accumulator = 0.0
+    
+    def step(self):
+        """Move simulation time forward by one fixed step"""
+        self.sim_seconds += self.step_seconds
+        self.steps += 1
+    
+    def set_time_scale(self, time_scale):
+        self.time_scale = max(0.0, time_scale)
+
+# Initialize simulation clock (every component reads time from here)
+sim_clock = SimulationClock(FPS)
+
+# ============================================================================
+# BEARING LOOKUP TABLE
+# ============================================================================
+# Bearings are compass degrees (0 = north, clockwise). Screen y grows downward,
+# so a bearing points along (sin, -cos) on screen - the old cos(b - 90),
+# sin(b - 90) form - and along (sin, cos) as world (east, north).
+
+BEARING_LUT_RESOLUTION = 0.1  # degrees
+BEARING_LUT_SIZE = int(round(360 / BEARING_LUT_RESOLUTION))
+BEARING_SIN = np.sin(np.radians(np.arange(BEARING_LUT_SIZE) * BEARING_LUT_RESOLUTION))
+BEARING_COS = np.cos(np.radians(np.arange(BEARING_LUT_SIZE) * BEARING_LUT_RESOLUTION))
+BEARING_SIN_LIST = BEARING_SIN.tolist()  # plain floats for scalar lookups
+BEARING_COS_LIST = BEARING_COS.tolist()
+
+def bearing_index(bearing):
+    """Table index for a bearing in degrees (scalar or array, any range)"""
+    if np.ndim(bearing):
+        steps = np.rint(np.nan_to_num(np.asarray(bearing, dtype=np.float64)) / BEARING_LUT_RESOLUTION)
+        return steps.astype(np.int64) % BEARING_LUT_SIZE
+    if not math.isfinite(bearing):
+        return 0
+    return int(round(bearing / BEARING_LUT_RESOLUTION)) % BEARING_LUT_SIZE
+
+def bearing_vector(bearing):
+    """Screen-space unit vector (dx, dy) for a bearing"""
+    i = bearing_index(bearing)
+    return BEARING_SIN_LIST[i], -BEARING_COS_LIST[i]
+
+def polar_to_screen(bearing, distance, center=None, zoom=None):
+    """Screen x, y for bearing(s) in degrees and range(s) in pixels"""
+    cx, cy = RADAR_CENTER if center is None else center
+    zoom = zoom_level if zoom is None else zoom
+    i = bearing_index(bearing)
+    if np.ndim(i):
+        r = np.asarray(distance, dtype=np.float64) * zoom
+        return cx + r * BEARING_SIN[i], cy - r * BEARING_COS[i]
+    r = distance * zoom
+    return cx + r * BEARING_SIN_LIST[i], cy - r * BEARING_COS_LIST[i]
+
+def polar_to_world(bearing, range_):
+    """World east, north for bearing(s) in degrees and range(s) in any unit"""
+    i = bearing_index(bearing)
+    if np.ndim(i):
+        r = np.asarray(range_, dtype=np.float64)
+        return r * BEARING_SIN[i], r * BEARING_COS[i]
+    return range_ * BEARING_SIN_LIST[i], range_ * BEARING_COS_LIST[i]
+
 # ============================================================================
 # BEARING RATE TRACKER
 # ============================================================================
@@ -71,6 +187,12 @@ class BearingRateTracker:
             return self._calculate_bearing_rate(target_id)
         return 0.0
     
+    def get_bearing_rate(self, target_id):
+        """Get the current bearing rate without adding a sample"""
+        if target_id not in self.bearing_history:
+            return 0.0
+        return self._calculate_bearing_rate(target_id)
+    
     def _calculate_bearing_rate(self, target_id):
         """Calculate bearing rate in degrees per minute"""
         history = self.bearing_history[target_id]
@@ -252,7 +374,7 @@ class SNRAnalyzer:
     def update_target_snr(self, target_id, signal_level_db, timestamp=None):
         """Update SNR for a specific target"""
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = sim_clock.now()
         
         snr_db = self.calculate_snr(signal_level_db)
         
@@ -369,7 +491,10 @@ class TorpedoDetector:
     
     def __init__(self):
         self.detected_torpedoes = {}  # torpedo_id -> torpedo_data
+        self.target_index = {}  # original_target_id -> torpedo_id
         self.torpedo_alerts = deque(maxlen=10)
+        self.analysis_interval = 0.5  # seconds between torpedo evaluations
+        self.last_analysis_time = 0
         self.next_torpedo_id = 1000  # Start IDs at 1000 to distinguish from regular targets
         self.acoustic_decoys = []
         self.last_deploy_time = 0
@@ -424,11 +549,50 @@ class TorpedoDetector:
         
         return torpedo_probability, torpedo_type
     
+    def evaluate_targets(self, targets, now=None):
+        """Analyze fast targets for torpedoes at the fixed analysis rate"""
+        if now is None:
+            now = sim_clock.now()
+        
+        if now - self.last_analysis_time < self.analysis_interval:
+            return
+        self.last_analysis_time = now
+        
+        for target_id, target in targets.items():
+            # Calculate speed in knots
+            speed_knots = abs(target.velocity * 3600 * (50 / RADAR_RADIUS))
+            
+            # Only check high-speed targets
+            if speed_knots > 25:  # 25+ knots is suspicious
+                torpedo_prob, torpedo_type = self.analyze_for_torpedoes(
+                    target_id,
+                    target,
+                    target.acoustic_signature
+                )
+                
+                if torpedo_prob > 0.5:
+                    self.detect_torpedo(target_id, target, torpedo_prob, torpedo_type)
+    
     def detect_torpedo(self, target_id, target_data, torpedo_probability, torpedo_type):
-        """Register a detected torpedo"""
+        """Register a detected torpedo, or refresh the one already tracking this target"""
         if torpedo_probability < 0.5:  # Threshold
             return None
         
+        torpedo_id = self.target_index.get(target_id)
+        if torpedo_id in self.detected_torpedoes:
+            # Same contact re-detected: update in place, no new alert or sound
+            torpedo_data = self.detected_torpedoes[torpedo_id]
+            torpedo_data.update({
+                "type": torpedo_type,
+                "probability": torpedo_probability,
+                "bearing": target_data.angle,
+                "range_nm": target_data.get_range_nm(),
+                "speed_knots": abs(target_data.velocity * 3600 * (50 / RADAR_RADIUS)),
+                "detection_time": sim_clock.now(),
+                "impact_data": self._calculate_impact_parameters(target_data)
+            })
+            return torpedo_id
+        
         torpedo_id = self.next_torpedo_id
         self.next_torpedo_id += 1
         
@@ -443,7 +607,7 @@ class TorpedoDetector:
             "bearing": target_data.angle,
             "range_nm": target_data.get_range_nm(),
             "speed_knots": abs(target_data.velocity * 3600 * (50 / RADAR_RADIUS)),
-            "detection_time": time.time(),
+            "detection_time": sim_clock.now(),
             "impact_data": impact_data,
             "status": "TRACKING",
             "countermeasures_deployed": [],
@@ -451,6 +615,7 @@ class TorpedoDetector:
         }
         
         self.detected_torpedoes[torpedo_id] = torpedo_data
+        self.target_index[target_id] = torpedo_id
         
         # Generate alert
         alert = self._generate_torpedo_alert(torpedo_data)
@@ -535,10 +700,7 @@ class TorpedoDetector:
         
         # Convert to Cartesian coordinates
         range_nm = target_data.get_range_nm()
-        bearing_rad = math.radians(target_data.angle)
-        
-        target_x = range_nm * math.sin(bearing_rad)
-        target_y = range_nm * math.cos(bearing_rad)
+        target_x, target_y = polar_to_world(target_data.angle, range_nm)
         
         # Estimate closure rate (simplified)
         closure_rate = 0.7 * abs(target_data.velocity * 3600 * pixels_to_nm)  # Assume 70% of speed is toward us
@@ -560,7 +722,7 @@ class TorpedoDetector:
         impact = torpedo_data["impact_data"]
         
         alert = {
-            "timestamp": time.time(),
+            "timestamp": sim_clock.now(),
             "torpedo_id": torpedo_data["id"],
             "type": torpedo_data["type"],
             "message": f"⚠️ TORPEDO IN WATER ⚠️",
@@ -578,7 +740,7 @@ class TorpedoDetector:
     
     def deploy_acoustic_decoy(self):
         """Deploy acoustic decoy"""
-        current_time = time.time()
+        current_time = sim_clock.now()
         
         if current_time - self.last_deploy_time < self.decoy_cooldown:
             print(f"[DECOY] Cooldown active: {self.decoy_cooldown - (current_time - self.last_deploy_time):.0f}s remaining")
@@ -621,7 +783,7 @@ class TorpedoDetector:
     
     def update_torpedo_tracking(self):
         """Update all tracked torpedoes"""
-        current_time = time.time()
+        current_time = sim_clock.now()
         to_remove = []
         
         for torpedo_id, torpedo in self.detected_torpedoes.items():
@@ -635,8 +797,9 @@ class TorpedoDetector:
                 seconds = int(new_ttl % 60)
                 torpedo["impact_data"]["time_to_impact_str"] = f"{minutes}:{seconds:02d}"
                 
-                # Check if impact imminent
-                if new_ttl < 30 and torpedo["status"] == "TRACKING":
+                # Check if impact imminent (alert once per torpedo)
+                if new_ttl < 30 and torpedo["status"] == "TRACKING" and not torpedo.get("imminent_alerted"):
+                    torpedo["imminent_alerted"] = True
                     alert = {
                         "timestamp": current_time,
                         "message": f"TORPEDO {torpedo_id} IMPACT IMMINENT!",
@@ -651,7 +814,16 @@ class TorpedoDetector:
         
         # Remove expired torpedoes
         for torpedo_id in to_remove:
-            del self.detected_torpedoes[torpedo_id]
+            torpedo = self.detected_torpedoes.pop(torpedo_id)
+            if self.target_index.get(torpedo["original_target_id"]) == torpedo_id:
+                del self.target_index[torpedo["original_target_id"]]
+    
+    def get_torpedo_for_target(self, target_id):
+        """Get the torpedo record tracking a target, if any"""
+        torpedo_id = self.target_index.get(target_id)
+        if torpedo_id is None:
+            return None
+        return self.detected_torpedoes.get(torpedo_id)
     
     def get_active_torpedoes(self):
         """Get list of active torpedoes"""
@@ -1338,123 +1510,178 @@ class TargetClassifier:
         }
     }
     
+    # Modulation patterns encoded as integers for the compiled template arrays
+    MODULATION_CODES = {"steady": 0, "pulsed": 1, "irregular": 2, "complex": 3}
+    
+    # Template library compiled into numpy arrays (see compile_templates)
+    compiled = None
+    
+    @classmethod
+    def compile_templates(cls):
+        """Compile CLASS_TEMPLATES into numpy arrays for vectorized scoring"""
+        class_ids = list(cls.CLASS_TEMPLATES.keys())
+        templates = [cls.CLASS_TEMPLATES[class_id] for class_id in class_ids]
+        profiles = [template["acoustic_profile"] for template in templates]
+        
+        pulse_bounds = [profile.get("pulse_interval", (np.nan, np.nan)) for profile in profiles]
+        
+        cls.compiled = {
+            "class_ids": class_ids,
+            "freq_min": np.array([p["dominant_frequency"][0] for p in profiles], dtype=float),
+            "freq_max": np.array([p["dominant_frequency"][1] for p in profiles], dtype=float),
+            "speed_min": np.array([p["speed_range"][0] for p in profiles], dtype=float),
+            "speed_max": np.array([p["speed_range"][1] for p in profiles], dtype=float),
+            "level_min": np.array([p["source_level_range"][0] for p in profiles], dtype=float),
+            "level_max": np.array([p["source_level_range"][1] for p in profiles], dtype=float),
+            "modulation": np.array([cls.MODULATION_CODES.get(p["modulation_pattern"], -1) for p in profiles]),
+            "pulse_min": np.array([b[0] for b in pulse_bounds], dtype=float),
+            "pulse_max": np.array([b[1] for b in pulse_bounds], dtype=float),
+            "has_pulse": np.array(["pulse_interval" in p for p in profiles]),
+            "biological": np.array([t["category"] == "BIOLOGICAL" for t in templates])
+        }
+        return cls.compiled
+    
+    @classmethod
+    def add_template(cls, class_id, template):
+        """Add (or replace) a classification template and recompile the library"""
+        cls.CLASS_TEMPLATES[class_id] = template
+        cls.compile_templates()
+    
     @staticmethod
     def classify(signature: AcousticSignature, velocity: float, bearing_rate: float) -> Dict:
         """Classify target based on acoustic signature and movement"""
-        best_match = None
-        best_score = 0.0
-        possible_matches = []
-        
-        for class_id, template in TargetClassifier.CLASS_TEMPLATES.items():
-            score = TargetClassifier._calculate_match_score(signature, velocity, bearing_rate, template)
-            
-            if score > 0.3:  # Threshold for possible match
-                possible_matches.append({
-                    "class_id": class_id,
-                    "name": template["name"],
-                    "category": template["category"],
-                    "score": score,
-                    "threat_level": template["threat_level"],
-                    "icon": template["icon"]
-                })
-            
-            if score > best_score:
-                best_score = score
-                best_match = {
-                    "class_id": class_id,
-                    "name": template["name"],
-                    "category": template["category"],
-                    "score": score,
-                    "threat_level": template["threat_level"],
-                    "icon": template["icon"],
-                    "description": template["description"]
-                }
-        
-        # Sort possible matches by score
-        possible_matches.sort(key=lambda x: x["score"], reverse=True)
-        
-        if best_match and best_score > 0.6:  # Confidence threshold
-            return {
-                "primary_classification": best_match,
-                "confidence": best_score,
-                "possible_classes": possible_matches[:3],  # Top 3 possibilities
-                "classification_time": time.time()
-            }
-        else:
-            return {
-                "primary_classification": {
-                    "class_id": "UNKNOWN",
-                    "name": "Unknown Contact",
-                    "category": "UNKNOWN",
-                    "score": 0.0,
-                    "threat_level": "UNKNOWN",
-                    "icon": "❓"
-                },
-                "confidence": 0.0,
-                "possible_classes": possible_matches[:3],
-                "classification_time": time.time()
-            }
+        return TargetClassifier.classify_batch([signature], [velocity], [bearing_rate])[0]
     
     @staticmethod
-    def _calculate_match_score(signature: AcousticSignature, velocity: float, 
-                              bearing_rate: float, template: Dict) -> float:
-        """Calculate match score between signature and template"""
-        profile = template["acoustic_profile"]
-        score = 0.0
-        
-        # 1. Frequency match (40% weight)
-        freq_min, freq_max = profile["dominant_frequency"]
-        if freq_min <= signature.dominant_frequency <= freq_max:
-            freq_score = 1.0
+    def classify_batch(signatures: List[AcousticSignature], velocities, bearing_rates,
+                       top_k: int = 3) -> List[Dict]:
+        """Classify many targets at once against every template"""
+        if not signatures:
+            return []
+        
+        compiled = TargetClassifier.compiled
+        scores = TargetClassifier.score_matrix(signatures, velocities, bearing_rates)
+        n_templates = scores.shape[1]
+        
+        # Best template per target (first maximum, as in a strict > scan)
+        best_idx = np.argmax(scores, axis=1)
+        best_scores = scores[np.arange(len(signatures)), best_idx]
+        
+        # Top-k candidates per target without sorting the whole row
+        k = min(top_k, n_templates)
+        if k < n_templates:
+            top_idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
         else:
-            # Calculate proximity score
-            if signature.dominant_frequency < freq_min:
-                freq_score = max(0, 1.0 - (freq_min - signature.dominant_frequency) / freq_min)
+            top_idx = np.tile(np.arange(n_templates), (len(signatures), 1))
+        
+        classification_time = sim_clock.now()
+        results = []
+        
+        for row in range(len(signatures)):
+            # Widen the partition to every template tied with the k-th score
+            cutoff = scores[row, top_idx[row]].min()
+            candidates = np.flatnonzero(scores[row] >= cutoff)
+            candidate_scores = scores[row, candidates]
+            # Sort by score descending, ties by template order
+            order = np.lexsort((candidates, -candidate_scores))[:k]
+            
+            possible_matches = []
+            for col in candidates[order]:
+                score = float(scores[row, col])
+                if score > 0.3:  # Threshold for possible match
+                    possible_matches.append(TargetClassifier._match_entry(compiled["class_ids"][col], score))
+            
+            best_score = float(best_scores[row])
+            if best_score > 0.6:  # Confidence threshold
+                class_id = compiled["class_ids"][best_idx[row]]
+                best_match = TargetClassifier._match_entry(class_id, best_score)
+                best_match["description"] = TargetClassifier.CLASS_TEMPLATES[class_id]["description"]
+                
+                results.append({
+                    "primary_classification": best_match,
+                    "confidence": best_score,
+                    "possible_classes": possible_matches,
+                    "classification_time": classification_time
+                })
             else:
-                freq_score = max(0, 1.0 - (signature.dominant_frequency - freq_max) / freq_max)
-        score += freq_score * 0.4
+                results.append({
+                    "primary_classification": {
+                        "class_id": "UNKNOWN",
+                        "name": "Unknown Contact",
+                        "category": "UNKNOWN",
+                        "score": 0.0,
+                        "threat_level": "UNKNOWN",
+                        "icon": "❓"
+                    },
+                    "confidence": 0.0,
+                    "possible_classes": possible_matches,
+                    "classification_time": classification_time
+                })
+        
+        return results
+    
+    @staticmethod
+    def _match_entry(class_id, score):
+        """Build a match dictionary for a template"""
+        template = TargetClassifier.CLASS_TEMPLATES[class_id]
+        return {
+            "class_id": class_id,
+            "name": template["name"],
+            "category": template["category"],
+            "score": score,
+            "threat_level": template["threat_level"],
+            "icon": template["icon"]
+        }
+    
+    @staticmethod
+    def score_matrix(signatures: List[AcousticSignature], velocities, bearing_rates) -> np.ndarray:
+        """Calculate the (targets x templates) match score matrix"""
+        t = TargetClassifier.compiled
+        
+        # Target features as column vectors so they broadcast against the templates
+        freq = np.array([s.dominant_frequency for s in signatures], dtype=float)[:, None]
+        level = np.array([s.source_level_db for s in signatures], dtype=float)[:, None]
+        modulation = np.array([TargetClassifier.MODULATION_CODES.get(s.modulation_pattern, -1)
+                               for s in signatures])[:, None]
+        pulse = np.array([s.pulse_interval if s.pulse_interval else np.nan for s in signatures],
+                         dtype=float)[:, None]
+        velocity = np.asarray(velocities, dtype=float).reshape(-1, 1)
+        bearing_rate = np.asarray(bearing_rates, dtype=float).reshape(-1, 1)
+        
+        # 1. Frequency match (40% weight) - proximity score outside the band
+        below = np.maximum(0, 1.0 - (t["freq_min"] - freq) / t["freq_min"])
+        above = np.maximum(0, 1.0 - (freq - t["freq_max"]) / t["freq_max"])
+        freq_score = np.where(freq < t["freq_min"], below, np.where(freq > t["freq_max"], above, 1.0))
+        score = freq_score * 0.4
         
         # 2. Speed match (20% weight)
-        speed_min, speed_max = profile["speed_range"]
-        if speed_min <= velocity <= speed_max:
-            speed_score = 1.0
-        else:
-            speed_score = max(0, 1.0 - abs(velocity - (speed_min + speed_max) / 2) / 50)
+        in_band = (t["speed_min"] <= velocity) & (velocity <= t["speed_max"])
+        speed_mid = (t["speed_min"] + t["speed_max"]) / 2
+        speed_score = np.where(in_band, 1.0, np.maximum(0, 1.0 - np.abs(velocity - speed_mid) / 50))
         score += speed_score * 0.2
         
-        # 3. Modulation pattern match (15% weight)
-        if signature.modulation_pattern == profile["modulation_pattern"]:
-            mod_score = 1.0
-        elif profile["modulation_pattern"] == "irregular":
-            mod_score = 0.7  # Irregular can match many patterns
-        else:
-            mod_score = 0.3
+        # 3. Modulation pattern match (15% weight) - irregular can match many patterns
+        irregular = t["modulation"] == TargetClassifier.MODULATION_CODES["irregular"]
+        mod_score = np.where(modulation == t["modulation"], 1.0, np.where(irregular, 0.7, 0.3))
         score += mod_score * 0.15
         
         # 4. Source level match (15% weight)
-        level_min, level_max = profile["source_level_range"]
-        if level_min <= signature.source_level_db <= level_max:
-            level_score = 1.0
-        else:
-            level_score = max(0, 1.0 - abs(signature.source_level_db - (level_min + level_max) / 2) / 50)
+        in_band = (t["level_min"] <= level) & (level <= t["level_max"])
+        level_mid = (t["level_min"] + t["level_max"]) / 2
+        level_score = np.where(in_band, 1.0, np.maximum(0, 1.0 - np.abs(level - level_mid) / 50))
         score += level_score * 0.15
         
-        # 5. Pulse interval match (10% weight, if applicable)
-        if "pulse_interval" in profile and signature.pulse_interval:
-            pulse_min, pulse_max = profile["pulse_interval"]
-            if pulse_min <= signature.pulse_interval <= pulse_max:
-                pulse_score = 1.0
-            else:
-                pulse_score = max(0, 1.0 - abs(signature.pulse_interval - (pulse_min + pulse_max) / 2) / 10)
-            score += pulse_score * 0.1
-        else:
-            score += 0.1  # Bonus for non-pulsed
+        # 5. Pulse interval match (10% weight, if applicable) - bonus for non-pulsed
+        pulse_applies = t["has_pulse"] & ~np.isnan(pulse)
+        in_band = (t["pulse_min"] <= pulse) & (pulse <= t["pulse_max"])
+        pulse_mid = (t["pulse_min"] + t["pulse_max"]) / 2
+        pulse_score = np.where(in_band, 1.0, np.maximum(0, 1.0 - np.abs(pulse - pulse_mid) / 10))
+        score += np.where(pulse_applies, pulse_score, 1.0) * 0.1
         
         # Apply bearing rate filter for biological vs mechanical
-        if template["category"] == "BIOLOGICAL" and abs(bearing_rate) > 5:
-            score *= 0.5  # Biological typically don't turn fast
+        score = np.where(t["biological"] & (np.abs(bearing_rate) > 5), score * 0.5, score)
         
-        return min(1.0, score)
+        return np.minimum(1.0, score)
     
     @staticmethod
     def generate_signature_from_audio(audio_data: np.ndarray, sample_rate: int = 44100) -> AcousticSignature:
@@ -1531,6 +1758,7 @@ class TargetClassifier:
         )
 
 # Initialize classifier
+TargetClassifier.compile_templates()
 target_classifier = TargetClassifier()
 
 # Default theme
@@ -1667,100 +1895,214 @@ class SessionData:
 class ThreeDVisualizer:
     """3D visualization mode for radar data"""
     
+    GRID_RINGS = 5
+    RING_SEGMENTS = 72
+    STALK_HEIGHT = 40  # world units of blip height at full intensity
+    NEAR_PLANE = 10.0
+    
     def __init__(self):
         self.enabled = False
         self.camera_distance = 500
-        self.camera_angle = 45
+        self.camera_angle = 0  # orbit azimuth, 0 looks north from the south
         self.camera_height = 200
         self.view_mode = "perspective"  # "perspective" or "topdown"
-        self.rotate_speed = 0.5
+        self.rotate_speed = 0.5  # degrees per second of camera orbit
+        self.orbit_angle = 0.0
+        self._last_time = None
+        self._grid_key = None
+        self._grid_layer = None
+        self._camera_key = None
+        self._camera = None
+        self.overlay = None
+        self._overlay_rect = None
+        self.grid_rebuilds = 0
+        self.shown = False  # whether the last rendered frame was 3D
         
     def toggle(self):
         """Toggle 3D mode"""
         self.enabled = not self.enabled
+        self._last_time = None
         print(f"[3D] Mode {'enabled' if self.enabled else 'disabled'}")
+    
+    def _advance_orbit(self):
+        """Rotate the camera by rotate_speed degrees per simulated second"""
+        now = sim_clock.now()
+        if self._last_time is not None:
+            self.orbit_angle = (self.orbit_angle + self.rotate_speed * (now - self._last_time)) % 360
+        self._last_time = now
+    
+    def camera_state(self):
+        """Hashable camera state; the azimuth is quantized to whole degrees"""
+        azimuth = int(self.camera_angle + self.orbit_angle) % 360
+        return (azimuth, self.camera_distance, self.camera_height, self.view_mode)
+    
+    def _camera_matrix(self):
+        """Eye position, 3x3 world-to-camera rotation and focal length"""
+        key = self.camera_state()
+        if key != self._camera_key:
+            azimuth, distance, height, mode = key
+            # The camera sits on the opposite bearing and looks at the origin
+            bearing = math.radians(azimuth + 180)
+            elevation = math.pi / 2 if mode == "topdown" else math.atan2(height, distance)
+            eye_range = math.hypot(distance, height)
+            ce, se = math.cos(elevation), math.sin(elevation)
+            sa, ca = math.sin(bearing), math.cos(bearing)
+            eye = np.array([eye_range * ce * sa, eye_range * ce * ca, eye_range * se])
+            forward = -eye / eye_range
+            right = np.array([-ca, sa, 0.0])
+            up = np.cross(right, forward)
+            self._camera = (eye, np.vstack((right, up, forward)), eye_range)
+            self._camera_key = key
+        return self._camera
+    
+    def project(self, points):
+        """Project an (N, 3) array of world east, north, up points to screen
+        
+        Returns screen x, y and camera depth arrays; points behind the near
+        plane get a NaN position.
+        """
+        eye, rotation, focal = self._camera_matrix()
+        cam = (np.asarray(points, dtype=np.float64) - eye) @ rotation.T
+        depth = cam[:, 2]
+        visible = depth > self.NEAR_PLANE
+        scale = np.where(visible, focal / np.where(visible, depth, 1.0), np.nan)
+        cx, cy = RADAR_CENTER
+        return cx + cam[:, 0] * scale, cy - cam[:, 1] * scale, depth
         
     def draw_3d_radar(self, screen, targets, sweep_angle):
         """Draw 3D radar visualization"""
         if not self.enabled:
             return
-            
-        # Create 3D surface
-        surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        
-        # Draw 3D grid
-        self._draw_3d_grid(surf)
-        
-        # Draw targets in 3D
-        for target in targets.values():
-            self._draw_3d_target(surf, target)
-        
-        # Draw 3D sweep line
-        self._draw_3d_sweep(surf, sweep_angle)
-        
-        # Apply to screen
-        screen.blit(surf, (0, 0))
-        
-    def _draw_3d_grid(self, surf):
-        """Draw 3D grid"""
-        center_x, center_y = WIDTH // 2, HEIGHT // 2
-        
-        # Draw depth circles
-        for i in range(1, 6):
-            radius = 50 * i
-            for angle in range(0, 360, 30):
-                x = center_x + radius * math.cos(math.radians(angle))
-                y = center_y - radius * math.sin(math.radians(angle)) * 0.5  # Perspective compression
-                depth = i * 0.2
-                alpha = int(255 * (1 - depth))
-                color = (*get_color("primary")[:3], alpha)
-                pygame.draw.circle(surf, color, (int(x), int(y)), 2)
-    
-    def _draw_3d_target(self, surf, target):
-        """Draw target in 3D"""
-        center_x, center_y = WIDTH // 2, HEIGHT // 2
-        
-        # Convert to 3D coordinates
-        distance = target.distance
-        angle = target.angle
-        depth = distance / RADAR_RADIUS
-        
-        # Perspective projection
-        x = center_x + distance * math.cos(math.radians(angle - 90))
-        y = center_y - distance * math.sin(math.radians(angle - 90)) * (0.5 + depth * 0.3)
-        
-        # Size based on intensity and depth
-        size = max(4, int(8 * target.intensity * (1 - depth * 0.5)))
-        
-        # Color based on threat with depth fading
-        color = target.get_color()
-        faded_color = (*color[:3], int(color[3] * (1 - depth * 0.5)))
-        
-        # Draw target
-        pygame.draw.circle(surf, faded_color, (int(x), int(y)), size)
-        
-        # Draw depth line
-        pygame.draw.line(surf, faded_color, (int(x), int(y)), 
-                        (int(x), int(y + size * 2)), 2)
+        self._advance_orbit()
+        
+        # Static grid from the cache, then the per-frame layer on top
+        screen.blit(self._get_grid_layer(), (0, 0))
+        
+        overlay = self._get_overlay()
+        if self._overlay_rect is not None:
+            overlay.fill((0, 0, 0, 0), self._overlay_rect)
+        
+        rects = self._draw_3d_sweep(overlay, sweep_angle) + self._draw_3d_targets(overlay, list(targets.values()))
+        frame_rect = rects[0].unionall(rects[1:]) if rects else None
+        
+        # Blit only what was drawn this frame plus last frame's (now cleared) area
+        dirty = frame_rect
+        if self._overlay_rect is not None:
+            dirty = self._overlay_rect if dirty is None else dirty.union(self._overlay_rect)
+        if dirty is not None:
+            dirty = dirty.clip(overlay.get_rect())
+            screen.blit(overlay, dirty.topleft, dirty)
+        self._overlay_rect = frame_rect
+    
+    def _get_overlay(self):
+        """Persistent transparent layer for targets and the sweep"""
+        size = screen.get_size()
+        if self.overlay is None or self.overlay.get_size() != size:
+            self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+            self._overlay_rect = None
+        return self.overlay
+    
+    def _get_grid_layer(self):
+        """Opaque background with the projected grid, rebuilt per camera state"""
+        size = screen.get_size()
+        key = (self.camera_state(), size, RADAR_CENTER, current_theme_name, brightness)
+        if key != self._grid_key:
+            self._grid_layer = self._build_grid_layer(size)
+            self._grid_key = key
+            self.grid_rebuilds += 1
+        return self._grid_layer
+        
+    def _build_grid_layer(self, size):
+        """Render depth rings and spokes, all rings projected in one call"""
+        layer = pygame.Surface(size)
+        layer.fill(tuple(int(c * brightness) for c in get_color("bg")))
+        lines = pygame.Surface(size, pygame.SRCALPHA)
+        primary = tuple(int(c * brightness) for c in get_color("primary")[:3])
+        
+        rings = self.GRID_RINGS
+        radii = RADAR_RADIUS * np.arange(1, rings + 1) / rings
+        bearings = np.linspace(0, 360, self.RING_SEGMENTS + 1)
+        east, north = polar_to_world(bearings[None, :], radii[:, None])
+        points = np.stack((east.ravel(), north.ravel(), np.zeros(east.size)), axis=1)
+        xs, ys, _ = self.project(points)
+        xs = xs.reshape(rings, -1)
+        ys = ys.reshape(rings, -1)
+        
+        for i in range(rings):
+            ok = np.isfinite(xs[i])
+            if ok.sum() < 2:
+                continue
+            alpha = int(255 * (1 - i / rings * 0.8))
+            ring = np.stack((xs[i][ok], ys[i][ok]), axis=1).tolist()
+            pygame.draw.lines(lines, (*primary, alpha), False, ring, 1)
+        
+        # Spokes every 30 degrees from the centre to the outer ring
+        step = self.RING_SEGMENTS // 12
+        center = self.project(np.zeros((1, 3)))
+        origin = (float(center[0][0]), float(center[1][0]))
+        for j in range(0, self.RING_SEGMENTS, step):
+            end = (xs[-1][j], ys[-1][j])
+            if np.isfinite(end[0]):
+                pygame.draw.line(lines, (*primary, 60), origin, (float(end[0]), float(end[1])), 1)
+        
+        layer.blit(lines, (0, 0))
+        return layer
+    
+    def _draw_3d_targets(self, surf, targets):
+        """Project blips and stalk bases together and draw them far to near"""
+        if not targets:
+            return []
+        count = len(targets)
+        angles = np.fromiter((t.angle for t in targets), np.float64, count)
+        distances = np.fromiter((t.distance for t in targets), np.float64, count)
+        intensity = np.fromiter((t.intensity for t in targets), np.float64, count)
+        
+        east, north = polar_to_world(angles, distances)
+        heights = self.STALK_HEIGHT * np.clip(intensity, 0.0, 1.0)
+        points = np.empty((2 * count, 3))
+        points[:count, 0] = points[count:, 0] = east
+        points[:count, 1] = points[count:, 1] = north
+        points[:count, 2] = heights
+        points[count:, 2] = 0.0
+        xs, ys, depth = self.project(points)
+        
+        # Depth fade and blip size relative to the visible depth range
+        top_depth = depth[:count]
+        near, far = top_depth.min(), top_depth.max()
+        fade = (top_depth - near) / max(far - near, 1e-6)
+        sizes = np.maximum(4, (8 * intensity * (1 - fade * 0.5)).astype(np.int64))
+        
+        rects = []
+        order = np.argsort(-top_depth)  # painter's algorithm, farthest first
+        for i in order.tolist():
+            x, y, bx, by = xs[i], ys[i], xs[count + i], ys[count + i]
+            if not (np.isfinite(x) and np.isfinite(bx)):
+                continue
+            color = targets[i].get_color()
+            faded = (*color[:3], int(color[3] * (1 - fade[i] * 0.5)))
+            top = (int(x), int(y))
+            rects.append(pygame.draw.line(surf, faded, top, (int(bx), int(by)), 2))
+            rects.append(pygame.draw.circle(surf, faded, top, int(sizes[i])))
+        return rects
     
     def _draw_3d_sweep(self, surf, sweep_angle):
         """Draw 3D sweep line"""
-        center_x, center_y = WIDTH // 2, HEIGHT // 2
-        
-        # Calculate 3D sweep line
-        length = RADAR_RADIUS
-        x = center_x + length * math.cos(math.radians(sweep_angle - 90))
-        y = center_y - length * math.sin(math.radians(sweep_angle - 90)) * 0.7
-        
-        # Draw sweep line with gradient
+        # Ten segments of the sweep on the plane, projected together
+        fractions = np.arange(1, 11) / 10
+        east, north = polar_to_world(np.full(10, sweep_angle), RADAR_RADIUS * fractions)
+        points = np.stack((east, north, np.zeros(10)), axis=1)
+        xs, ys, _ = self.project(points)
+        origin_x, origin_y, _ = self.project(np.zeros((1, 3)))
+        origin = (int(origin_x[0]), int(origin_y[0]))
+        
+        accent = get_color("accent")[:3]
+        rects = []
         for i in range(10):
-            segment_length = length * (i + 1) / 10
-            segment_x = center_x + segment_length * math.cos(math.radians(sweep_angle - 90))
-            segment_y = center_y - segment_length * math.sin(math.radians(sweep_angle - 90)) * 0.7
+            if not np.isfinite(xs[i]):
+                continue
             alpha = int(255 * (1 - i / 10))
-            color = (*get_color("accent")[:3], alpha)
-            pygame.draw.line(surf, color, (center_x, center_y), 
-                            (int(segment_x), int(segment_y)), 2)
+            rects.append(pygame.draw.line(surf, (*accent, alpha), origin, (int(xs[i]), int(ys[i])), 2))
+        return rects
 
 # Initialize 3D visualizer
 visualizer_3d = ThreeDVisualizer()
@@ -1768,128 +2110,543 @@ visualizer_3d = ThreeDVisualizer()
 # ADVANCED DATA ANALYTICS
 # ============================================================================
 
+class StreamingStat:
+    """Sliding-window mean/variance (Welford) and max with O(1) updates"""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max_window = deque()  # (seq, value), values decreasing
+    
+    def add(self, seq, value):
+        """Add a sample to the window"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+        while self.max_window and self.max_window[-1][1] <= value:
+            self.max_window.pop()
+        self.max_window.append((seq, value))
+    
+    def remove(self, seq, value):
+        """Remove the oldest sample from the window"""
+        if self.count <= 1:
+            self.count = 0
+            self.mean = 0.0
+            self.m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean -= delta / (self.count - 1)
+            self.m2 -= delta * (value - self.mean)
+            self.count -= 1
+        
+        if self.max_window and self.max_window[0][0] == seq:
+            self.max_window.popleft()
+    
+    @property
+    def max(self):
+        return self.max_window[0][1] if self.max_window else 0
+    
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count > 1 else 0.0
+
+class TrackKinematics:
+    """Exponentially weighted time regression of a track's Cartesian position"""
+    
+    TIME_CONSTANT = 10.0  # seconds; older samples fade out of the velocity fit
+    
+    def __init__(self):
+        # Sums are kept with time measured relative to the latest sample (tau <= 0)
+        self.last_time = None
+        self.w = 0.0
+        self.s_t = 0.0
+        self.s_tt = 0.0
+        self.s_x = 0.0
+        self.s_y = 0.0
+        self.s_tx = 0.0
+        self.s_ty = 0.0
+    
+    def add(self, timestamp, bearing, range_):
+        """Fold in a polar sample (degrees, radar units)"""
+        x, y = polar_to_world(bearing, range_)
+        
+        if self.last_time is not None:
+            dt = timestamp - self.last_time
+            k = math.exp(-dt / self.TIME_CONSTANT)
+            # Shift the time origin to the new sample, then decay
+            self.s_tt = k * (self.s_tt - 2 * dt * self.s_t + dt * dt * self.w)
+            self.s_t = k * (self.s_t - dt * self.w)
+            self.s_tx = k * (self.s_tx - dt * self.s_x)
+            self.s_ty = k * (self.s_ty - dt * self.s_y)
+            self.w *= k
+            self.s_x *= k
+            self.s_y *= k
+        
+        self.last_time = timestamp
+        self.w += 1.0
+        self.s_x += x
+        self.s_y += y
+    
+    def velocity(self):
+        """Fitted (vx, vy) in radar units per second"""
+        denom = self.w * self.s_tt - self.s_t * self.s_t
+        if self.w < 2 or denom <= 1e-9:
+            return 0.0, 0.0
+        vx = (self.w * self.s_tx - self.s_t * self.s_x) / denom
+        vy = (self.w * self.s_ty - self.s_t * self.s_y) / denom
+        return vx, vy
+    
+    def position(self):
+        """Fitted (x, y) at the latest sample time"""
+        vx, vy = self.velocity()
+        return (self.s_x - vx * self.s_t) / self.w, (self.s_y - vy * self.s_t) / self.w
+
+class TrackTrend:
+    """Running least-squares sums for one track's bearing and range"""
+    
+    def __init__(self):
+        # Samples are indexed x = 0..count-1 oldest to newest, as np.polyfit saw them
+        self.count = 0
+        self.sum_bearing = 0.0
+        self.sum_x_bearing = 0.0
+        self.sum_range = 0.0
+        self.sum_x_range = 0.0
+        self.velocity = StreamingStat()
+        self.kinematics = TrackKinematics()
+        self.threat = None
+    
+    def add(self, seq, bearing, range_, velocity, threat, timestamp):
+        """Append the newest sample"""
+        self.kinematics.add(timestamp, bearing, range_)
+        self.sum_x_bearing += self.count * bearing
+        self.sum_x_range += self.count * range_
+        self.sum_bearing += bearing
+        self.sum_range += range_
+        self.count += 1
+        self.velocity.add(seq, velocity)
+        self.threat = threat
+    
+    def remove_oldest(self, seq, bearing, range_, velocity):
+        """Drop the oldest sample and rebase x so the window starts at 0 again"""
+        self.sum_bearing -= bearing
+        self.sum_range -= range_
+        # Oldest sample had x = 0; every remaining x shifts down by one
+        self.sum_x_bearing -= self.sum_bearing
+        self.sum_x_range -= self.sum_range
+        self.count -= 1
+        self.velocity.remove(seq, velocity)
+    
+    def slope(self, sum_y, sum_xy):
+        """Least-squares slope over x = 0..count-1"""
+        n = self.count
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+    
+    @property
+    def bearing_trend(self):
+        return self.slope(self.sum_bearing, self.sum_x_bearing)
+    
+    @property
+    def range_trend(self):
+        return self.slope(self.sum_range, self.sum_x_range)
+
+class TargetHistoryStore:
+    """Columnar ring buffer of target samples, queryable by time window and track"""
+    
+    COLUMNS = (
+        ('timestamp', np.float64),
+        ('id', np.int32),
+        ('bearing', np.float32),
+        ('range', np.float32),
+        ('velocity', np.float32),
+        ('threat', np.int8),
+        ('intensity', np.float32),
+    )
+    THREAT_LEVELS = ("UNKNOWN", "FRIENDLY", "NEUTRAL", "HOSTILE")
+    THREAT_CODES = {name: code for code, name in enumerate(THREAT_LEVELS)}
+    
+    def __init__(self, capacity=36000):
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS}
+        self.head = 0  # next slot to write
+        self.size = 0
+        
+    def __len__(self):
+        return self.size
+    
+    def row(self, index):
+        """Get the physical row at index as a dict"""
+        return {name: column[index].item() for name, column in self.columns.items()}
+    
+    def append(self, timestamp, target_id, bearing, range_, velocity, threat, intensity):
+        """Append a sample; returns (stored_row, evicted_row or None)"""
+        evicted = self.row(self.head) if self.size == self.capacity else None
+        
+        i = self.head
+        cols = self.columns
+        cols['timestamp'][i] = timestamp
+        cols['id'][i] = target_id
+        cols['bearing'][i] = bearing
+        cols['range'][i] = range_
+        cols['velocity'][i] = velocity
+        cols['threat'][i] = self.THREAT_CODES.get(threat, 0)
+        cols['intensity'][i] = intensity
+        
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return self.row(i), evicted
+    
+    def _segments(self):
+        """Physical (start, end) slices in chronological order"""
+        if self.size < self.capacity:
+            return [(0, self.size)]
+        if self.head == 0:
+            return [(0, self.capacity)]
+        return [(self.head, self.capacity), (0, self.head)]
+    
+    def indices(self, start_time=None, end_time=None, target_id=None):
+        """Physical row indices (chronological) matching a time window and track"""
+        timestamps = self.columns['timestamp']
+        parts = []
+        for a, b in self._segments():
+            segment = timestamps[a:b]
+            lo = a if start_time is None else a + np.searchsorted(segment, start_time, 'left')
+            hi = b if end_time is None else a + np.searchsorted(segment, end_time, 'right')
+            if hi > lo:
+                parts.append(np.arange(lo, hi))
+        
+        idx = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        if target_id is not None:
+            idx = idx[self.columns['id'][idx] == target_id]
+        return idx
+    
+    def query(self, start_time=None, end_time=None, target_id=None, columns=None):
+        """Get column arrays for samples in a time window, optionally for one track"""
+        idx = self.indices(start_time, end_time, target_id)
+        names = columns or [name for name, _ in self.COLUMNS]
+        return {name: self.columns[name][idx] for name in names}
+    
+    def clear(self):
+        """Drop all samples"""
+        self.head = 0
+        self.size = 0
+
+class HeatmapAccumulator:
+    """Bearing/range activity grids updated incrementally with np.add.at"""
+    
+    def __init__(self, resolutions=((360, 100),), half_life=None):
+        self.resolutions = tuple(resolutions)
+        self.grids = {res: np.zeros(res) for res in self.resolutions}
+        self.half_life = half_life  # seconds; None keeps raw counts
+        self.last_decay = None
+    
+    @staticmethod
+    def _bins(resolution, bearings, range_fractions):
+        """Bin indices for bearings (degrees) and ranges (fraction of full scale)"""
+        bearing_bins, range_bins = resolution
+        b = (bearings * (bearing_bins / 360.0)).astype(np.int64) % bearing_bins
+        r = np.minimum(range_fractions * range_bins, range_bins - 1).astype(np.int64)
+        return b, r
+    
+    def decay(self, now):
+        """Apply exponential decay up to now"""
+        if self.half_life is None:
+            return
+        if self.last_decay is not None and now > self.last_decay:
+            factor = 0.5 ** ((now - self.last_decay) / self.half_life)
+            for grid in self.grids.values():
+                grid *= factor
+        self.last_decay = now
+    
+    def add(self, bearings, range_fractions, weight=1.0, now=None):
+        """Accumulate samples into every resolution"""
+        bearings = np.asarray(bearings, dtype=np.float64)
+        range_fractions = np.asarray(range_fractions, dtype=np.float64)
+        if self.half_life is not None:
+            self.decay(sim_clock.now() if now is None else now)
+        
+        for res, grid in self.grids.items():
+            np.add.at(grid, self._bins(res, bearings, range_fractions), weight)
+    
+    def remove(self, bearings, range_fractions, weight=1.0):
+        """Take samples back out (for windowed, non-decaying counts)"""
+        bearings = np.asarray(bearings, dtype=np.float64)
+        range_fractions = np.asarray(range_fractions, dtype=np.float64)
+        for res, grid in self.grids.items():
+            np.subtract.at(grid, self._bins(res, bearings, range_fractions), weight)
+    
+    def get(self, resolution=None):
+        """Get the grid for a resolution (the first one by default)"""
+        return self.grids[resolution or self.resolutions[0]]
+    
+    def clear(self):
+        """Zero all grids"""
+        for grid in self.grids.values():
+            grid.fill(0)
+        self.last_decay = None
+
 class DataAnalyzer:
     """Advanced analytics for radar data"""
     
-    def __init__(self):
-        self.history_length = 1000
-        self.target_history = deque(maxlen=self.history_length)
+    def __init__(self, capacity=36000, sample_interval=0.5):
+        self.history_length = capacity
+        self.target_history = TargetHistoryStore(capacity)
         self.mode_history = deque(maxlen=100)
         self.statistics = {}
         
-    def add_target_data(self, target):
-        """Add target data for analysis"""
-        self.target_history.append({
-            'timestamp': time.time(),
-            'id': target.id,
-            'bearing': target.angle,
-            'range': target.distance,
-            'velocity': target.velocity,
-            'threat': target.threat_level,
-            'intensity': target.intensity
-        })
+        # Per-track sampling (seconds between stored samples)
+        self.default_sample_interval = sample_interval
+        self.track_sample_intervals = {}  # target_id -> interval override
+        self.last_sample_time = {}  # target_id -> timestamp
+        
+        # Incremental aggregates over target_history
+        self.next_seq = 0
+        self.velocity_stat = StreamingStat()
+        self.intensity_stat = StreamingStat()
+        self.threat_counts = defaultdict(int)
+        self.tracks = {}  # target_id -> TrackTrend
+        
+        # Exact counts over the stored window, plus a decaying view for the overlay
+        self.heatmap = HeatmapAccumulator(((360, 100), (72, 20)))
+        self.activity_heatmap = HeatmapAccumulator(((180, 50),), half_life=30.0)
+    
+    def set_sample_interval(self, target_id, interval):
+        """Override the sampling interval for one track (None restores the default)"""
+        if interval is None:
+            self.track_sample_intervals.pop(target_id, None)
+        else:
+            self.track_sample_intervals[target_id] = interval
+        
+    def add_target_data(self, target, now=None):
+        """Add target data for analysis if the track's sampling interval has elapsed"""
+        if now is None:
+            now = sim_clock.now()
+        
+        sample = self._sample(target, now)
+        if sample is None:
+            return False
+        
+        row, evicted = sample
+        self._update_heatmaps([row], [evicted] if evicted else [], now)
+        return True
+    
+    def _sample(self, target, now):
+        """Store one sample and update aggregates; returns (row, evicted) or None"""
+        interval = self.track_sample_intervals.get(target.id, self.default_sample_interval)
+        last = self.last_sample_time.get(target.id)
+        if last is not None and now - last < interval:
+            return None
+        self.last_sample_time[target.id] = now
         
+        row, evicted = self.target_history.append(
+            now, target.id, target.angle, target.distance,
+            target.velocity, target.threat_level, target.intensity
+        )
+        
+        if evicted is not None:
+            self._remove_entry(self.next_seq - self.history_length, evicted)
+        self._add_entry(self.next_seq, row)
+        self.next_seq += 1
+        return row, evicted
+    
+    def add_targets(self, targets, now=None):
+        """Sample a batch of targets with a shared timestamp"""
+        if now is None:
+            now = sim_clock.now()
+        
+        added, evicted = [], []
+        for target in targets:
+            sample = self._sample(target, now)
+            if sample is not None:
+                added.append(sample[0])
+                if sample[1] is not None:
+                    evicted.append(sample[1])
+        
+        if added:
+            self._update_heatmaps(added, evicted, now)
+        
+        # Forget sampling state for tracks that are gone
+        if len(self.last_sample_time) > len(targets) * 2 + 50:
+            live = {target.id for target in targets}
+            self.last_sample_time = {tid: t for tid, t in self.last_sample_time.items() if tid in live}
+    
+    def _update_heatmaps(self, added, evicted, now):
+        """Fold newly stored rows (and evicted ones) into the heatmaps in one pass"""
+        bearings = np.array([row['bearing'] for row in added])
+        ranges = np.array([row['range'] for row in added]) / RADAR_RADIUS
+        self.heatmap.add(bearings, ranges)
+        self.activity_heatmap.add(bearings, ranges, now=now)
+        
+        if evicted:
+            self.heatmap.remove(
+                np.array([row['bearing'] for row in evicted]),
+                np.array([row['range'] for row in evicted]) / RADAR_RADIUS
+            )
+    
+    def _add_entry(self, seq, entry):
+        """Fold a new history entry into the aggregates"""
+        threat = TargetHistoryStore.THREAT_LEVELS[entry['threat']]
+        self.velocity_stat.add(seq, entry['velocity'])
+        self.intensity_stat.add(seq, entry['intensity'])
+        self.threat_counts[threat] += 1
+        
+        track = self.tracks.get(entry['id'])
+        if track is None:
+            track = self.tracks[entry['id']] = TrackTrend()
+        track.add(seq, entry['bearing'], entry['range'], entry['velocity'], threat, entry['timestamp'])
+    
+    def _remove_entry(self, seq, entry):
+        """Take an evicted history entry out of the aggregates"""
+        self.velocity_stat.remove(seq, entry['velocity'])
+        self.intensity_stat.remove(seq, entry['intensity'])
+        self.threat_counts[TargetHistoryStore.THREAT_LEVELS[entry['threat']]] -= 1
+        
+        track = self.tracks[entry['id']]
+        track.remove_oldest(seq, entry['bearing'], entry['range'], entry['velocity'])
+        if track.count == 0:
+            del self.tracks[entry['id']]
+            
     def analyze_trajectories(self):
         """Analyze target trajectories"""
         if len(self.target_history) < 10:
             return {}
-            
-        # Group by target ID
-        targets_by_id = {}
-        for entry in self.target_history:
-            target_id = entry['id']
-            if target_id not in targets_by_id:
-                targets_by_id[target_id] = []
-            targets_by_id[target_id].append(entry)
         
-        # Calculate trajectory statistics
         trajectories = {}
-        for target_id, entries in targets_by_id.items():
-            if len(entries) < 3:
+        for target_id, track in self.tracks.items():
+            if track.count < 3:
                 continue
-                
-            # Calculate movement patterns
-            bearings = [e['bearing'] for e in entries]
-            ranges = [e['range'] for e in entries]
-            velocities = [e['velocity'] for e in entries]
-            
-            # Calculate trends
-            bearing_trend = np.polyfit(range(len(bearings)), bearings, 1)[0]
-            range_trend = np.polyfit(range(len(ranges)), ranges, 1)[0]
             
             trajectories[target_id] = {
                 'id': target_id,
-                'bearing_trend': bearing_trend,
-                'range_trend': range_trend,
-                'avg_velocity': np.mean(velocities),
-                'max_velocity': np.max(velocities),
-                'threat': entries[-1]['threat'],
-                'data_points': len(entries)
+                'bearing_trend': track.bearing_trend,
+                'range_trend': track.range_trend,
+                'avg_velocity': track.velocity.mean,
+                'max_velocity': track.velocity.max,
+                'threat': track.threat,
+                'data_points': track.count,
+                'position': track.kinematics.position(),
+                'velocity_xy': track.kinematics.velocity(),
+                'last_seen': track.kinematics.last_time
             }
         
         return trajectories
     
-    def predict_collisions(self, trajectories, time_ahead=10):
-        """Predict potential collisions"""
-        collisions = []
-        target_ids = list(trajectories.keys())
+    def predict_collisions(self, trajectories, time_ahead=120, collision_distance=20,
+                           stale_after=5.0):
+        """Predict close approaches between tracks from their fitted velocity vectors"""
+        tracks = [t for t in trajectories.values() if t.get('last_seen') is not None]
+        if len(tracks) < 2:
+            return []
+        
+        now = max(t['last_seen'] for t in tracks)
+        tracks = [t for t in tracks if now - t['last_seen'] <= stale_after]
+        if len(tracks) < 2:
+            return []
+        
+        ids = np.array([t['id'] for t in tracks])
+        velocities = np.array([t['velocity_xy'] for t in tracks], dtype=np.float64)
+        # Bring every track to a common time before comparing
+        positions = (np.array([t['position'] for t in tracks], dtype=np.float64) +
+                     velocities * np.array([now - t['last_seen'] for t in tracks])[:, None])
+        
+        i, j = self._candidate_pairs(positions, velocities, time_ahead, collision_distance)
+        if len(i) == 0:
+            return []
+        
+        # Closest point of approach for every candidate pair in one broadcast
+        rel_pos = positions[j] - positions[i]
+        rel_vel = velocities[j] - velocities[i]
+        speed_sq = np.einsum('ij,ij->i', rel_vel, rel_vel)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_cpa = np.where(speed_sq > 1e-12,
+                             -np.einsum('ij,ij->i', rel_pos, rel_vel) / speed_sq, 0.0)
+        t_cpa = np.clip(t_cpa, 0.0, time_ahead)
+        miss = rel_pos + rel_vel * t_cpa[:, None]
+        d_cpa = np.hypot(miss[:, 0], miss[:, 1])
+        
+        probability = np.minimum(0.95, 1.0 - d_cpa / collision_distance)
+        hits = np.nonzero(probability > 0.3)[0]
+        
+        # Soonest closest approach first
+        heap = [(t_cpa[k], -probability[k], k) for k in hits]
+        heapq.heapify(heap)
         
-        for i, id1 in enumerate(target_ids):
-            for id2 in target_ids[i+1:]:
-                traj1 = trajectories[id1]
-                traj2 = trajectories[id2]
-                
-                # Simple linear prediction
-                # This would need more sophisticated algorithms for real use
-                bearing_diff = abs(traj1['bearing_trend'] - traj2['bearing_trend'])
-                range_diff = abs(traj1['range_trend'] - traj2['range_trend'])
-                
-                if bearing_diff < 5 and range_diff < 20:  # Threshold values
-                    collision_probability = min(0.9, (5 - bearing_diff) / 5 * 0.5 + 
-                                                (20 - range_diff) / 20 * 0.5)
-                    
-                    if collision_probability > 0.3:
-                        collisions.append({
-                            'target1': id1,
-                            'target2': id2,
-                            'probability': collision_probability,
-                            'eta_seconds': time_ahead
-                        })
+        pixels_to_nm = 50 / RADAR_RADIUS
+        collisions = []
+        while heap:
+            eta, _, k = heapq.heappop(heap)
+            collisions.append({
+                'target1': int(ids[i[k]]),
+                'target2': int(ids[j[k]]),
+                'probability': float(probability[k]),
+                'eta_seconds': float(eta),
+                'cpa_distance_nm': float(d_cpa[k] * pixels_to_nm)
+            })
         
         return collisions
     
+    @staticmethod
+    def _candidate_pairs(positions, velocities, time_ahead, collision_distance, brute_force_limit=64):
+        """Index pairs (i < j) that could come within collision_distance inside time_ahead"""
+        n = len(positions)
+        if n <= brute_force_limit:
+            return np.triu_indices(n, k=1)
+        
+        # Uniform grid: a pair can only close to collision_distance within time_ahead
+        # if it is currently within this many units, i.e. in the same or an adjacent cell
+        max_speed = np.hypot(velocities[:, 0], velocities[:, 1]).max()
+        cell_size = collision_distance + 2 * max_speed * time_ahead
+        cells = np.floor(positions / cell_size).astype(np.int64)
+        
+        buckets = defaultdict(list)
+        for index, (cx, cy) in enumerate(cells.tolist()):
+            buckets[(cx, cy)].append(index)
+        
+        pairs_i, pairs_j = [], []
+        for (cx, cy), members in buckets.items():
+            members = np.array(members)
+            # Same cell, then half of the neighbourhood so each cell pair is visited once
+            a, b = np.triu_indices(len(members), k=1)
+            pairs_i.append(members[a])
+            pairs_j.append(members[b])
+            for dx, dy in ((1, -1), (1, 0), (1, 1), (0, 1)):
+                other = buckets.get((cx + dx, cy + dy))
+                if other:
+                    a, b = np.meshgrid(members, np.array(other), indexing='ij')
+                    pairs_i.append(a.ravel())
+                    pairs_j.append(b.ravel())
+        
+        i = np.concatenate(pairs_i)
+        j = np.concatenate(pairs_j)
+        return np.minimum(i, j), np.maximum(i, j)
+    
     def generate_heatmap(self):
         """Generate heatmap of target activity"""
-        heatmap = np.zeros((360, 100))  # 360 degrees x 100 range bins
-        
-        for entry in self.target_history:
-            bearing = int(entry['bearing']) % 360
-            range_bin = int(min(entry['range'] / RADAR_RADIUS * 100, 99))
-            heatmap[bearing][range_bin] += 1
-        
-        return heatmap
+        return self.heatmap.get((360, 100)).copy()  # 360 degrees x 100 range bins
     
     def calculate_statistics(self):
         """Calculate overall statistics"""
         if len(self.target_history) == 0:
             return {}
         
-        threats = [entry['threat'] for entry in self.target_history]
-        velocities = [entry['velocity'] for entry in self.target_history]
-        intensities = [entry['intensity'] for entry in self.target_history]
-        
         stats = {
             'total_detections': len(self.target_history),
-            'unique_targets': len(set(entry['id'] for entry in self.target_history)),
+            'unique_targets': len(self.tracks),
             'threat_distribution': {
-                'HOSTILE': threats.count('HOSTILE'),
-                'UNKNOWN': threats.count('UNKNOWN'),
-                'NEUTRAL': threats.count('NEUTRAL'),
-                'FRIENDLY': threats.count('FRIENDLY')
+                'HOSTILE': self.threat_counts['HOSTILE'],
+                'UNKNOWN': self.threat_counts['UNKNOWN'],
+                'NEUTRAL': self.threat_counts['NEUTRAL'],
+                'FRIENDLY': self.threat_counts['FRIENDLY']
             },
-            'avg_velocity': np.mean(velocities) if velocities else 0,
-            'max_velocity': np.max(velocities) if velocities else 0,
-            'avg_intensity': np.mean(intensities) if intensities else 0,
+            'avg_velocity': self.velocity_stat.mean,
+            'max_velocity': self.velocity_stat.max,
+            'avg_intensity': self.intensity_stat.mean,
             'activity_level': min(1.0, len(self.target_history) / 100)  # 0-1 scale
         }
         
@@ -1963,7 +2720,7 @@ class MissionScenario:
         if scenario_name in self.scenarios:
             self.active_scenario = scenario_name
             self.current_step = 0
-            self.scenario_timer = time.time()
+            self.scenario_timer = sim_clock.now()
             self.scenario_running = True
             print(f"[SCENARIO] Started: {self.scenarios[scenario_name]['name']}")
             return True
@@ -1981,7 +2738,7 @@ class MissionScenario:
             return
             
         scenario = self.scenarios[self.active_scenario]
-        elapsed_time = time.time() - self.scenario_timer
+        elapsed_time = sim_clock.now() - self.scenario_timer
         
         # Check for next step
         while (self.current_step < len(scenario["steps"]) and 
@@ -2076,7 +2833,7 @@ class SessionRecorder:
         session_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_data = SessionData(
             session_id=session_id,
-            start_time=time.time(),
+            start_time=sim_clock.now(),
             metadata={
                 "version": "2.0",
                 "screen_size": (WIDTH, HEIGHT),
@@ -2096,7 +2853,7 @@ class SessionRecorder:
             return None  # Only return if NOT recording
             
         self.recording = False
-        self.session_data.end_time = time.time()
+        self.session_data.end_time = sim_clock.now()
         
         # Save session data
         session_file = f"sessions/session_{self.session_data.session_id}.json"
@@ -2299,20 +3056,21 @@ class DataExporter:
     @staticmethod
     def generate_heatmap_data(target_history):
         """Generate heatmap data from target history"""
-        heatmap = np.zeros((360, 100))  # 360 degrees x 100 range bins
+        accumulator = HeatmapAccumulator(((360, 100),))  # 360 degrees x 100 range bins
         
-        for target_data in target_history:
-            bearing = int(target_data['bearing']) % 360
-            range_bin = int(min(target_data['range_nm'] * 10, 99))
-            heatmap[bearing][range_bin] += 1
+        count = len(target_history)
+        bearings = np.fromiter((t['bearing'] for t in target_history), dtype=np.float64, count=count)
+        ranges_nm = np.fromiter((t['range_nm'] for t in target_history), dtype=np.float64, count=count)
+        accumulator.add(bearings, ranges_nm / 10)
         
-        return heatmap
+        return accumulator.get()
 
 # ============================================================================
 # AUDIO PROCESSING
 # ============================================================================
 
 audio_queue = deque(maxlen=100)
+AUDIO_MAX_BACKLOG = 8  # blocks (~190 ms); older unread blocks are dropped
 audio_recording_buffer = deque(maxlen=FS * 60)  # 60 seconds buffer
     
 def audio_callback(indata, frames, time_info, status):
@@ -2328,6 +3086,8 @@ def audio_callback(indata, frames, time_info, status):
 
 # Initialize audio stream
 try:
+    if sd is None or HEADLESS:
+        raise RuntimeError("no audio input device (headless or sounddevice unavailable)")
     stream = sd.InputStream(
         callback=audio_callback,
         channels=CHANNELS,
@@ -2346,6 +3106,7 @@ except Exception as e:
 
 current_mode = DetectionMode.PASSIVE
 sweep_angle = 0
+previous_sweep_angle = 0  # sweep at the previous simulation step (for interpolation)
 narrow_beam_angle = 0  
 sonar_pulse_time = 0
 sonar_echo_targets = []
@@ -2354,6 +3115,8 @@ brightness = 1.0
 show_grid = True
 show_compass = True
 show_minimap = False
+show_heatmap = False
+show_perf_overlay = False
 fullscreen = False
 crt_effect = False
 zoom_level = 1.0
@@ -2395,6 +3158,8 @@ current_noise_data = {
 
 class Target:
     """Advanced target with mode-specific properties"""
+    
+    prediction_steps = 5  # lowered by the quality governor under load
     next_id = 1
     
     def __init__(self, angle, distance, intensity, sound_types, threat_level, detection_mode):
@@ -2426,7 +3191,7 @@ class Target:
         
         # Position tracking
         self.position_history = deque(maxlen=50)
-        self.position_history.append((self.angle, self.distance, pygame.time.get_ticks()))
+        self.position_history.append((self.angle, self.distance, sim_clock.ticks()))
         
         # Velocity - initialize with safe values
         self.velocity = 0.0
@@ -2444,17 +3209,12 @@ class Target:
         
         # Display
         self.alpha = 255
-        self.last_update = pygame.time.get_ticks()
-        self.trail_points = deque(maxlen=20)
+        self.last_update = sim_clock.ticks()
+        self.revision = 0  # bumped whenever position, trail or predictions change
         
-        # Initialize with a valid trail point
-        try:
-            x = float(RADAR_CENTER[0] + self.distance * math.cos(math.radians(self.angle - 90)))
-            y = float(RADAR_CENTER[1] + self.distance * math.sin(math.radians(self.angle - 90)))
-            if not (math.isnan(x) or math.isnan(y)):
-                self.trail_points.append((x, y))
-        except Exception as e:
-            print(f"[WARNING] Target {self.id}: Error initializing trail point: {e}")
+        # Trail in (bearing, range) form; projected to screen by projection_cache
+        self.trail_polar = deque(maxlen=20)
+        self.trail_polar.append((self.angle, self.distance))
         
         # Classification
         self.classification_confidence = 0.0
@@ -2465,61 +3225,50 @@ class Target:
         """Update target classification based on audio data"""
         if audio_data is not None:
             # Generate acoustic signature
-            self.acoustic_signature = target_classifier.generate_signature_from_audio(
+            signature = target_classifier.generate_signature_from_audio(
                 audio_data, sample_rate
             )
             
-            # Calculate velocity for classification (convert to knots)
-            pixels_to_nm = 50 / RADAR_RADIUS
-            velocity_nm_per_sec = self.velocity * pixels_to_nm
-            velocity_knots = velocity_nm_per_sec * 3600
-            
             # Classify
             classification_result = target_classifier.classify(
-                self.acoustic_signature,
-                velocity_knots,
+                signature,
+                self.get_speed_knots(),
                 self.angular_velocity
             )
             
-            self.classification = classification_result["primary_classification"]
-            self.classification_confidence = classification_result["confidence"]
-            self.possible_classifications = classification_result["possible_classes"]
-            self.classification_time = classification_result["classification_time"]
-            
-            # Update classification history
-            self.classification_history.append({
-                "timestamp": time.time(),
-                "classification": self.classification,
-                "confidence": self.classification_confidence
-            })
-            
-            # Update threat level based on classification if confidence is high
-            if self.classification_confidence > 0.7:
-                self.threat_level = self.classification["threat_level"]
-            
+            self.apply_classification(signature, classification_result)
             return classification_result
         
         return None
-     
-    def clean_trail_points(self):
-        """Remove invalid points from trail"""
-        if not hasattr(self, 'trail_points'):
-            self.trail_points = deque(maxlen=20)
-            return
+    
+    def apply_classification(self, signature, classification_result):
+        """Store a classification result and the signature it was made from"""
+        self.acoustic_signature = signature
+        self.classification = classification_result["primary_classification"]
+        self.classification_confidence = classification_result["confidence"]
+        self.possible_classifications = classification_result["possible_classes"]
+        self.classification_time = classification_result["classification_time"]
+        
+        # Update classification history
+        self.classification_history.append({
+            "timestamp": sim_clock.now(),
+            "classification": self.classification,
+            "confidence": self.classification_confidence
+        })
         
-        valid_points = deque(maxlen=20)
-        for point in self.trail_points:
-            # Check if point is a valid tuple with 2 numbers
-            if (isinstance(point, (tuple, list)) and len(point) == 2 and
-                isinstance(point[0], (int, float)) and isinstance(point[1], (int, float)) and
-                not math.isnan(point[0]) and not math.isnan(point[1]) and
-                math.isfinite(point[0]) and math.isfinite(point[1])):
-                valid_points.append((float(point[0]), float(point[1])))
-        self.trail_points = valid_points
+        # Update threat level based on classification if confidence is high
+        if self.classification_confidence > 0.7:
+            self.threat_level = self.classification["threat_level"]
+    
+    def get_speed_knots(self):
+        """Convert pixel velocity to knots for classification"""
+        pixels_to_nm = 50 / RADAR_RADIUS
+        velocity_nm_per_sec = self.velocity * pixels_to_nm
+        return velocity_nm_per_sec * 3600
      
     def update(self, angle, distance, intensity):
         """Update target position and calculate velocity"""
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.ticks()
         
         # Convert to Python floats
         angle = float(angle)
@@ -2566,24 +3315,17 @@ class Target:
         self.last_update = current_time
         self.alpha = 255
         
-        # Add to trail with validation
-        try:
-            x = float(RADAR_CENTER[0] + distance * math.cos(math.radians(angle - 90)))
-            y = float(RADAR_CENTER[1] + distance * math.sin(math.radians(angle - 90)))
-            
-            # Check for NaN values
-            if not (math.isnan(x) or math.isnan(y)):
-                self.trail_points.append((x, y))
-            else:
-                print(f"[WARNING] Target {self.id}: Skipping NaN trail point")
-        except Exception as e:
-            print(f"[ERROR] Target {self.id}: Error calculating trail point: {e}")
+        # Add to trail
+        self.trail_polar.append((angle, distance))
         
         # Predict future positions
-        self.predict_future_positions()  
+        self.predict_future_positions()
+        self.revision += 1
     
-    def predict_future_positions(self, steps=5, time_step=2.0):
+    def predict_future_positions(self, steps=None, time_step=2.0):
         """Predict future positions based on current velocity"""
+        if steps is None:
+            steps = Target.prediction_steps
         self.predicted_positions = []
         
         # Only predict if we have valid velocities
@@ -2605,96 +3347,9 @@ class Target:
             
             self.predicted_positions.append((pred_angle, pred_dist))
     
-    def calculate_tactical_data(self):
-        """Calculate closing rate and CPA"""
-        try:
-            # Get own ship data
-            own_speed = own_ship["speed"]
-            own_course = own_ship["course"]
-            
-            # Convert pixel velocity to knots
-            pixels_to_nm = 50 / RADAR_RADIUS
-            velocity_nm_per_sec = self.velocity * pixels_to_nm
-            self.estimated_speed = abs(velocity_nm_per_sec * 3600)
-            
-            # Calculate closing rate
-            target_speed_knots = velocity_nm_per_sec * 3600
-            own_course_rad = math.radians(own_course)
-            own_vx = own_speed * math.sin(own_course_rad)
-            own_vy = own_speed * math.cos(own_course_rad)
-            
-            target_course_rad = self.velocity_angle
-            target_vx = target_speed_knots * math.sin(target_course_rad)
-            target_vy = target_speed_knots * math.cos(target_course_rad)
-            
-            rel_vx = target_vx - own_vx
-            rel_vy = target_vy - own_vy
-            
-            bearing_rad = math.radians(self.angle)
-            bearing_vx = math.sin(bearing_rad)
-            bearing_vy = math.cos(bearing_rad)
-            
-            self.closing_rate = -(rel_vx * bearing_vx + rel_vy * bearing_vy)
-            
-            # Classify closing rate
-            if self.closing_rate > 15:
-                self.closing_rate_type = "RAPID CLOSE"
-            elif self.closing_rate > 5:
-                self.closing_rate_type = "CLOSING"
-            elif self.closing_rate > -5:
-                self.closing_rate_type = "STEADY"
-            elif self.closing_rate > -15:
-                self.closing_rate_type = "OPENING"
-            else:
-                self.closing_rate_type = "RAPID OPEN"
-            
-            # Calculate CPA
-            current_range_nm = self.distance * pixels_to_nm
-            target_bearing_rad = math.radians(self.angle)
-            target_x = current_range_nm * math.sin(target_bearing_rad)
-            target_y = current_range_nm * math.cos(target_bearing_rad)
-            
-            own_vx = own_speed * math.sin(own_course_rad) / 3600
-            own_vy = own_speed * math.cos(own_course_rad) / 3600
-            
-            target_vx = target_speed_knots * math.sin(target_course_rad) / 3600
-            target_vy = target_speed_knots * math.cos(target_course_rad) / 3600
-            
-            rel_vx = target_vx - own_vx
-            rel_vy = target_vy - own_vy
-            rel_speed = math.sqrt(rel_vx**2 + rel_vy**2)
-            
-            if rel_speed > 0.0001:
-                time_to_cpa_sec = -(target_x * rel_vx + target_y * rel_vy) / (rel_vx**2 + rel_vy**2)
-                
-                if time_to_cpa_sec > 0:
-                    self.time_to_cpa = time_to_cpa_sec / 60
-                    cpa_x = target_x + rel_vx * time_to_cpa_sec
-                    cpa_y = target_y + rel_vy * time_to_cpa_sec
-                    self.cpa_distance = math.sqrt(cpa_x**2 + cpa_y**2)
-                    
-                    # *** NEW: Calculate CPA bearing for visualization ***
-                    self.cpa_bearing = math.degrees(math.atan2(cpa_x, cpa_y)) % 360
-                else:
-                    self.time_to_cpa = 0
-                    self.cpa_distance = current_range_nm
-                    self.cpa_bearing = self.angle  # *** NEW ***
-            else:
-                self.time_to_cpa = 999.0
-                self.cpa_distance = current_range_nm
-                self.cpa_bearing = self.angle  # *** NEW ***
-                
-        except Exception as e:
-            print(f"[ERROR] Tactical calculation error: {e}")
-            self.closing_rate = 0.0
-            self.closing_rate_type = "STEADY"
-            self.cpa_distance = 0.0
-            self.time_to_cpa = 999.0
-            self.cpa_bearing = self.angle  # *** NEW ***    
-            
     def fade(self):
         """Fade target if not updated recently"""
-        time_since_update = pygame.time.get_ticks() - self.last_update
+        time_since_update = sim_clock.ticks() - self.last_update
         if time_since_update > 1000:
             self.alpha = max(0, 255 - (time_since_update - 1000) // 10)
             return self.alpha > 0
@@ -2716,30 +3371,13 @@ class Target:
         return (self.distance / RADAR_RADIUS) * range_setting
     
     def get_position(self):
-        """Get screen position with validation"""
-        # Convert to Python floats
-        angle = float(self.angle)
-        distance = float(self.distance)
-        
-        # Check for invalid values
-        if math.isnan(angle) or math.isnan(distance):
-            print(f"[WARNING] Target {self.id} has invalid angle or distance")
-            return (float(RADAR_CENTER[0]), float(RADAR_CENTER[1]))
-        
-        x = float(RADAR_CENTER[0] + distance * math.cos(math.radians(angle - 90)) * zoom_level)
-        y = float(RADAR_CENTER[1] + distance * math.sin(math.radians(angle - 90)) * zoom_level)
-        
-        # Check for NaN results
-        if math.isnan(x) or math.isnan(y):
-            print(f"[WARNING] Target {self.id} position calculation resulted in NaN")
-            return (float(RADAR_CENTER[0]), float(RADAR_CENTER[1]))
-        
-        return (x, y)
+        """Get screen position (from the shared projection cache)"""
+        return projection_cache.position(self)
         
     def to_data(self):
         """Convert to TargetData for logging"""
         return TargetData(
-            timestamp=time.time(),
+            timestamp=sim_clock.now(),
             target_id=self.id,
             bearing=self.angle,
             range_nm=self.get_range_nm(),
@@ -2752,6 +3390,49 @@ class Target:
             detection_mode=self.detection_mode
         )
 
+CLOSING_RATE_TYPES = ("RAPID OPEN", "OPENING", "STEADY", "CLOSING", "RAPID CLOSE")
+CLOSING_RATE_EDGES = np.array([-15.0, -5.0, 5.0, 15.0])
+
+def compute_tactical_batch(bearing, distance, velocity, course, own_speed, own_course):
+    """Closing rate and CPA for many targets at once (bearing in degrees, course in radians)"""
+    pixels_to_nm = 50 / RADAR_RADIUS
+    bearing = np.nan_to_num(np.asarray(bearing, dtype=np.float64))
+    distance = np.nan_to_num(np.asarray(distance, dtype=np.float64))
+    speed_knots = np.nan_to_num(np.asarray(velocity, dtype=np.float64)) * pixels_to_nm * 3600
+    course = np.nan_to_num(np.asarray(course, dtype=np.float64))
+    
+    target_vx, target_vy = polar_to_world(np.degrees(course), speed_knots)
+    own_vx, own_vy = polar_to_world(own_course, own_speed)
+    rel_vx = target_vx - own_vx
+    rel_vy = target_vy - own_vy
+    
+    sin_b, cos_b = polar_to_world(bearing, np.ones_like(bearing))
+    closing_rate = -(rel_vx * sin_b + rel_vy * cos_b)
+    
+    # CPA in NM / seconds relative to own ship
+    range_nm = distance * pixels_to_nm
+    x = range_nm * sin_b
+    y = range_nm * cos_b
+    rel_vx = rel_vx / 3600
+    rel_vy = rel_vy / 3600
+    rel_speed_sq = rel_vx**2 + rel_vy**2
+    moving = rel_speed_sq > 0.0001**2
+    
+    t = np.where(moving, -(x * rel_vx + y * rel_vy) / np.where(moving, rel_speed_sq, 1.0), 0.0)
+    approaching = moving & (t > 0)
+    t = np.where(approaching, t, 0.0)
+    cpa_x = x + rel_vx * t
+    cpa_y = y + rel_vy * t
+    
+    return {
+        "closing_rate": closing_rate,
+        "closing_type": np.searchsorted(CLOSING_RATE_EDGES, closing_rate, side="left"),
+        "estimated_speed": np.abs(speed_knots),
+        "cpa_distance": np.hypot(cpa_x, cpa_y),
+        "cpa_bearing": np.degrees(np.arctan2(cpa_x, cpa_y)) % 360,
+        "time_to_cpa": np.where(approaching, t / 60, np.where(moving, 0.0, 999.0)),
+    }
+
 class TargetManager:
     """Manages all targets"""
     
@@ -2760,6 +3441,9 @@ class TargetManager:
         self.selected_target: Optional[Target] = None
         self.collision_pairs = []
         self.target_size_filter = 0.0  # Minimum intensity to show
+        self.tactical = None  # batched results from update_tactical_data
+        self.tactical_version = 0
+        self._tactical_signature = None
         
     def update_or_create(self, angle, distance, intensity, sound_types, threat_level, detection_mode, audio_data=None):
         """Update existing target or create new one"""
@@ -2783,6 +3467,7 @@ class TargetManager:
                 target.update(angle, distance, intensity)
                 target.sound_types = sound_types
                 target.threat_level = threat_level
+                classification_scheduler.observe(target, audio_data)
                 
                 # Log to recorder
                 if recorder.recording:
@@ -2793,8 +3478,8 @@ class TargetManager:
         
         # Create new target
         new_target = Target(angle, distance, intensity, sound_types, threat_level, detection_mode)
-        if audio_data is not None:
-            new_target.update_classification(audio_data)
+        # Classification is deferred to the scheduler so bursts of contacts stay cheap
+        classification_scheduler.observe(new_target, audio_data)
        
         self.targets[new_target.id] = new_target
         
@@ -2816,6 +3501,7 @@ class TargetManager:
             if self.selected_target and self.selected_target.id == target_id:
                 self.selected_target = None
             del self.targets[target_id]
+            classification_scheduler.forget(target_id)
     
     def select_target_at(self, pos):
         """Select target at mouse position"""
@@ -2830,93 +3516,479 @@ class TargetManager:
         self.selected_target = None
         return None
     
+    def update_tactical_data(self):
+        """Recalculate closing rate and CPA for all targets in one batch"""
+        targets = list(self.targets.values())
+        count = len(targets)
+        ids = np.fromiter((t.id for t in targets), dtype=np.int64, count=count)
+        bearing = np.fromiter((t.angle for t in targets), dtype=np.float64, count=count)
+        distance = np.fromiter((t.distance for t in targets), dtype=np.float64, count=count)
+        velocity = np.fromiter((t.velocity for t in targets), dtype=np.float64, count=count)
+        course = np.fromiter((t.velocity_angle for t in targets), dtype=np.float64, count=count)
+        
+        result = compute_tactical_batch(bearing, distance, velocity, course,
+                                        own_ship["speed"], own_ship["course"])
+        
+        for i, target in enumerate(targets):
+            target.closing_rate = float(result["closing_rate"][i])
+            target.closing_rate_type = CLOSING_RATE_TYPES[result["closing_type"][i]]
+            target.estimated_speed = float(result["estimated_speed"][i])
+            target.cpa_distance = float(result["cpa_distance"][i])
+            target.cpa_bearing = float(result["cpa_bearing"][i])
+            target.time_to_cpa = float(result["time_to_cpa"][i])
+        
+        result.update(ids=ids, bearing=bearing, distance=distance)
+        self.tactical = result
+        
+        # Bump the version only when something a display would show has changed
+        signature = np.concatenate([
+            ids.astype(np.float64), np.round(bearing, 1), np.round(distance),
+            np.round(result["cpa_distance"], 1), np.round(result["cpa_bearing"], 1),
+            np.round(result["time_to_cpa"]), result["closing_rate"] > 5,
+        ]).tobytes()
+        if signature != self._tactical_signature:
+            self._tactical_signature = signature
+            self.tactical_version += 1
+    
     def check_collisions(self):
         """Check for target collisions"""
         self.collision_pairs = []
         targets_list = list(self.targets.values())
+        if len(targets_list) < 2:
+            return
         
-        for i, t1 in enumerate(targets_list):
-            for t2 in targets_list[i+1:]:
-                dist = math.sqrt(
-                    (t1.distance * math.cos(math.radians(t1.angle)) - 
-                     t2.distance * math.cos(math.radians(t2.angle)))**2 +
-                    (t1.distance * math.sin(math.radians(t1.angle)) - 
-                     t2.distance * math.sin(math.radians(t2.angle)))**2
-                )
-                if dist < 20:
-                    self.collision_pairs.append((t1, t2))
+        count = len(targets_list)
+        east, north = polar_to_world(
+            np.fromiter((t.angle for t in targets_list), dtype=np.float64, count=count),
+            np.fromiter((t.distance for t in targets_list), dtype=np.float64, count=count))
+        
+        # Sort and sweep along east: only neighbours less than 20 apart in x can collide
+        order = np.argsort(east)
+        xs = east[order]
+        ys = north[order]
+        pairs_i, pairs_j = [], []
+        for k in range(1, count):
+            near_x = xs[k:] - xs[:-k] < 20
+            if not near_x.any():
+                break
+            close = near_x & ((xs[k:] - xs[:-k])**2 + (ys[k:] - ys[:-k])**2 < 20**2)
+            idx = np.flatnonzero(close)
+            pairs_i.append(order[idx])
+            pairs_j.append(order[idx + k])
+        if not pairs_i:
+            return
+        
+        for a, b in zip(np.concatenate(pairs_i).tolist(), np.concatenate(pairs_j).tolist()):
+            self.collision_pairs.append((targets_list[a], targets_list[b]))
     
     def clear_all(self):
         """Clear all targets"""
         self.targets.clear()
         self.selected_target = None
         self.collision_pairs = []
+        classification_scheduler.clear()
 
 target_manager = TargetManager()
 
 # ============================================================================
-# SONAR PULSE SYSTEM
+# CLASSIFICATION SERVICE
 # ============================================================================
 
-def send_sonar_pulse():
-    """Send active sonar pulse"""
-    global sonar_pulse_time, sonar_echo_targets
-    
-    sonar_pulse_time = pygame.time.get_ticks()
-    sonar_echo_targets = []
+# Shared memory blocks attached by this worker process, keyed by block name
+_worker_shared_blocks = {}
+
+def _signature_worker(block_name, shape, sample_rate):
+    """Process pool job: extract an acoustic signature from a shared audio window"""
+    block = _worker_shared_blocks.get(block_name)
+    if block is None:
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_shared_blocks[block_name] = block
+    
+    audio_data = np.ndarray(shape, dtype=np.float32, buffer=block.buf)
+    return TargetClassifier.generate_signature_from_audio(audio_data, sample_rate)
+
+class ClassificationService:
+    """Runs signature extraction for many tracks in a process pool"""
+    
+    def __init__(self, max_workers=None, slots=32, slot_frames=CHUNK * 4):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.slots = slots  # Audio windows that can be in flight at once
+        self.slot_frames = slot_frames  # Longest audio window a slot can hold
+        self.executor = None
+        self.shared_blocks = []
+        self.free_slots = deque()
+        self.in_flight = {}  # target_id -> (future, slot)
+        self.stats = {"submitted": 0, "completed": 0, "rejected": 0, "failed": 0}
+    
+    @property
+    def running(self):
+        return self.executor is not None
+    
+    def start(self):
+        """Start the worker pool (call before audio threads are running)"""
+        if self.running:
+            return True
+        
+        # Workers are forked so they inherit the classifier without re-running
+        # this script's display and audio setup
+        if "fork" not in multiprocessing.get_all_start_methods():
+            print("[CLASSIFY] Process pool unavailable on this platform, classifying in-process")
+            return False
+        
+        try:
+            block_size = self.slot_frames * CHANNELS * np.dtype(np.float32).itemsize
+            for slot in range(self.slots):
+                self.shared_blocks.append(shared_memory.SharedMemory(create=True, size=block_size))
+                self.free_slots.append(slot)
+            
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("fork")
+            )
+            # The pool only forks on its first submit; do that now, while this
+            # is still the only thread, rather than under the audio callback
+            self.executor.submit(int).result()
+        except Exception as e:
+            print(f"[CLASSIFY] Failed to start process pool: {e}")
+            self.shutdown()
+            return False
+        
+        print(f"[CLASSIFY] Process pool started with {self.max_workers} workers")
+        return True
     
-    # Simulate echo returns
-    for target in target_manager.targets.values():
-        # Calculate echo delay based on distance
-        echo_delay = (target.distance / RADAR_RADIUS) * 1000  # milliseconds
-        echo_strength = target.intensity * 0.8  # Echo attenuation
+    def submit(self, target_id, audio_data):
+        """Queue a signature job; returns False if it cannot be taken now"""
+        if not self.running or target_id in self.in_flight:
+            return False
         
-        sonar_echo_targets.append({
-            'target': target,
-            'echo_time': sonar_pulse_time + echo_delay,
-            'echo_strength': echo_strength,
-            'displayed': False
-        })
+        if not self.free_slots:
+            self.stats["rejected"] += 1
+            return False
+        
+        frames = audio_data.reshape(len(audio_data), -1)[-self.slot_frames:]
+        slot = self.free_slots.popleft()
+        window = np.ndarray(frames.shape, dtype=np.float32, buffer=self.shared_blocks[slot].buf)
+        window[:] = frames
+        del window
+        
+        try:
+            future = self.executor.submit(_signature_worker, self.shared_blocks[slot].name, frames.shape, FS)
+        except Exception as e:
+            print(f"[CLASSIFY] Process pool error, classifying in-process: {e}")
+            self.free_slots.append(slot)
+            self.shutdown()
+            return False
+        
+        self.in_flight[target_id] = (future, slot)
+        self.stats["submitted"] += 1
+        return True
     
-    print(f"[SONAR] Pulse sent. Expecting {len(sonar_echo_targets)} echoes")
-
-def process_sonar_echoes():
-    """Process and display sonar echoes"""
-    current_time = pygame.time.get_ticks()
+    def is_pending(self, target_id):
+        return target_id in self.in_flight
     
-    for echo in sonar_echo_targets:
-        if not echo['displayed'] and current_time >= echo['echo_time']:
-            # Display echo
-            echo['displayed'] = True
-            target = echo['target']
+    def poll(self):
+        """Collect finished jobs as a list of (target_id, signature)"""
+        finished = []
+        
+        for target_id, (future, slot) in list(self.in_flight.items()):
+            if not future.done():
+                continue
             
-            # Play echo sound
-            sound_system.play_sonar_echo(echo['echo_strength'])  # NEW
+            del self.in_flight[target_id]
+            self.free_slots.append(slot)
             
-            # Update target with accurate range
-            config = ModeConfig.get_config(DetectionMode.ACTIVE_SONAR)
-            actual_distance = target.distance * config['range_multiplier']
-            target.update(target.angle, actual_distance, echo['echo_strength'])
+            error = future.exception()
+            if error is not None:
+                print(f"[CLASSIFY] Signature job for target {target_id} failed: {error}")
+                self.stats["failed"] += 1
+                continue
+            
+            finished.append((target_id, future.result()))
+            self.stats["completed"] += 1
+        
+        return finished
+    
+    def shutdown(self):
+        """Stop the workers and release the shared audio windows"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        
+        self.in_flight.clear()
+        self.free_slots.clear()
+        for block in self.shared_blocks:
+            try:
+                block.close()
+                block.unlink()
+            except Exception:
+                pass
+        self.shared_blocks = []
+
+# Initialize classification service
+classification_service = ClassificationService()
 
 # ============================================================================
-# AUDIO ANALYSIS
+# CLASSIFICATION SCHEDULER
 # ============================================================================
 
-def analyze_audio():
-    """Analyze audio for target detection"""
-    global current_noise_data
-    
-    if not audio_enabled or len(audio_queue) == 0:
-        return
+class ClassificationScheduler:
+    """Reclassifies targets on feature drift or label age, with a per-frame cap"""
+    
+    # Higher value = classified sooner when the queue is over budget
+    THREAT_PRIORITY = {
+        "HOSTILE": 3.0,
+        "UNKNOWN": 2.0,
+        "NEUTRAL": 1.0,
+        "FRIENDLY": 0.0
+    }
     
-    try:
-        audio_data = audio_queue[-1]
+    def __init__(self, max_per_frame=4, max_age=5.0, drift_threshold=1.0):
+        self.max_per_frame = max_per_frame  # Classifications per frame
+        self.max_age = max_age  # Seconds before a label is refreshed regardless of drift
+        self.drift_threshold = drift_threshold
         
-        # Stereo to mono
-        if audio_data.shape[1] == 2:
-            audio_mono = np.mean(audio_data, axis=1)
-        else:
-            audio_mono = audio_data[:, 0]
+        # Feature change that counts as one unit of drift
+        self.drift_scales = {
+            "source_level_db": 6.0,
+            "speed_knots": 5.0,
+            "bearing_rate": 5.0
+        }
+        
+        self.signature_cache = {}  # target_id -> last AcousticSignature
+        self.feature_cache = {}  # target_id -> features at last classification
+        self.last_classified = {}  # target_id -> timestamp
+        self.pending_audio = {}  # target_id -> newest audio window
+        self.pending_level = {}  # target_id -> source level of newest audio window
+        self.submitted_features = {}  # target_id -> features sent with a service job
+        self.stats = {"classified": 0, "deferred": 0}
+    
+    def observe(self, target, audio_data):
+        """Remember the newest audio window seen for a target"""
+        if audio_data is None:
+            return
+        
+        if len(audio_data.shape) > 1:
+            audio_mono = np.mean(audio_data, axis=1)
+        else:
+            audio_mono = audio_data
+        
+        # Same level estimate as generate_signature_from_audio, without the FFT
+        rms = np.sqrt(np.mean(audio_mono**2))
+        self.pending_audio[target.id] = audio_data
+        self.pending_level[target.id] = 20 * np.log10(rms + 1e-10) + 120
+    
+    def _features(self, target):
+        """Cheap features used to detect drift since the last classification"""
+        if target.id in self.pending_level:
+            source_level = self.pending_level[target.id]
+        else:
+            source_level = self.signature_cache[target.id].source_level_db
+        
+        return {
+            "source_level_db": float(source_level),
+            "speed_knots": target.get_speed_knots(),
+            "bearing_rate": target.angular_velocity
+        }
+    
+    def drift(self, target_id, features):
+        """Largest scaled feature change since the last classification"""
+        previous = self.feature_cache.get(target_id)
+        if previous is None:
+            return float("inf")
+        
+        return max(abs(features[key] - previous[key]) / scale
+                   for key, scale in self.drift_scales.items())
+    
+    def run(self, targets, now=None):
+        """Reclassify the most urgent targets, up to max_per_frame"""
+        if now is None:
+            now = sim_clock.now()
+        
+        # Signatures finished by the classification service since the last tick
+        ready = []
+        for target_id, signature in classification_service.poll():
+            features = self.submitted_features.pop(target_id, None)
+            target = targets.get(target_id)
+            if target is not None and features is not None:
+                self.signature_cache[target_id] = signature
+                ready.append((target, features))
+        
+        ready_ids = {target.id for target, _ in ready}
+        
+        queue = []
+        for target in targets.values():
+            if target.id in ready_ids or classification_service.is_pending(target.id):
+                continue  # Already handled this tick or result still in flight
+            
+            has_signature = target.id in self.signature_cache
+            if not has_signature and target.id not in self.pending_audio:
+                continue  # Nothing to classify from yet
+            
+            features = self._features(target)
+            if has_signature:
+                age = now - self.last_classified.get(target.id, now)
+                if age < self.max_age and self.drift(target.id, features) < self.drift_threshold:
+                    continue
+                staleness = min(age / self.max_age, 3.0)
+            else:
+                staleness = 3.0  # Never classified
+            
+            priority = self.THREAT_PRIORITY.get(target.threat_level, 1.0) + staleness
+            heapq.heappush(queue, (-priority, target.id, features))
+        
+        submitted = 0
+        while queue and submitted < self.max_per_frame:
+            _, target_id, features = heapq.heappop(queue)
+            target = targets[target_id]
+            submitted += 1
+            
+            # New audio needs a fresh signature; otherwise reuse the cached one
+            audio_data = self.pending_audio.get(target_id)
+            if audio_data is not None:
+                if classification_service.submit(target_id, audio_data):
+                    self.submitted_features[target_id] = features
+                    self._drop_pending(target_id)
+                    continue
+                if classification_service.running:
+                    continue  # Pool saturated - retry on a later tick
+                
+                signature = target_classifier.generate_signature_from_audio(audio_data, FS)
+                self.signature_cache[target_id] = signature
+                self._drop_pending(target_id)
+            
+            ready.append((target, features))
+        self.stats["deferred"] = len(queue)
+        
+        if not ready:
+            return 0
+        
+        signatures = [self.signature_cache[target.id] for target, _ in ready]
+        results = TargetClassifier.classify_batch(
+            signatures,
+            [target.get_speed_knots() for target, _ in ready],
+            [target.angular_velocity for target, _ in ready]
+        )
+        
+        for (target, features), signature, result in zip(ready, signatures, results):
+            target.apply_classification(signature, result)
+            features["source_level_db"] = float(signature.source_level_db)
+            self.feature_cache[target.id] = features
+            self.last_classified[target.id] = now
+        
+        self.stats["classified"] += len(ready)
+        return len(ready)
+    
+    def _drop_pending(self, target_id):
+        self.pending_audio.pop(target_id, None)
+        self.pending_level.pop(target_id, None)
+    
+    def forget(self, target_id):
+        """Drop cached state for a removed target"""
+        self.signature_cache.pop(target_id, None)
+        self.feature_cache.pop(target_id, None)
+        self.last_classified.pop(target_id, None)
+        self._drop_pending(target_id)
+    
+    def clear(self):
+        """Drop cached state for all targets"""
+        self.signature_cache.clear()
+        self.feature_cache.clear()
+        self.last_classified.clear()
+        self.pending_audio.clear()
+        self.pending_level.clear()
+        self.submitted_features.clear()
+
+# Initialize classification scheduler
+classification_scheduler = ClassificationScheduler()
+
+# ============================================================================
+# SONAR PULSE SYSTEM
+# ============================================================================
+
+def send_sonar_pulse():
+    """Send active sonar pulse"""
+    global sonar_pulse_time, sonar_echo_targets
+    
+    sonar_pulse_time = sim_clock.ticks()
+    sonar_echo_targets = []
+    
+    # Simulate echo returns
+    for target in target_manager.targets.values():
+        # Calculate echo delay based on distance
+        echo_delay = (target.distance / RADAR_RADIUS) * 1000  # milliseconds
+        echo_strength = target.intensity * 0.8  # Echo attenuation
+        
+        sonar_echo_targets.append({
+            'target': target,
+            'echo_time': sonar_pulse_time + echo_delay,
+            'echo_strength': echo_strength,
+            'displayed': False
+        })
+    
+    print(f"[SONAR] Pulse sent. Expecting {len(sonar_echo_targets)} echoes")
+
+def process_sonar_echoes():
+    """Process and display sonar echoes"""
+    current_time = sim_clock.ticks()
+    
+    for echo in sonar_echo_targets:
+        if not echo['displayed'] and current_time >= echo['echo_time']:
+            # Display echo
+            echo['displayed'] = True
+            target = echo['target']
+            
+            # Play echo sound
+            sound_system.play_sonar_echo(echo['echo_strength'])  # NEW
+            
+            # Update target with accurate range
+            config = ModeConfig.get_config(DetectionMode.ACTIVE_SONAR)
+            actual_distance = target.distance * config['range_multiplier']
+            target.update(target.angle, actual_distance, echo['echo_strength'])
+
+# ============================================================================
+# AUDIO ANALYSIS
+# ============================================================================
+
+def ingest_audio():
+    """Take the next unread audio block and update the noise floor
+    
+    Each block is consumed once, so a frame that runs several simulation
+    steps does not detect the same block several times. Returns None when
+    no new block has arrived since the last step.
+    """
+    if not audio_enabled or len(audio_queue) == 0:
+        return None
+    
+    # Keep latency bounded if the stream got ahead of the simulation
+    while len(audio_queue) > AUDIO_MAX_BACKLOG:
+        audio_queue.popleft()
+    audio_data = audio_queue.popleft()
+    
+    # Update background noise level for SNR analyzer
+    try:
+        if audio_data.shape[1] == 2:
+            audio_mono = np.mean(audio_data, axis=1)
+        else:
+            audio_mono = audio_data[:, 0]
+        snr_analyzer.update_background_noise(audio_mono)
+    except:
+        pass
+    
+    return audio_data
+
+def analyze_audio(audio_data):
+    """Analyze audio for target detection; returns a detection or None"""
+    global current_noise_data
+    
+    if audio_data is None:
+        return None
+    
+    try:
+        # Stereo to mono
+        if audio_data.shape[1] == 2:
+            audio_mono = np.mean(audio_data, axis=1)
+        else:
+            audio_mono = audio_data[:, 0]
         
         # Calculate raw intensity BEFORE noise gate
         raw_intensity = np.sqrt(np.mean(audio_mono**2))
@@ -2941,13 +4013,13 @@ def analyze_audio():
         intensity = min(intensity * 50.0, 1.0)
         
         # Debug output every 30 frames (about twice per second at 60 FPS)
-        if pygame.time.get_ticks() % 500 < 20:
+        if sim_clock.ticks() % 500 < 20:
             print(f"[AUDIO] Raw: {raw_intensity:.4f} | Intensity: {intensity:.4f} | Gate: {noise_gate:.2f}")
         
         # Apply noise gate AFTER amplification
         if intensity < noise_gate:
             current_noise_data["intensity"] = 0.0
-            return
+            return None
         
         # FFT analysis
         fft_data = np.fft.fft(audio_mono_amplified)
@@ -3039,42 +4111,140 @@ def analyze_audio():
                 if angle_diff < 15 or angle_diff > 345:
                     should_detect = True
             
-            # Create target if detection conditions are met
+            # Report detection if conditions are met
             if should_detect:
-                dist = min(intensity * 15 * config["range_multiplier"], RADAR_RADIUS * 0.9)
-                types = [s["type"] for s in detected_sounds]
-                
-                target = target_manager.update_or_create(
-                    detected_angle,
-                    dist,
-                    intensity,
-                    types,
-                    threat_level,
-                    current_mode,
-                    audio_data  # Pass audio data for classification
-                )
-                
-                if target:
-                    print(f"[TARGET] Created/Updated target {target.id} at angle {detected_angle:.1f}°, distance {dist:.1f}")
-                    
-                    # Update last detection time for cooldown
-                    current_time = pygame.time.get_ticks()
-                    
-                    # Play detection sound with cooldown
-                    if (target.id not in last_detection_time or 
-                        current_time - last_detection_time.get(target.id, 0) > 1000):  # 1 second cooldown
-                        
-                        sound_system.play_target_detection(
-                            target.threat_level, 
-                            target.intensity
-                        )
-                        last_detection_time[target.id] = current_time
+                return {
+                    "angle": detected_angle,
+                    "distance": min(intensity * 15 * config["range_multiplier"], RADAR_RADIUS * 0.9),
+                    "intensity": intensity,
+                    "types": [s["type"] for s in detected_sounds],
+                    "threat_level": threat_level,
+                    "mode": current_mode,
+                    "audio_data": audio_data,  # Pass audio data for classification
+                }
         # ========== END DETECTION LOGIC ==========
         
     except Exception as e:
         print(f"[AUDIO] Analysis error: {e}")
         import traceback
         traceback.print_exc()
+    
+    return None
+
+def associate_detection(detection):
+    """Fold a detection into the track table, then age out and collide tracks"""
+    if detection:
+        target = target_manager.update_or_create(
+            detection["angle"],
+            detection["distance"],
+            detection["intensity"],
+            detection["types"],
+            detection["threat_level"],
+            detection["mode"],
+            detection["audio_data"]
+        )
+        
+        if target:
+            print(f"[TARGET] Created/Updated target {target.id} at angle {detection['angle']:.1f}°, distance {detection['distance']:.1f}")
+            
+            # Play detection sound with cooldown
+            current_time = sim_clock.ticks()
+            if (target.id not in last_detection_time or 
+                current_time - last_detection_time.get(target.id, 0) > 1000):  # 1 second cooldown
+                
+                sound_system.play_target_detection(
+                    target.threat_level, 
+                    target.intensity
+                )
+                last_detection_time[target.id] = current_time
+    
+    # Process sonar echoes
+    if current_mode == DetectionMode.ACTIVE_SONAR:
+        process_sonar_echoes()
+    
+    # Update all targets
+    target_manager.update_all()
+    target_manager.check_collisions()
+
+# ============================================================================
+# FONT CACHE
+# ============================================================================
+
+class CachedFont:
+    """Font wrapper whose render() goes through the shared text cache"""
+    
+    def __init__(self, font, key):
+        self.font = font
+        self.key = key
+    
+    def render(self, text, antialias, color, background=None):
+        return font_cache.render(self, text, antialias, color, background)
+    
+    def render_uncached(self, text, antialias, color, background=None):
+        """Render without touching the cache (for text that changes every frame)"""
+        return self.font.render(text, antialias, color, background)
+    
+    def __getattr__(self, name):
+        # size(), get_linesize() etc. go straight to the pygame font
+        return getattr(self.font, name)
+
+class FontCache:
+    """Font registry keyed by (family, size, bold) plus an LRU of rendered text"""
+    
+    def __init__(self, max_surfaces=2048):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        self.hits = 0
+        self.misses = 0
+    
+    def get_font(self, family, size, bold=False):
+        """Get a shared font, loading it on first use"""
+        key = (family, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = CachedFont(pygame.font.SysFont(family, size, bold=bold), key)
+        return font
+    
+    def render(self, font, text, antialias, color, background=None):
+        """Render text, reusing the surface if this exact label was drawn recently"""
+        key = (text, font.key, tuple(color), antialias,
+               tuple(background) if background is not None else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+    
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def get_stats(self):
+        """Get cache statistics"""
+        return {
+            "fonts": len(self.fonts),
+            "surfaces": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate
+        }
+    
+    def clear(self):
+        """Drop rendered text (fonts stay loaded)"""
+        self.surfaces.clear()
+
+# Initialize font cache
+font_cache = FontCache()
+
 # ============================================================================
 # UI PANELS
 # ============================================================================
@@ -3091,6 +4261,70 @@ class DraggablePanel:
         self.original_height = height
         self.collapsed_height = 25
         
+        # Offscreen rendering
+        self.draw_fn = None
+        self.version_fn = None
+        self.surface = None
+        self.render_key = None
+        
+        # Refresh scheduling
+        self.refresh_hz = None  # None = re-render as soon as the data changes
+        self.next_due = 0.0
+        self.render_ms = 0.0  # smoothed render cost
+        self.last_render_ms = 0.0
+        self.render_count = 0
+        
+    def bind(self, draw_fn, version_fn=None, refresh_hz=None):
+        """Bind the content draw function, its data version and a target refresh rate"""
+        self.draw_fn = draw_fn
+        self.version_fn = version_fn
+        self.refresh_hz = refresh_hz
+        self.render_key = None
+    
+    def layout_key(self):
+        """Render inputs that force an immediate re-render when they change"""
+        return (self.collapsed, self.rect.size, current_theme_name, brightness)
+    
+    def invalidate(self):
+        """Force a re-render on the next refresh"""
+        self.render_key = None
+    
+    def current_render_key(self):
+        version = self.version_fn() if self.version_fn else None
+        return (version,) + self.layout_key()
+    
+    def refresh(self, key=None):
+        """Re-render the panel surface if its data changed; returns True if it did"""
+        if key is None:
+            key = self.current_render_key()
+        if key == self.render_key and self.surface is not None:
+            return False
+        self.render_key = key
+        
+        start = time.perf_counter()
+        self.render()
+        self.last_render_ms = (time.perf_counter() - start) * 1000
+        self.render_ms = self.last_render_ms if self.render_count == 0 else \
+            0.8 * self.render_ms + 0.2 * self.last_render_ms
+        self.render_count += 1
+        return True
+    
+    def render(self):
+        """Run the bound draw function against this panel's own surface"""
+        global screen
+        if self.surface is None or self.surface.get_size() != self.rect.size:
+            self.surface = pygame.Surface(self.rect.size).convert()
+        
+        # Draw functions use the global screen and panel.rect, so point both at the surface
+        saved_screen, saved_pos = screen, self.rect.topleft
+        screen = self.surface
+        self.rect.topleft = (0, 0)
+        try:
+            self.draw_fn(self)
+        finally:
+            screen = saved_screen
+            self.rect.topleft = saved_pos
+        
     def handle_event(self, event):
         if not self.visible:
             return False
@@ -3150,7 +4384,7 @@ class DraggablePanel:
         pygame.draw.rect(screen, border_color, title_rect, 1)
         
         # Draw title
-        font_title = pygame.font.SysFont("Courier New", 13, bold=True)
+        font_title = font_cache.get_font("Courier New", 13, bold=True)
         title_text = font_title.render(self.title, True, get_color("accent"))
         screen.blit(title_text, (self.rect.x + 10, self.rect.y + 5))
         
@@ -3174,8 +4408,8 @@ def draw_classification_panel(panel, target):
         panel.draw(screen)
         return
         
-    font_header = pygame.font.SysFont("Courier New", 10, bold=True)
-    font_data = pygame.font.SysFont("Courier New", 9, bold=True)
+    font_header = font_cache.get_font("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 9, bold=True)
     
     panel.draw(screen)
     
@@ -3298,8 +4532,8 @@ def draw_analytics_dashboard(panel):
         panel.draw(screen)
         return
         
-    font_header = pygame.font.SysFont("Courier New", 10, bold=True)
-    font_data = pygame.font.SysFont("Courier New", 9, bold=True)
+    font_header = font_cache.get_font("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 9, bold=True)
     
     panel.draw(screen)
     
@@ -3356,7 +4590,7 @@ def draw_analytics_dashboard(panel):
         y += 15
         
         for collision in collisions[:3]:  # Show only first 3
-            text = f"T{collision['target1']}-T{collision['target2']}: {collision['probability']*100:.0f}%"
+            text = f"T{collision['target1']}-T{collision['target2']}: {collision['probability']*100:.0f}% {collision['eta_seconds']:.0f}s"
             text_surf = font_data.render(text, True, get_color("danger"))
             screen.blit(text_surf, (panel.rect.x + 10, y))
             y += 15
@@ -3367,8 +4601,8 @@ def draw_mission_control(panel):
         panel.draw(screen)
         return
         
-    font_header = pygame.font.SysFont("Courier New", 10, bold=True)
-    font_data = pygame.font.SysFont("Courier New", 9, bold=True)
+    font_header = font_cache.get_font("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 9, bold=True)
     
     panel.draw(screen)
     
@@ -3410,7 +4644,7 @@ def draw_mission_control(panel):
     controls = [
         "[M] Toggle Mission",
         "[N] Next Scenario",
-        "[B] Toggle 3D Mode"
+        "[F5] Toggle 3D Mode"
     ]
     
     for control in controls:
@@ -3419,61 +4653,318 @@ def draw_mission_control(panel):
         y += 16
              
 # ============================================================================
-# RADAR DRAWING FUNCTIONS
+# POLAR RASTER REMAP
 # ============================================================================
-def draw_radar_background():
-    """Draw the radar display background"""
-    # Fill background
-    bg_color = tuple(int(c * brightness) for c in get_color("bg"))
-    screen.fill(bg_color)
+
+class PolarRemap:
+    """Cached screen-pixel -> (bearing, range) bin lookup for drawing polar grids"""
     
-    # Draw CRT effect if enabled
-    if crt_effect:
-        draw_crt_effect()
+    def __init__(self):
+        self.key = None
+        self.rect = None
+        self.index = None  # (w, h) flat grid index per pixel, -1 outside the disc
+    
+    def get(self, center, radius, bearing_bins, range_bins, bounds):
+        """Get (rect, index) for a polar grid drawn at center with the given radius"""
+        key = (center, radius, bearing_bins, range_bins, bounds)
+        if key != self.key:
+            self.key = key
+            self._build(center, radius, bearing_bins, range_bins, bounds)
+        return self.rect, self.index
+    
+    def _build(self, center, radius, bearing_bins, range_bins, bounds):
+        cx, cy = center
+        x0, x1 = max(0, cx - radius), min(bounds[0], cx + radius + 1)
+        y0, y1 = max(0, cy - radius), min(bounds[1], cy + radius + 1)
+        if x1 <= x0 or y1 <= y0 or radius <= 0:
+            self.rect, self.index = None, None
+            return
+        
+        dx = (np.arange(x0, x1) + 0.5 - cx)[:, None]
+        dy = (np.arange(y0, y1) + 0.5 - cy)[None, :]
+        dist = np.hypot(dx, dy)
+        bearing = np.degrees(np.arctan2(dx, -dy)) % 360
+        
+        b = (bearing * (bearing_bins / 360.0)).astype(np.int64) % bearing_bins
+        r = (dist / radius * range_bins).astype(np.int64)
+        index = b * range_bins + r
+        index[r >= range_bins] = -1
+        
+        self.rect = pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+        self.index = index
+
+class HeatmapOverlay:
+    """Draws DataAnalyzer's decaying activity heatmap over the radar in one blit"""
     
-    # Draw radar circles
-    primary_color = tuple(int(c * brightness) for c in get_color("primary"))
-    secondary_color = tuple(int(c * brightness * 0.3) for c in get_color("secondary"))
+    RESOLUTION = (180, 50)
+    REFERENCE_HALF_LIFE = 300.0  # seconds; much slower than the heatmap's own decay
+    MIN_REFERENCE = 1.0
     
-    # Range rings
-    for i in range(1, 5):
-        radius = int((RADAR_RADIUS / 4) * i * zoom_level)
-        pygame.draw.circle(screen, secondary_color, RADAR_CENTER, radius, 1)
+    def __init__(self):
+        self.remap = PolarRemap()
+        self.surface = None
+        self.palette_key = None
+        self.palette = None
+        self.reference = self.MIN_REFERENCE  # level drawn at full color
+        self.reference_time = None
+    
+    def _update_reference(self, peak, now):
+        """Follow a new peak at once but let the reference fall only slowly,
+        so the heatmap's half-life decay shows as fading"""
+        if self.reference_time is not None and now > self.reference_time:
+            self.reference *= 0.5 ** ((now - self.reference_time) / self.REFERENCE_HALF_LIFE)
+        self.reference_time = now
+        self.reference = max(self.reference, peak, self.MIN_REFERENCE)
+        return self.reference
+    
+    def _get_palette(self):
+        """256-entry packed RGBA ramp from the theme's secondary to danger colors"""
+        key = (current_theme_name, brightness, self.surface.get_bitsize())
+        if key != self.palette_key:
+            low = np.array(get_color("secondary")[:3], dtype=np.float64)
+            high = np.array(get_color("danger")[:3], dtype=np.float64)
+            t = np.linspace(0, 1, 256)[:, None]
+            rgb = ((low + (high - low) * t) * brightness).clip(0, 255).astype(int)
+            self.palette = np.array([self.surface.map_rgb((*rgb[i], i * 3 // 5)) & 0xFFFFFFFF for i in range(256)],
+                                    dtype=np.uint32)
+            self.palette_key = key
+        return self.palette
+    
+    def draw(self, surf, grid, now):
+        """Render the grid as a translucent polar overlay"""
+        peak = grid.max()
+        reference = self._update_reference(peak, now)
+        if peak <= 0:
+            return
         
-        # Range labels
-        if show_grid:
-            range_nm = (range_setting / 4) * i
-            font = pygame.font.SysFont("Courier New", 10)
-            label = font.render(f"{range_nm:.0f}NM", True, primary_color)
-            screen.blit(label, (RADAR_CENTER[0] + radius + 5, RADAR_CENTER[1] - 5))
+        rect, index = self.remap.get(RADAR_CENTER, int(RADAR_RADIUS * zoom_level),
+                                     grid.shape[0], grid.shape[1], surf.get_size())
+        if rect is None:
+            return
+        
+        if self.surface is None or self.surface.get_size() != rect.size:
+            self.surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        
+        # Trailing zero cell so index -1 (outside the disc) reads as empty
+        levels = np.append(np.sqrt(np.minimum(grid.ravel() / reference, 1.0)) * 255, 0).astype(np.uint8)
+        
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        pixels[...] = self._get_palette()[levels][index]
+        del pixels
+        
+        surf.blit(self.surface, rect.topleft)
+
+# Initialize heatmap overlay
+heatmap_overlay = HeatmapOverlay()
+
+def draw_heatmap_overlay():
+    """Draw the activity heatmap if enabled"""
+    if show_heatmap and quality_governor.settings["heatmap"]:
+        # Decay to the current time first; add() alone stops decaying when samples stop
+        now = sim_clock.now()
+        data_analyzer.activity_heatmap.decay(now)
+        heatmap_overlay.draw(screen, data_analyzer.activity_heatmap.get(HeatmapOverlay.RESOLUTION), now)
+
+class RasterPPI:
+    """Phosphor-style bearing x range intensity raster, drawn through PolarRemap"""
     
-    # Main radar circle
-    pygame.draw.circle(screen, primary_color, RADAR_CENTER, int(RADAR_RADIUS * zoom_level), 2)
+    RESOLUTION = (720, 200)  # 0.5 degree bearing bins
+    DECAY = 0.985  # phosphor persistence per simulation step
+    BEAM_SIGMA = 1.5  # degrees, spread of one return across bearing bins
     
-    # Draw grid if enabled
-    if show_grid:
-        draw_grid()
+    def __init__(self):
+        self.enabled = False
+        self.grid = np.zeros(self.RESOLUTION, dtype=np.float32)
+        self.remap = PolarRemap()
+        self.surface = None
+        self.palette_key = None
+        self.palette = None
+        
+        # Bearing-bin offsets and weights of the beam footprint
+        bins = self.RESOLUTION[0]
+        reach = int(math.ceil(3 * self.BEAM_SIGMA * bins / 360))
+        self.beam_offsets = np.arange(-reach, reach + 1)
+        self.beam_weights = np.exp(-0.5 * (self.beam_offsets * 360 / bins / self.BEAM_SIGMA) ** 2).astype(np.float32)
     
-    # Draw compass if enabled
-    if show_compass:
-        draw_compass()
+    def toggle(self):
+        """Toggle the raster display; the grid starts dark each time"""
+        self.enabled = not self.enabled
+        self.grid.fill(0)
+        print(f"[RASTER] PPI raster {'enabled' if self.enabled else 'disabled'}")
+    
+    def _deposit(self, bearings, range_bins, energy):
+        """Add beam-shaped returns at (bearing, range bin) cells"""
+        bins = self.RESOLUTION[0]
+        centre = (np.asarray(bearings) % 360 * (bins / 360)).astype(np.int64)
+        rows = (centre[:, None] + self.beam_offsets[None, :]) % bins
+        cols = np.broadcast_to(np.asarray(range_bins)[:, None], rows.shape)
+        np.add.at(self.grid, (rows, cols), np.asarray(energy, dtype=np.float32)[:, None] * self.beam_weights)
+    
+    def update(self, targets, sweep_from, sweep_to):
+        """Decay the phosphor, then paint this step's acoustic and swept returns"""
+        self.grid *= self.DECAY
+        
+        # Passive acoustic energy has bearing but no range: a faint radial streak
+        # (scaled so a steady source settles at half its intensity)
+        intensity = current_noise_data.get("intensity", 0.0)
+        if intensity > 0:
+            streak = np.arange(self.RESOLUTION[1])
+            bearing = math.degrees(current_noise_data.get("angle", 0.0))
+            level = intensity * 0.5 * (1 - self.DECAY)
+            self._deposit(np.full(streak.size, bearing), streak, np.full(streak.size, level))
+        
+        if not targets:
+            return
+        count = len(targets)
+        angles = np.fromiter((t.angle for t in targets), np.float64, count)
+        distances = np.fromiter((t.distance for t in targets), np.float64, count)
+        energy = np.fromiter((t.intensity for t in targets), np.float64, count)
+        mask = distances < RADAR_RADIUS
+        
+        # With a rotating sweep, returns light up fully as it passes over them;
+        # in fixed-beam modes every track is painted a little each step
+        swept = (sweep_to - sweep_from) % 360
+        if swept > 0:
+            mask &= (angles - sweep_from) % 360 <= swept
+        else:
+            energy = energy * (1 - self.DECAY)
+        if not mask.any():
+            return
+        
+        rows = (np.maximum(distances[mask], 0) / RADAR_RADIUS * self.RESOLUTION[1]).astype(np.int64)
+        bearings, energy = angles[mask], energy[mask]
+        last = self.RESOLUTION[1] - 1
+        self._deposit(np.concatenate((bearings, bearings, bearings)),
+                      np.concatenate((rows, np.maximum(rows - 1, 0), np.minimum(rows + 1, last))),
+                      np.concatenate((energy, energy * 0.5, energy * 0.5)))
+    
+    def _get_palette(self):
+        """256-entry packed RGBA phosphor ramp: dark primary up to near white"""
+        key = (current_theme_name, brightness, self.surface.get_bitsize())
+        if key != self.palette_key:
+            base = np.array(get_color("primary")[:3], dtype=np.float64) * brightness
+            t = np.linspace(0, 1, 256)[:, None]
+            glow = np.clip((t - 0.7) / 0.3, 0, 1) * 0.7
+            rgb = (base * np.minimum(1.0, 1.5 * t) + (255 - base) * glow).clip(0, 255).astype(int)
+            alpha = np.minimum(255, np.arange(256) * 2)
+            self.palette = np.array([self.surface.map_rgb((*rgb[i], alpha[i])) & 0xFFFFFFFF for i in range(256)],
+                                    dtype=np.uint32)
+            self.palette_key = key
+        return self.palette
+    
+    def draw(self, surf):
+        """One gather from grid cells to pixels and one blit"""
+        rect, index = self.remap.get(RADAR_CENTER, int(RADAR_RADIUS * zoom_level),
+                                     self.RESOLUTION[0], self.RESOLUTION[1], surf.get_size())
+        if rect is None:
+            return
+        
+        if self.surface is None or self.surface.get_size() != rect.size:
+            self.surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        
+        # Palette colour per cell, plus a trailing empty cell for index -1
+        colors = np.append(self._get_palette()[(np.clip(self.grid, 0, 1) * 255).astype(np.uint8).ravel()], 0)
+        
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        pixels[...] = colors[index]
+        del pixels
+        
+        surf.blit(self.surface, rect.topleft)
+
+# Initialize raster PPI
+raster_ppi = RasterPPI()
+
+# ============================================================================
+# RADAR DRAWING FUNCTIONS
+# ============================================================================
+class RadarBackgroundCache:
+    """Pre-rendered static PPI background, rebuilt only when its inputs change"""
     
-    # Center dot
-    pygame.draw.circle(screen, primary_color, RADAR_CENTER, 5)
+    def __init__(self):
+        self.key = None
+        self.surface = None
+        self.rebuilds = 0
+    
+    def current_key(self):
+        return (zoom_level, range_setting, current_theme_name, brightness,
+                screen.get_size(), show_grid, show_compass, RADAR_CENTER)
+    
+    def get(self):
+        """Get the background surface, rebuilding it if stale"""
+        key = self.current_key()
+        if key != self.key or self.surface is None:
+            self.surface = self.build(screen.get_size())
+            self.key = key
+            self.rebuilds += 1
+        return self.surface
+    
+    def invalidate(self):
+        """Force a rebuild on the next frame"""
+        self.key = None
+    
+    def build(self, size):
+        """Render rings, labels, grid and compass to a new surface"""
+        surf = pygame.Surface(size).convert()
+        
+        # Fill background
+        bg_color = tuple(int(c * brightness) for c in get_color("bg"))
+        surf.fill(bg_color)
+        
+        # Draw radar circles
+        primary_color = tuple(int(c * brightness) for c in get_color("primary"))
+        secondary_color = tuple(int(c * brightness * 0.3) for c in get_color("secondary"))
+        font = font_cache.get_font("Courier New", 10)
+        
+        # Range rings
+        for i in range(1, 5):
+            radius = int((RADAR_RADIUS / 4) * i * zoom_level)
+            pygame.draw.circle(surf, secondary_color, RADAR_CENTER, radius, 1)
+            
+            # Range labels
+            if show_grid:
+                range_nm = (range_setting / 4) * i
+                label = font.render(f"{range_nm:.0f}NM", True, primary_color)
+                surf.blit(label, (RADAR_CENTER[0] + radius + 5, RADAR_CENTER[1] - 5))
+        
+        # Main radar circle
+        pygame.draw.circle(surf, primary_color, RADAR_CENTER, int(RADAR_RADIUS * zoom_level), 2)
+        
+        # Draw grid if enabled
+        if show_grid:
+            draw_grid(surf)
+        
+        # Draw compass if enabled
+        if show_compass:
+            draw_compass(surf)
+        
+        # 2 NM danger circle around own ship
+        danger_radius_pixels = 2.0 * RADAR_RADIUS / 50
+        pygame.draw.circle(surf, get_color("danger"), RADAR_CENTER,
+                          int(danger_radius_pixels * zoom_level), 2)
+        
+        # Center dot
+        pygame.draw.circle(surf, primary_color, RADAR_CENTER, 5)
+        return surf
 
-def draw_grid():
+# Initialize radar background cache
+radar_background_cache = RadarBackgroundCache()
+
+def draw_radar_background():
+    """Draw the radar display background"""
+    screen.blit(radar_background_cache.get(), (0, 0))
+
+def draw_grid(surf):
     """Draw radar grid"""
     primary_color = tuple(int(c * brightness * 0.5) for c in get_color("primary"))
     
     # Radial lines every 30 degrees
     for angle in range(0, 360, 30):
-        end_x = RADAR_CENTER[0] + (RADAR_RADIUS * zoom_level) * math.cos(math.radians(angle - 90))
-        end_y = RADAR_CENTER[1] + (RADAR_RADIUS * zoom_level) * math.sin(math.radians(angle - 90))
-        pygame.draw.line(screen, primary_color, RADAR_CENTER, (end_x, end_y), 1)
+        end_x, end_y = polar_to_screen(angle, RADAR_RADIUS)
+        pygame.draw.line(surf, primary_color, RADAR_CENTER, (end_x, end_y), 1)
 
-def draw_compass():
+def draw_compass(surf):
     """Draw compass rose"""
-    font = pygame.font.SysFont("Courier New", 14, bold=True)
+    font = font_cache.get_font("Courier New", 14, bold=True)
     primary_color = tuple(int(c * brightness) for c in get_color("primary"))
     
     directions = [
@@ -3482,223 +4973,315 @@ def draw_compass():
     ]
     
     for angle, label in directions:
-        offset = (RADAR_RADIUS + 30) * zoom_level
-        x = RADAR_CENTER[0] + offset * math.cos(math.radians(angle - 90))
-        y = RADAR_CENTER[1] + offset * math.sin(math.radians(angle - 90))
+        x, y = polar_to_screen(angle, RADAR_RADIUS + 30)
         
         text = font.render(label, True, primary_color)
         text_rect = text.get_rect(center=(x, y))
-        screen.blit(text, text_rect)
-
-def draw_crt_effect():
-    """Draw CRT screen effect"""
-    # Scanlines
-    for y in range(0, HEIGHT, 3):
-        pygame.draw.line(screen, (0, 0, 0, 50), (0, y), (WIDTH, y), 1)
-    
-    # Screen curvature (simulated with vignette)
-    vignette = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    pygame.draw.circle(vignette, (0, 0, 0, 100), (WIDTH//2, HEIGHT//2), 
-                      int(min(WIDTH, HEIGHT) * 0.6))
-    pygame.draw.circle(vignette, (0, 0, 0, 0), (WIDTH//2, HEIGHT//2), 
-                      int(min(WIDTH, HEIGHT) * 0.4))
-    screen.blit(vignette, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
+        surf.blit(text, text_rect)
 
-def draw_sweep_line():
-    """Draw the radar sweep line"""
-    config = ModeConfig.get_config(current_mode)
-    
-    if current_mode == DetectionMode.OMNI_360:
-        # Draw pulsing circle for omni mode
-        pulse_alpha = int(128 + 127 * math.sin(pygame.time.get_ticks() / 200))
-        color = (*config["color"], pulse_alpha)
-        pygame.draw.circle(screen, color, RADAR_CENTER, int(RADAR_RADIUS * zoom_level), 2)
-        
-    elif current_mode == DetectionMode.NARROW_BEAM:
-        # Draw focused beam
-        angle = narrow_beam_angle
-        arc_width = config["detection_arc"]
-        
-        # Draw beam cone
-        for i in range(-int(arc_width/2), int(arc_width/2), 2):
-            beam_angle = angle + i
-            end_x = RADAR_CENTER[0] + (RADAR_RADIUS * zoom_level) * math.cos(math.radians(beam_angle - 90))
-            end_y = RADAR_CENTER[1] + (RADAR_RADIUS * zoom_level) * math.sin(math.radians(beam_angle - 90))
-            
-            alpha = int(255 * (1 - abs(i) / (arc_width/2)))
-            color = (*config["color"][:3], alpha)
-            pygame.draw.line(screen, color, RADAR_CENTER, (end_x, end_y), 2)
-            
-    elif current_mode == DetectionMode.WIDE_BEAM:
-        # Draw wide beam
-        arc_width = config["detection_arc"]
+class CRTOverlay:
+    """Cached CRT scanline + vignette overlay, applied once at the end of a frame"""
+    
+    def __init__(self, scanline_alpha=60, vignette_alpha=110, flicker=False, bloom=False):
+        self.scanline_alpha = scanline_alpha
+        self.vignette_alpha = vignette_alpha
+        self.flicker = flicker  # small random brightness wobble per frame
+        self.bloom = bloom  # blurred additive glow (costs a downscale/upscale per frame)
+        self.allow_animation = True  # quality governor turns flicker/bloom off under load
+        self.key = None
+        self.surface = None
+    
+    def invalidate(self):
+        self.key = None
+    
+    def build(self, size):
+        """Render scanlines and vignette into one SRCALPHA surface with numpy"""
+        width, height = size
+        
+        # Darken every third row
+        scan = np.zeros(height)
+        scan[::3] = self.scanline_alpha / 255.0
+        
+        # Darken toward the corners, starting 40% of the short side out from center
+        xs = np.arange(width) + 0.5 - width / 2
+        ys = np.arange(height) + 0.5 - height / 2
+        r = np.hypot(xs[:, None], ys[None, :]) / min(width, height)
+        t = np.clip((r - 0.4) / 0.3, 0.0, 1.0)
+        vignette = t * t * (3 - 2 * t) * (self.vignette_alpha / 255.0)
+        
+        alpha = 1 - (1 - scan[None, :]) * (1 - vignette)
+        
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.surface.fill(tuple(int(c * 0.2) for c in get_color("bg")[:3]) + (0,))
+        pixels_alpha = pygame.surfarray.pixels_alpha(self.surface)
+        pixels_alpha[...] = (alpha * 255).astype(np.uint8)
+        del pixels_alpha
+    
+    def apply(self, surf):
+        """Blend the overlay over the finished frame"""
+        key = (surf.get_size(), current_theme_name)
+        if key != self.key or self.surface is None:
+            self.build(surf.get_size())
+            self.key = key
+        
+        if self.bloom and self.allow_animation:
+            width, height = surf.get_size()
+            glow = pygame.transform.smoothscale(surf, (max(1, width // 4), max(1, height // 4)))
+            glow = pygame.transform.smoothscale(glow, (width, height))
+            glow.fill((60, 60, 60), special_flags=pygame.BLEND_RGB_MULT)
+            surf.blit(glow, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        
+        if self.flicker and self.allow_animation:
+            self.surface.set_alpha(random.randint(225, 255))
+        else:
+            self.surface.set_alpha(None)
         
-        for i in range(-int(arc_width/2), int(arc_width/2), 3):
-            beam_angle = sweep_angle + i
-            end_x = RADAR_CENTER[0] + (RADAR_RADIUS * zoom_level) * math.cos(math.radians(beam_angle - 90))
-            end_y = RADAR_CENTER[1] + (RADAR_RADIUS * zoom_level) * math.sin(math.radians(beam_angle - 90))
-            
-            alpha = int(128 * (1 - abs(i) / (arc_width/2)))
-            color = (*config["color"][:3], alpha)
-            pygame.draw.line(screen, color, RADAR_CENTER, (end_x, end_y), 2)
-    
-    else:
-        # Standard sweep line
-        end_x = RADAR_CENTER[0] + (RADAR_RADIUS * zoom_level) * math.cos(math.radians(sweep_angle - 90))
-        end_y = RADAR_CENTER[1] + (RADAR_RADIUS * zoom_level) * math.sin(math.radians(sweep_angle - 90))
-        pygame.draw.line(screen, config["color"], RADAR_CENTER, (end_x, end_y), 2)
-        
-        # Draw fade trail
-        for i in range(1, 20):
-            trail_angle = sweep_angle - i * 2
-            trail_alpha = int(255 * (1 - i / 20))
-            trail_end_x = RADAR_CENTER[0] + (RADAR_RADIUS * zoom_level) * math.cos(math.radians(trail_angle - 90))
-            trail_end_y = RADAR_CENTER[1] + (RADAR_RADIUS * zoom_level) * math.sin(math.radians(trail_angle - 90))
-            
-            color = (*config["color"][:3], trail_alpha)
-            pygame.draw.line(screen, color, RADAR_CENTER, (trail_end_x, trail_end_y), 1)
-
-def draw_target(target):
-    """Draw a single target"""
-    pos = target.get_position()
-    color = target.get_color()
-    
-    # Convert pos to regular Python floats
-    pos = (float(pos[0]), float(pos[1]))
+        surf.blit(self.surface, (0, 0))
     
-    # Validate position
-    if math.isnan(pos[0]) or math.isnan(pos[1]):
-        print(f"[ERROR] Target {target.id} has NaN position: {pos}")
-        return
+    @property
+    def animated(self):
+        """True if the overlay changes every frame (needs a full present)"""
+        return (self.flicker or self.bloom) and self.allow_animation
+
+# Initialize CRT overlay
+crt_overlay = CRTOverlay()
+
+class SweepRenderer:
+    """Sweep beams and trails as pre-rendered alpha sprites, rotated once per frame
+
+    A moving sweep visits every degree in turn, so a rotation cache only
+    helps if it holds all 360, which is too much memory for full-size
+    sprites. The last rotation is kept for beams that stand still.
+    """
     
-    # Draw trail with validation
-    if len(target.trail_points) > 1:
-        trail_color = (*color[:3], 100)
-        
-        # Filter out invalid points from trail and convert to Python floats
-        valid_trail_points = []
-        for point in target.trail_points:
-            # Check if point is valid and convert to Python floats
-            try:
-                if (isinstance(point, (tuple, list)) and len(point) == 2):
-                    # Convert numpy types to Python floats
-                    x = float(point[0])
-                    y = float(point[1])
-                    
-                    if not (math.isnan(x) or math.isnan(y) or 
-                           not math.isfinite(x) or not math.isfinite(y)):
-                        valid_trail_points.append((x, y))
-            except (TypeError, ValueError) as e:
-                print(f"[WARNING] Target {target.id}: Invalid trail point conversion: {point} - {e}")
-        
-        # Only draw if we have at least 2 valid points
-        if len(valid_trail_points) >= 2:
-            try:
-                pygame.draw.lines(screen, trail_color, False, valid_trail_points, 1)
-            except Exception as e:
-                print(f"[ERROR] Target {target.id}: Error drawing trail: {e}")
+    def __init__(self):
+        self.sprites = {}  # (mode, color, radius) -> (surface, pivot)
+        self.last_rotation = None  # ((sprite key, degree), (surface, pivot offset))
+        self.ring_key = None
+        self.ring = None
     
-    # Draw classification icon if available
-    if target.classification and target.classification_confidence > 0.5:
-        font_icon = pygame.font.SysFont("Segoe UI Emoji", 12)
-        icon = target.classification.get("icon", "?")
-        icon_surf = font_icon.render(icon, True, color)
-        screen.blit(icon_surf, (int(pos[0]) - 6, int(pos[1]) - 20))
+    @staticmethod
+    def wedge_lines(mode, arc_width):
+        """(relative angle, alpha, width) for each line of a mode's beam, drawn in order"""
+        if mode == DetectionMode.NARROW_BEAM:
+            half = arc_width / 2
+            return [(i, int(255 * (1 - abs(i) / half)), 2) for i in range(-int(half), int(half), 2)]
+        if mode == DetectionMode.WIDE_BEAM:
+            half = arc_width / 2
+            return [(i, int(128 * (1 - abs(i) / half)), 2) for i in range(-int(half), int(half), 3)]
+        # Fading trail behind a solid leading line
+        return [(-i * 2, int(255 * (1 - i / 20)), 1) for i in range(19, 0, -1)] + [(0, 255, 2)]
+    
+    def get_sprite(self, mode, color, radius, arc_width):
+        """Beam sprite pointing at bearing 0, cropped, with the pivot position inside it"""
+        key = (mode, color, radius)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            size = radius * 2 + 4
+            pivot = (radius + 2, radius + 2)
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            for rel_angle, alpha, width in self.wedge_lines(mode, arc_width):
+                end = polar_to_screen(rel_angle, radius, center=pivot, zoom=1.0)
+                pygame.draw.line(surf, (*color[:3], alpha), pivot, end, width)
+            
+            bounds = surf.get_bounding_rect()
+            cropped = surf.subsurface(bounds).copy()
+            sprite = self.sprites[key] = (cropped, (pivot[0] - bounds.x, pivot[1] - bounds.y))
+        return sprite
+    
+    def get_rotated(self, mode, color, radius, arc_width, bearing):
+        """Sprite rotated to a whole-degree bearing, plus the pivot's offset from its center"""
+        degree = int(round(bearing)) % 360
+        key = ((mode, color, radius), degree)
+        if self.last_rotation is not None and self.last_rotation[0] == key:
+            return self.last_rotation[1]
+        
+        surf, pivot = self.get_sprite(mode, color, radius, arc_width)
+        w, h = surf.get_size()
+        ox, oy = pivot[0] - w / 2, pivot[1] - h / 2
+        
+        # pygame rotates counter-clockwise; bearings run clockwise
+        rotated_surf = pygame.transform.rotate(surf, -degree)
+        sin_d, neg_cos_d = bearing_vector(degree)
+        cos_d = -neg_cos_d
+        offset = (ox * cos_d - oy * sin_d, ox * sin_d + oy * cos_d)
+        
+        rotated = (rotated_surf, offset)
+        self.last_rotation = (key, rotated)
+        return rotated
+    
+    def draw_ring(self, surf, color, radius, alpha):
+        """Pulsing omni ring: one cached opaque sprite, alpha applied per surface"""
+        key = (color, radius)
+        if key != self.ring_key:
+            size = radius * 2 + 4
+            self.ring = pygame.Surface((size, size))
+            self.ring.set_colorkey((0, 0, 0))
+            pygame.draw.circle(self.ring, color[:3], (radius + 2, radius + 2), radius, 2)
+            self.ring_key = key
+        self.ring.set_alpha(alpha)
+        surf.blit(self.ring, (RADAR_CENTER[0] - radius - 2, RADAR_CENTER[1] - radius - 2))
+    
+    def draw(self, surf, mode, config, bearing):
+        radius = int(RADAR_RADIUS * zoom_level)
+        color = tuple(config["color"])
+        
+        if mode == DetectionMode.OMNI_360:
+            pulse_alpha = int(128 + 127 * math.sin(sim_clock.ticks() / 200))
+            self.draw_ring(surf, color, radius, pulse_alpha)
+            return
         
-    # Draw target symbol
-    size = 8
-    if target_manager.selected_target == target:
-        size = 12
-        # Draw selection ring
-        pygame.draw.circle(screen, get_color("accent"), (int(pos[0]), int(pos[1])), 20, 2)
+        rotated, (ox, oy) = self.get_rotated(mode, color, radius, config["detection_arc"], bearing)
+        center = (RADAR_CENTER[0] - ox, RADAR_CENTER[1] - oy)
+        surf.blit(rotated, rotated.get_rect(center=center))
     
-    # Draw target icon based on threat
-    if target.threat_level == "HOSTILE":
-        # Triangle
-        points = [
-            (pos[0], pos[1] - size),
-            (pos[0] - size, pos[1] + size),
-            (pos[0] + size, pos[1] + size)
-        ]
-        # Convert points to integers for pygame
-        int_points = [(int(p[0]), int(p[1])) for p in points]
-        pygame.draw.polygon(screen, color, int_points)
-    elif target.threat_level == "FRIENDLY":
-        # Circle
-        pygame.draw.circle(screen, color, (int(pos[0]), int(pos[1])), size)
-    else:
-        # Square
-        rect = pygame.Rect(int(pos[0] - size//2), int(pos[1] - size//2), size, size)
-        pygame.draw.rect(screen, color, rect)
-    
-    # Draw ID label
-    font = pygame.font.SysFont("Courier New", 9, bold=True)
-    id_text = font.render(f"T{target.id}", True, color)
-    screen.blit(id_text, (int(pos[0] + 10), int(pos[1] - 10)))
+    def clear(self):
+        self.sprites.clear()
+        self.last_rotation = None
+        self.ring_key = None
+
+# Initialize sweep renderer
+sweep_renderer = SweepRenderer()
+
+def draw_sweep_line():
+    """Draw the radar sweep line"""
+    config = ModeConfig.get_config(current_mode)
+    bearing = narrow_beam_angle if current_mode == DetectionMode.NARROW_BEAM else render_sweep_angle()
+    sweep_renderer.draw(screen, current_mode, config, bearing)
+
+class ProjectionCache:
+    """Screen-space positions, trails and predictions for all tracks"""
     
-    # Draw velocity vector - SIMPLIFIED with numpy type conversion
-    if abs(target.velocity) > 1:
-        vec_length = min(abs(target.velocity) * 2, 50)
-        
-        # Ensure velocity_angle is valid
-        velocity_angle = float(target.velocity_angle)
-        if math.isnan(velocity_angle) or not math.isfinite(velocity_angle):
-            velocity_angle = 0.0
-        
-        # Calculate vector end point
-        cos_val = math.cos(velocity_angle)
-        sin_val = math.sin(velocity_angle)
-        vec_end_x = pos[0] + vec_length * cos_val
-        vec_end_y = pos[1] + vec_length * sin_val
-        
-        # Convert to Python floats
-        vec_end_x = float(vec_end_x)
-        vec_end_y = float(vec_end_y)
-        
-        # Draw if endpoints are valid
-        if (not math.isnan(vec_end_x) and not math.isnan(vec_end_y) and
-            math.isfinite(vec_end_x) and math.isfinite(vec_end_y)):
-            
-            # Convert to integers for pygame
-            end_pos = (int(vec_end_x), int(vec_end_y))
-            start_pos = (int(pos[0]), int(pos[1]))
-            
-            try:
-                pygame.draw.line(screen, color, start_pos, end_pos, 2)
-                
-                # Optional: Draw arrow head
-                arrow_size = 5
-                arrow_angle = velocity_angle + math.pi
-                arrow_points = [
-                    end_pos,
-                    (int(end_pos[0] + arrow_size * math.cos(arrow_angle + 0.5)),
-                     int(end_pos[1] + arrow_size * math.sin(arrow_angle + 0.5))),
-                    (int(end_pos[0] + arrow_size * math.cos(arrow_angle - 0.5)),
-                     int(end_pos[1] + arrow_size * math.sin(arrow_angle - 0.5)))
-                ]
-                pygame.draw.polygon(screen, color, arrow_points)
-            except Exception as e:
-                # Silently skip if there's an error
-                pass
+    def __init__(self):
+        self.view_key = None
+        self.entries = {}  # target id -> (track key, position, trail, predicted)
+        self.extents = {}  # target id -> (min x, min y, max x, max y) of all its points
+        self.projected_points = 0
+        self.trail_limit = 20  # newest trail points to draw
+    
+    def current_view(self):
+        return (zoom_level, RADAR_CENTER, screen.get_size())
+    
+    def invalidate(self):
+        self.view_key = None
+    
+    def set_trail_limit(self, limit):
+        """Draw at most this many trail points per track"""
+        if limit != self.trail_limit:
+            self.trail_limit = limit
+            self.invalidate()
+    
+    def _check_view(self):
+        view = self.current_view()
+        if view != self.view_key:
+            self.entries.clear()
+            self.extents.clear()
+            self.view_key = view
     
-    # Draw predicted positions
-    for pred_angle, pred_dist in target.predicted_positions:
-        if math.isnan(pred_angle) or math.isnan(pred_dist):
-            continue
-            
-        try:
-            pred_x = RADAR_CENTER[0] + pred_dist * math.cos(math.radians(pred_angle - 90)) * zoom_level
-            pred_y = RADAR_CENTER[1] + pred_dist * math.sin(math.radians(pred_angle - 90)) * zoom_level
-            
-            pred_x = float(pred_x)
-            pred_y = float(pred_y)
-            
-            if not (math.isnan(pred_x) or math.isnan(pred_y)):
-                pred_color = (*color[:3], 100)
-                pygame.draw.circle(screen, pred_color, (int(pred_x), int(pred_y)), 3)
-        except Exception as e:
-            # Silently skip
-            pass
+    @staticmethod
+    def track_key(target):
+        return (target.revision, target.angle, target.distance)
+    
+    def update(self, targets):
+        """Reproject the tracks that moved (or all of them if the view changed)"""
+        self._check_view()
+        
+        live = set()
+        stale = []
+        for target in targets:
+            live.add(target.id)
+            entry = self.entries.get(target.id)
+            if entry is None or entry[0] != self.track_key(target):
+                stale.append(target)
+        
+        for target_id in [i for i in self.entries if i not in live]:
+            del self.entries[target_id]
+            self.extents.pop(target_id, None)
+        
+        if stale:
+            self._project(stale)
+    
+    def _project(self, targets):
+        """Project every point of the given tracks in one vectorized pass"""
+        points = []
+        counts = []
+        for target in targets:
+            trail = list(target.trail_polar)
+            trail = trail[max(0, len(trail) - self.trail_limit):]
+            points.append((target.angle, target.distance))
+            points.extend(trail)
+            points.extend(target.predicted_positions)
+            counts.append((len(trail), len(target.predicted_positions)))
+        
+        polar = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        x, y = polar_to_screen(polar[:, 0], polar[:, 1])
+        valid = np.isfinite(x) & np.isfinite(y)
+        xy = np.column_stack((x, y))
+        xy_int = np.where(valid[:, None], xy, 0).astype(np.int64)
+        self.projected_points += len(xy)
+        
+        # Per-track bounding box over position, trail and predictions
+        starts = np.cumsum([0] + [1 + t + p for t, p in counts[:-1]])
+        valid_x = np.where(valid, x, np.nan)
+        valid_y = np.where(valid, y, np.nan)
+        with np.errstate(invalid="ignore"):
+            extents = np.column_stack((np.fmin.reduceat(valid_x, starts), np.fmin.reduceat(valid_y, starts),
+                                       np.fmax.reduceat(valid_x, starts), np.fmax.reduceat(valid_y, starts)))
+        extents = np.where(np.isnan(extents), np.tile(RADAR_CENTER, 2), extents).tolist()
+        
+        offset = 0
+        for target, (trail_count, predicted_count), extent in zip(targets, counts, extents):
+            if valid[offset]:
+                position = (float(xy[offset, 0]), float(xy[offset, 1]))
+            else:
+                print(f"[WARNING] Target {target.id} has invalid angle or distance")
+                position = (float(RADAR_CENTER[0]), float(RADAR_CENTER[1]))
+            
+            trail_end = offset + 1 + trail_count
+            trail = xy[offset + 1:trail_end][valid[offset + 1:trail_end]].tolist()
+            predicted_end = trail_end + predicted_count
+            predicted = xy_int[trail_end:predicted_end][valid[trail_end:predicted_end]].tolist()
+            
+            self.entries[target.id] = (self.track_key(target), position, trail, predicted)
+            self.extents[target.id] = extent
+            offset = predicted_end
+    
+    def get(self, target):
+        """(track key, position, trail, predicted) for one target"""
+        self._check_view()
+        entry = self.entries.get(target.id)
+        if entry is None or entry[0] != self.track_key(target):
+            self._project([target])
+            entry = self.entries[target.id]
+        return entry
+    
+    def get_many(self, targets):
+        """Entries for a list of targets, projecting any stale ones in one pass"""
+        self._check_view()
+        entries = self.entries
+        stale = []
+        for target in targets:
+            entry = entries.get(target.id)
+            if entry is None or entry[0] != (target.revision, target.angle, target.distance):
+                stale.append(target)
+        if stale:
+            self._project(stale)
+        return [entries[target.id] for target in targets]
+    
+    def position(self, target):
+        return self.get(target)[1]
+    
+    def bounds(self):
+        """Screen rect around every projected point, or None with no tracks"""
+        if not self.extents:
+            return None
+        extents = np.array(list(self.extents.values()))
+        x0, y0 = extents[:, :2].min(axis=0)
+        x1, y1 = extents[:, 2:].max(axis=0)
+        return pygame.Rect(int(x0), int(y0), int(x1 - x0) + 1, int(y1 - y0) + 1)
+
+# Initialize projection cache
+projection_cache = ProjectionCache()
 
 # ============================================================================
 # PANEL DRAWING FUNCTIONS
@@ -3709,7 +5292,7 @@ def draw_mode_selector(panel):
         panel.draw(screen)
         return
     
-    font_data = pygame.font.SysFont("Courier New", 11, bold=True)
+    font_data = font_cache.get_font("Courier New", 11, bold=True)
     panel.draw(screen)
     
     y = panel.rect.y + 35
@@ -3748,7 +5331,7 @@ def draw_system_status(panel):
         panel.draw(screen)
         return
         
-    font_data = pygame.font.SysFont("Courier New", 11, bold=True)
+    font_data = font_cache.get_font("Courier New", 11, bold=True)
     panel.draw(screen)
     
     y = panel.rect.y + 35
@@ -3778,7 +5361,7 @@ def draw_own_ship_data(panel):
         panel.draw(screen)
         return
         
-    font_data = pygame.font.SysFont("Courier New", 11, bold=True)
+    font_data = font_cache.get_font("Courier New", 11, bold=True)
     panel.draw(screen)
     
     y = panel.rect.y + 35
@@ -3805,8 +5388,8 @@ def draw_tracked_targets(panel):
         panel.draw(screen)
         return
         
-    font_header = pygame.font.SysFont("Courier New", 10, bold=True)
-    font_data = pygame.font.SysFont("Courier New", 9, bold=True)
+    font_header = font_cache.get_font("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 9, bold=True)
     
     panel.draw(screen)
     
@@ -3832,9 +5415,6 @@ def draw_tracked_targets(panel):
     for target in sorted_targets[:20]:
         color = target.get_color()
         
-         # Calculate tactical data first
-        target.calculate_tactical_data()
-        
         # Color by closing rate
         if hasattr(target, 'closing_rate'):
             if target.closing_rate > 5:
@@ -3868,7 +5448,7 @@ def draw_acoustic_sensor(panel):
         panel.draw(screen)
         return
         
-    font_data = pygame.font.SysFont("Courier New", 11, bold=True)
+    font_data = font_cache.get_font("Courier New", 11, bold=True)
     panel.draw(screen)
     
     y = panel.rect.y + 30
@@ -3904,7 +5484,7 @@ def draw_recording_control(panel):
         panel.draw(screen)
         return
         
-    font_data = pygame.font.SysFont("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 10, bold=True)
     panel.draw(screen)
     
     y = panel.rect.y + 35
@@ -3918,7 +5498,7 @@ def draw_recording_control(panel):
     
     # Recording info
     if recorder.recording and recorder.session_data:
-        duration = time.time() - recorder.session_data.start_time
+        duration = sim_clock.now() - recorder.session_data.start_time
         duration_text = font_data.render(f"DURATION: {int(duration)}s", True, get_color("accent"))
         screen.blit(duration_text, (panel.rect.x + 10, y))
         y += 20
@@ -3951,7 +5531,7 @@ def draw_recording_control(panel):
 def handle_keyboard_shortcuts(event):
     """Handle keyboard shortcuts"""
     global current_mode, narrow_beam_angle, paused, current_theme_name, theme
-    global brightness, show_grid, show_compass, crt_effect, zoom_level
+    global brightness, show_grid, show_compass, crt_effect, zoom_level, show_heatmap, show_perf_overlay
     global range_setting, gain_control, frequency_filter, noise_gate
     
     if event.key == pygame.K_ESCAPE:
@@ -3960,23 +5540,23 @@ def handle_keyboard_shortcuts(event):
     # Mode selection (1-5)
     elif event.key == pygame.K_1:
         current_mode = DetectionMode.PASSIVE
-        recorder.add_mode_change(current_mode, time.time())
+        recorder.add_mode_change(current_mode, sim_clock.now())
         sound_system.play_mode_change()  # NEW
     elif event.key == pygame.K_2:
         current_mode = DetectionMode.ACTIVE_SONAR
-        recorder.add_mode_change(current_mode, time.time())
+        recorder.add_mode_change(current_mode, sim_clock.now())
         sound_system.play_mode_change()  # NEW
     elif event.key == pygame.K_3:
         current_mode = DetectionMode.WIDE_BEAM
-        recorder.add_mode_change(current_mode, time.time())
+        recorder.add_mode_change(current_mode, sim_clock.now())
         sound_system.play_mode_change()  # NEW
     elif event.key == pygame.K_4:
         current_mode = DetectionMode.NARROW_BEAM
-        recorder.add_mode_change(current_mode, time.time())
+        recorder.add_mode_change(current_mode, sim_clock.now())
         sound_system.play_mode_change()  # NEW
     elif event.key == pygame.K_5:
         current_mode = DetectionMode.OMNI_360
-        recorder.add_mode_change(current_mode, time.time())
+        recorder.add_mode_change(current_mode, sim_clock.now())
         sound_system.play_mode_change() 
     
     elif event.key == pygame.K_l:
@@ -4078,6 +5658,18 @@ def handle_keyboard_shortcuts(event):
         show_compass = not show_compass
     elif event.key == pygame.K_x:
         crt_effect = not crt_effect
+        frame_compositor.mark_full()
+    elif event.key == pygame.K_F2:
+        show_heatmap = not show_heatmap
+        print(f"[ANALYTICS] Heatmap overlay {'enabled' if show_heatmap else 'disabled'}")
+    elif event.key == pygame.K_F3:
+        show_perf_overlay = not show_perf_overlay
+        frame_compositor.mark_full()
+        print(f"[PERF] Debug overlay {'enabled' if show_perf_overlay else 'disabled'}")
+    elif event.key == pygame.K_F4:
+        quality_governor.set_enabled(not quality_governor.enabled)
+    elif event.key == pygame.K_p:
+        raster_ppi.toggle()
     
     # Zoom controls
     elif event.key == pygame.K_EQUALS or event.key == pygame.K_PLUS:
@@ -4129,9 +5721,10 @@ def handle_keyboard_shortcuts(event):
     elif event.key == pygame.K_h:
         print_help()
         
-    # 3D Mode
-    elif event.key == pygame.K_b:
+    # 3D Mode (B is taken by brightness up, which is handled first)
+    elif event.key == pygame.K_F5:
         visualizer_3d.toggle()
+        frame_compositor.mark_full()
         sound_system.play_ui_click()
         
     # Mission Controls
@@ -4214,91 +5807,103 @@ def handle_keyboard_shortcuts(event):
     return True  # Continue running - don't exit
 
     
-def draw_cpa_visualization():
-    """Draw CPA (Closest Point of Approach) visualization on radar"""
+class CPAOverlay:
+    """CPA lines and markers for all targets, re-rendered only when tactical data changes"""
+    
+    def __init__(self):
+        self.key = None
+        self.surface = None
+        self.rect = None
+        self.renders = 0
     
-    # Draw 2 NM danger circle around own ship
-    pixels_to_nm = 50 / RADAR_RADIUS
-    danger_radius_pixels = 2.0 / pixels_to_nm  # 2 NM danger zone
+    def current_key(self):
+        return (target_manager.tactical_version, zoom_level, RADAR_CENTER,
+                screen.get_size(), current_theme_name)
     
-    # Draw danger circle (red, dashed)
-    pygame.draw.circle(screen, get_color("danger"), RADAR_CENTER, 
-                      int(danger_radius_pixels * zoom_level), 2)
+    def invalidate(self):
+        self.key = None
     
-    # Draw CPA lines for each target
-    for target in target_manager.targets.values():
-        # Skip if no CPA data calculated yet
-        if not hasattr(target, 'cpa_distance') or target.cpa_distance <= 0:
-            continue
+    def build(self):
+        """Render every CPA line, marker and label onto one cropped surface"""
+        self.surface = None
+        self.rect = None
         
-        # Calculate current target position
-        target_pos = target.get_position()
-        target_x = float(target_pos[0])
-        target_y = float(target_pos[1])
-        
-        # Calculate CPA position
-        # CPA bearing and distance are already calculated in target.calculate_tactical_data()
-        cpa_bearing = target.cpa_bearing if hasattr(target, 'cpa_bearing') else target.angle
-        cpa_distance_pixels = target.cpa_distance / pixels_to_nm
-        
-        # Calculate CPA point on screen
-        cpa_x = RADAR_CENTER[0] + cpa_distance_pixels * math.cos(math.radians(cpa_bearing - 90)) * zoom_level
-        cpa_y = RADAR_CENTER[1] + cpa_distance_pixels * math.sin(math.radians(cpa_bearing - 90)) * zoom_level
-        
-        # Determine color based on danger
-        if target.cpa_distance < 2.0:
-            # DANGEROUS - Red
-            line_color = get_color("danger")
-            cpa_marker_color = (255, 0, 0)
-            draw_line = True
-        elif target.cpa_distance < 5.0:
-            # WARNING - Yellow
-            line_color = get_color("warning")
-            cpa_marker_color = (255, 255, 0)
-            draw_line = True
-        elif target.closing_rate > 5:
-            # CLOSING - Orange
-            line_color = (255, 165, 0)
-            cpa_marker_color = (255, 165, 0)
-            draw_line = True
-        else:
-            # SAFE - Don't draw CPA line for safe targets
-            draw_line = False
+        tactical = target_manager.tactical
+        if tactical is None or len(tactical["ids"]) == 0:
+            return
         
-        if draw_line and target.time_to_cpa < 60:  # Only draw if CPA within 60 minutes
-            # Draw line from target to CPA point
-            try:
-                pygame.draw.line(screen, line_color, 
-                               (int(target_x), int(target_y)), 
-                               (int(cpa_x), int(cpa_y)), 2)
-                
-                # Draw CPA marker (circle)
-                pygame.draw.circle(screen, cpa_marker_color, 
-                                 (int(cpa_x), int(cpa_y)), 8, 2)
-                
-                # Draw X inside circle
-                pygame.draw.line(screen, cpa_marker_color,
-                               (int(cpa_x-5), int(cpa_y-5)),
-                               (int(cpa_x+5), int(cpa_y+5)), 2)
-                pygame.draw.line(screen, cpa_marker_color,
-                               (int(cpa_x-5), int(cpa_y+5)),
-                               (int(cpa_x+5), int(cpa_y-5)), 2)
-                
-                # Draw label showing CPA distance
-                font = pygame.font.SysFont("Courier New", 9, bold=True)
-                label_text = f"CPA T{target.id}: {target.cpa_distance:.1f}NM"
-                label_surf = font.render(label_text, True, cpa_marker_color)
-                screen.blit(label_surf, (int(cpa_x) + 12, int(cpa_y) - 5))
-                
-                # If dangerous, show time to CPA
-                if target.cpa_distance < 2.0 and target.time_to_cpa < 999:
-                    time_text = f"{target.time_to_cpa:.0f}min"
-                    time_surf = font.render(time_text, True, cpa_marker_color)
-                    screen.blit(time_surf, (int(cpa_x) + 12, int(cpa_y) + 5))
-                    
-            except Exception as e:
-                print(f"[ERROR] CPA visualization error for target {target.id}: {e}")
-                                
+        cpa = tactical["cpa_distance"]
+        danger = cpa < 2.0
+        warning = ~danger & (cpa < 5.0)
+        closing = ~danger & ~warning & (tactical["closing_rate"] > 5)
+        # Safe targets get no CPA line; only draw if CPA is within 60 minutes
+        visible = (cpa > 0) & (danger | warning | closing) & (tactical["time_to_cpa"] < 60)
+        indices = np.flatnonzero(visible)
+        if len(indices) == 0:
+            return
+        
+        pixels_to_nm = 50 / RADAR_RADIUS
+        target_x, target_y = polar_to_screen(tactical["bearing"], tactical["distance"])
+        cpa_x, cpa_y = polar_to_screen(tactical["cpa_bearing"], cpa / pixels_to_nm)
+        
+        font = font_cache.get_font("Courier New", 9, bold=True)
+        items = []
+        for i in indices:
+            if danger[i]:
+                line_color, marker_color = get_color("danger"), (255, 0, 0)
+            elif warning[i]:
+                line_color, marker_color = get_color("warning"), (255, 255, 0)
+            else:
+                line_color, marker_color = (255, 165, 0), (255, 165, 0)
+            
+            labels = [font.render(f"CPA T{tactical['ids'][i]}: {cpa[i]:.1f}NM", True, marker_color)]
+            if danger[i] and tactical["time_to_cpa"][i] < 999:
+                labels.append(font.render(f"{tactical['time_to_cpa'][i]:.0f}min", True, marker_color))
+            
+            items.append(((int(target_x[i]), int(target_y[i])), (int(cpa_x[i]), int(cpa_y[i])),
+                          line_color, marker_color, labels))
+        
+        # Crop to the area actually drawn on
+        bounds = pygame.Rect(items[0][0], (1, 1))
+        for start, end, _, _, labels in items:
+            bounds.union_ip(pygame.Rect(start, (1, 1)))
+            bounds.union_ip(pygame.Rect(end[0] - 10, end[1] - 10, 20, 20))
+            for row, label in enumerate(labels):
+                bounds.union_ip(label.get_rect(topleft=(end[0] + 12, end[1] - 5 + row * 10)))
+        bounds.inflate_ip(4, 4)
+        
+        surf = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        ox, oy = bounds.topleft
+        for (tx, ty), (px, py), line_color, marker_color, labels in items:
+            tx, ty, px, py = tx - ox, ty - oy, px - ox, py - oy
+            pygame.draw.line(surf, line_color, (tx, ty), (px, py), 2)
+            pygame.draw.circle(surf, marker_color, (px, py), 8, 2)
+            pygame.draw.line(surf, marker_color, (px - 5, py - 5), (px + 5, py + 5), 2)
+            pygame.draw.line(surf, marker_color, (px - 5, py + 5), (px + 5, py - 5), 2)
+            for row, label in enumerate(labels):
+                surf.blit(label, (px + 12, py - 5 + row * 10))
+        
+        self.surface = surf
+        self.rect = bounds
+        self.renders += 1
+    
+    def draw(self, surf):
+        """Blit the overlay, rebuilding it first if the tactical picture changed"""
+        key = self.current_key()
+        if key != self.key:
+            self.build()
+            self.key = key
+        if self.surface is not None:
+            surf.blit(self.surface, self.rect.topleft)
+        return self.rect
+
+# Initialize CPA overlay
+cpa_overlay = CPAOverlay()
+
+def draw_cpa_visualization():
+    """Draw CPA (Closest Point of Approach) visualization on radar"""
+    return cpa_overlay.draw(screen)
+
 def print_help():
     """Print keyboard shortcuts help"""
     help_text = """
@@ -4311,7 +5916,7 @@ def print_help():
     ║   ←/→      : Adjust narrow beam angle                        ║
     ║                                                              ║
     ║ 3D VISUALIZATION:                                            ║
-    ║   B        : Toggle 3D visualization mode                    ║
+    ║   F5       : Toggle 3D visualization mode                    ║
     ║                                                              ║
     ║ MISSION SYSTEM:                                              ║
     ║   M        : Start/Stop mission scenario                     ║
@@ -4339,6 +5944,10 @@ def print_help():
     ║   G        : Toggle grid                                     ║
     ║   O        : Toggle compass                                  ║
     ║   X        : Toggle CRT effect                               ║
+    ║   F2       : Toggle activity heatmap overlay                 ║
+    ║   F3       : Toggle performance debug overlay                ║
+    ║   F4       : Toggle automatic quality governor               ║
+    ║   P        : Toggle raster PPI intensity display             ║
     ║   +/-      : Zoom in/out                                     ║
     ║   0        : Reset zoom                                      ║
     ║   [/]      : Decrease/Increase range                         ║
@@ -4362,8 +5971,8 @@ def draw_bearing_rate_panel(panel):
         panel.draw(screen)
         return
         
-    font_header = pygame.font.SysFont("Courier New", 10, bold=True)
-    font_data = pygame.font.SysFont("Courier New", 9, bold=True)
+    font_header = font_cache.get_font("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 9, bold=True)
     
     panel.draw(screen)
     
@@ -4376,12 +5985,7 @@ def draw_bearing_rate_panel(panel):
     
     # Tracked targets
     for target_id, target in list(target_manager.targets.items())[:6]:  # Show first 6
-        # Update bearing tracker
-        bearing_rate = bearing_tracker.update_target_bearing(
-            target_id, 
-            target.angle, 
-            pygame.time.get_ticks()
-        )
+        bearing_rate = bearing_tracker.get_bearing_rate(target_id)
         
         # Get crossing prediction
         crossing, time_to_cross, aspect = bearing_tracker.predict_crossing(
@@ -4454,8 +6058,8 @@ def draw_snr_panel(panel):
         panel.draw(screen)
         return
         
-    font_header = pygame.font.SysFont("Courier New", 10, bold=True)
-    font_data = pygame.font.SysFont("Courier New", 9, bold=True)
+    font_header = font_cache.get_font("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 9, bold=True)
     
     panel.draw(screen)
     
@@ -4475,15 +6079,11 @@ def draw_snr_panel(panel):
     # Selected target SNR
     if target_manager.selected_target:
         target_id = target_manager.selected_target.id
-        
-        # Calculate signal level (simplified from intensity)
-        signal_db = 20 * math.log10(target_manager.selected_target.intensity + 1e-10) + 100
-        
-        # Update SNR
-        snr_db = snr_analyzer.update_target_snr(target_id, signal_db)
         snr_data = snr_analyzer.generate_snr_display_data(target_id)
         
         if snr_data:
+            snr_db = snr_data["snr_db"]
+            
             # SNR value with quality color
             quality_color = {
                 "EXCELLENT": get_color("accent"),
@@ -4563,8 +6163,8 @@ def draw_torpedo_panel(panel):
         panel.draw(screen)
         return
         
-    font_header = pygame.font.SysFont("Courier New", 10, bold=True)
-    font_data = pygame.font.SysFont("Courier New", 9, bold=True)
+    font_header = font_cache.get_font("Courier New", 10, bold=True)
+    font_data = font_cache.get_font("Courier New", 9, bold=True)
     
     panel.draw(screen)
     
@@ -4575,9 +6175,6 @@ def draw_torpedo_panel(panel):
     screen.blit(title, (panel.rect.x + 10, y))
     y += 20
     
-    # Update torpedo tracking
-    torpedo_detector.update_torpedo_tracking()
-    
     # Active torpedoes
     active_torpedoes = torpedo_detector.get_active_torpedoes()
     
@@ -4618,7 +6215,7 @@ def draw_torpedo_panel(panel):
         y += 15
         
         # Decoy cooldown
-        current_time = time.time()
+        current_time = sim_clock.now()
         cooldown_remaining = torpedo_detector.decoy_cooldown - (current_time - torpedo_detector.last_deploy_time)
         
         if cooldown_remaining > 0:
@@ -4635,7 +6232,7 @@ def draw_torpedo_panel(panel):
         # Active decoys
         if torpedo_detector.acoustic_decoys:
             active_decoys = [d for d in torpedo_detector.acoustic_decoys 
-                           if time.time() - d["deploy_time"] < d["active_duration"]]
+                           if sim_clock.now() - d["deploy_time"] < d["active_duration"]]
             
             if active_decoys:
                 decoy_count = font_data.render(f"Active decoys: {len(active_decoys)}", 
@@ -4668,7 +6265,7 @@ def draw_torpedo_panel(panel):
         y += 15
         
         for alert in recent_alerts:
-            time_ago = time.time() - alert["timestamp"]
+            time_ago = sim_clock.now() - alert["timestamp"]
             if time_ago < 60:  # Only show alerts from last minute
                 alert_text = font_data.render(alert["message"][:30], True, get_color("warning"))
                 screen.blit(alert_text, (panel.rect.x + 15, y))
@@ -4679,13 +6276,13 @@ def draw_torpedo_alerts():
     active_torpedoes = torpedo_detector.get_active_torpedoes()
     
     if not active_torpedoes:
-        return
+        return None
     
-    font_large = pygame.font.SysFont("Courier New", 24, bold=True)
-    font_medium = pygame.font.SysFont("Courier New", 16, bold=True)
+    font_large = font_cache.get_font("Courier New", 24, bold=True)
+    font_medium = font_cache.get_font("Courier New", 16, bold=True)
     
     # Draw flashing alert box
-    current_time = pygame.time.get_ticks()
+    current_time = sim_clock.ticks()
     flash_alpha = 128 + 127 * math.sin(current_time / 200)  # Flashing effect
     
     alert_surface = pygame.Surface((WIDTH, 80), pygame.SRCALPHA)
@@ -4704,55 +6301,47 @@ def draw_torpedo_alerts():
     count_text = font_medium.render(f"{len(active_torpedoes)} ACTIVE", True, (255, 255, 255))
     count_rect = count_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 20))
     screen.blit(count_text, count_rect)
+    
+    return pygame.Rect(0, HEIGHT // 2 - 40, WIDTH, 80)
+
+def draw_velocity_vector(target, pos, color):
+    """Velocity line with an arrow head, for tracks moving faster than 1 px/s"""
+    if abs(target.velocity) <= 1:
+        return
+    vec_length = min(abs(target.velocity) * 2, 50)
+    
+    # velocity_angle is a compass course in radians; bearing_vector applies the
+    # screen orientation (and maps a non-finite course to north)
+    course = math.degrees(target.velocity_angle)
+    dx, dy = bearing_vector(course)
+    start_pos = (int(pos[0]), int(pos[1]))
+    end_pos = (int(pos[0] + vec_length * dx), int(pos[1] + vec_length * dy))
+    pygame.draw.line(screen, color, start_pos, end_pos, 2)
+    
+    # Arrow head: two points 5 px back from the tip, about 29 degrees either side
+    arrow_size = 5
+    arrow_points = [end_pos]
+    for side in (28.6, -28.6):
+        ax, ay = bearing_vector(course + 180 + side)
+        arrow_points.append((int(end_pos[0] + arrow_size * ax), int(end_pos[1] + arrow_size * ay)))
+    pygame.draw.polygon(screen, color, arrow_points)
 
-def draw_target(target):
-    """Draw a single target"""
+def draw_target(target, detail=True):
+    """Draw a single target (symbol only when detail is False)"""
     # TORPEDO CHECK - Check if target is detected as torpedo
-    is_torpedo = False
-    torpedo_data = None
-    for torpedo in torpedo_detector.detected_torpedoes.values():
-        if torpedo.get("original_target_id") == target.id:
-            is_torpedo = True
-            torpedo_data = torpedo
-            break
+    torpedo_data = torpedo_detector.get_torpedo_for_target(target.id)
+    is_torpedo = torpedo_data is not None
     
-    pos = target.get_position()
+    _, pos, trail, predicted = projection_cache.get(target)
     color = target.get_color()
     
-    # Convert pos to regular Python floats
-    pos = (float(pos[0]), float(pos[1]))
-    
-    # Validate position
-    if math.isnan(pos[0]) or math.isnan(pos[1]):
-        print(f"[ERROR] Target {target.id} has NaN position: {pos}")
-        return
-    
-    # Draw trail with validation
-    if len(target.trail_points) > 1:
+    # Draw trail
+    if detail and len(trail) >= 2:
         trail_color = (*color[:3], 100)
-        
-        # Filter out invalid points from trail and convert to Python floats
-        valid_trail_points = []
-        for point in target.trail_points:
-            # Check if point is valid and convert to Python floats
-            try:
-                if (isinstance(point, (tuple, list)) and len(point) == 2):
-                    # Convert numpy types to Python floats
-                    x = float(point[0])
-                    y = float(point[1])
-                    
-                    if not (math.isnan(x) or math.isnan(y) or 
-                           not math.isfinite(x) or not math.isfinite(y)):
-                        valid_trail_points.append((x, y))
-            except (TypeError, ValueError) as e:
-                print(f"[WARNING] Target {target.id}: Invalid trail point conversion: {point} - {e}")
-        
-        # Only draw if we have at least 2 valid points
-        if len(valid_trail_points) >= 2:
-            try:
-                pygame.draw.lines(screen, trail_color, False, valid_trail_points, 1)
-            except Exception as e:
-                print(f"[ERROR] Target {target.id}: Error drawing trail: {e}")
+        try:
+            pygame.draw.lines(screen, trail_color, False, trail, 1)
+        except Exception as e:
+            print(f"[ERROR] Target {target.id}: Error drawing trail: {e}")
     
     # TORPEDO RENDERING - Special rendering for torpedoes
     if is_torpedo and torpedo_data:
@@ -4767,7 +6356,7 @@ def draw_target(target):
         pygame.draw.polygon(screen, get_color("danger"), points)
         
         # Draw warning symbol
-        warning_font = pygame.font.SysFont("Courier New", 14, bold=True)
+        warning_font = font_cache.get_font("Courier New", 14, bold=True)
         warning_text = warning_font.render("!", True, (255, 255, 255))
         warning_rect = warning_text.get_rect(center=(pos[0], pos[1]))
         screen.blit(warning_text, warning_rect)
@@ -4775,14 +6364,14 @@ def draw_target(target):
         # Draw speed trail
         if abs(target.velocity) > 1:
             trail_length = min(abs(target.velocity) * 5, 100)
-            trail_end_x = pos[0] + trail_length * math.cos(target.velocity_angle)
-            trail_end_y = pos[1] + trail_length * math.sin(target.velocity_angle)
-            pygame.draw.line(screen, get_color("danger"), pos, (trail_end_x, trail_end_y), 3)
+            dx, dy = bearing_vector(math.degrees(target.velocity_angle))
+            trail_end = (pos[0] + trail_length * dx, pos[1] + trail_length * dy)
+            pygame.draw.line(screen, get_color("danger"), pos, trail_end, 3)
         
         # Draw impact countdown
         if torpedo_data.get("status") == "TRACKING":
             impact_time = torpedo_data.get("impact_data", {}).get("time_to_impact_str", "N/A")
-            countdown_font = pygame.font.SysFont("Courier New", 10, bold=True)
+            countdown_font = font_cache.get_font("Courier New", 10, bold=True)
             countdown_text = countdown_font.render(impact_time, True, get_color("danger"))
             screen.blit(countdown_text, (pos[0] + 15, pos[1] - 25))
         
@@ -4790,8 +6379,8 @@ def draw_target(target):
         return
     
     # Draw classification icon if available (regular targets only)
-    if target.classification and target.classification_confidence > 0.5:
-        font_icon = pygame.font.SysFont("Segoe UI Emoji", 12)
+    if detail and target.classification and target.classification_confidence > 0.5:
+        font_icon = font_cache.get_font("Segoe UI Emoji", 12)
         icon = target.classification.get("icon", "?")
         icon_surf = font_icon.render(icon, True, color)
         screen.blit(icon_surf, (int(pos[0]) - 6, int(pos[1]) - 20))
@@ -4822,79 +6411,1043 @@ def draw_target(target):
         rect = pygame.Rect(int(pos[0] - size//2), int(pos[1] - size//2), size, size)
         pygame.draw.rect(screen, color, rect)
     
+    if not detail:
+        return
+    
     # Draw ID label (regular targets only)
-    font = pygame.font.SysFont("Courier New", 9, bold=True)
+    font = font_cache.get_font("Courier New", 9, bold=True)
     id_text = font.render(f"T{target.id}", True, color)
     screen.blit(id_text, (int(pos[0] + 10), int(pos[1] - 10)))
     
-    # Draw velocity vector - SIMPLIFIED with numpy type conversion (regular targets only)
-    if abs(target.velocity) > 1:
-        vec_length = min(abs(target.velocity) * 2, 50)
-        
-        # Ensure velocity_angle is valid
-        velocity_angle = float(target.velocity_angle)
-        if math.isnan(velocity_angle) or not math.isfinite(velocity_angle):
-            velocity_angle = 0.0
-        
-        # Calculate vector end point
-        cos_val = math.cos(velocity_angle)
-        sin_val = math.sin(velocity_angle)
-        vec_end_x = pos[0] + vec_length * cos_val
-        vec_end_y = pos[1] + vec_length * sin_val
+    # Draw velocity vector (regular targets only)
+    draw_velocity_vector(target, pos, color)
+    
+    # Draw predicted positions (regular targets only)
+    pred_color = (*color[:3], 100)
+    for pred_pos in predicted:
+        pygame.draw.circle(screen, pred_color, pred_pos, 3)
+
+
+class BlipRenderer:
+    """Batched target drawing: sprite stamps and glyph labels in one blits() call
+
+    Symbols and prediction dots are pre-rendered once per threat level and
+    ID labels are packed from per-character glyphs, so a frame issues a
+    single Surface.blits() for all of them. Trails are one draw.lines per
+    track from the projection cache. Torpedoes and the selected track still
+    go through draw_target for their special markings.
+    """
+    
+    SYMBOL_SIZE = 8
+    PREDICTION_RADIUS = 3
+    MAX_LABELS = 4096
+    
+    def __init__(self):
+        self.theme_key = None
+        self.colors = {}
+        self.sprites = {}
+        self.glyphs = {}
+        self.labels = {}
+        self.stats = {"blits": 0, "lines": 0}
+    
+    def _check_theme(self):
+        """Drop cached sprites and glyphs when the theme changes"""
+        if self.theme_key != current_theme_name:
+            self.theme_key = current_theme_name
+            self.sprites.clear()
+            self.glyphs.clear()
+            self.labels.clear()
+            self.colors = {"HOSTILE": get_color("danger"), "UNKNOWN": get_color("warning"),
+                           "NEUTRAL": get_color("primary"), "FRIENDLY": get_color("accent")}
+    
+    def color(self, threat):
+        return self.colors.get(threat, self.colors["NEUTRAL"])
+    
+    def sprite(self, threat):
+        """Threat symbol (triangle, circle or square) centered in a small surface"""
+        sprite = self.sprites.get(threat)
+        if sprite is None:
+            size = self.SYMBOL_SIZE
+            sprite = pygame.Surface((2 * size + 1, 2 * size + 1), pygame.SRCALPHA)
+            color = self.color(threat)[:3]
+            if threat == "HOSTILE":
+                pygame.draw.polygon(sprite, color, [(size, 0), (0, 2 * size), (2 * size, 2 * size)])
+            elif threat == "FRIENDLY":
+                pygame.draw.circle(sprite, color, (size, size), size)
+            else:
+                pygame.draw.rect(sprite, color, pygame.Rect(size - size // 2, size - size // 2, size, size))
+            self.sprites[threat] = sprite
+        return sprite
+    
+    def prediction_sprite(self, threat):
+        key = ("prediction", threat)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            radius = self.PREDICTION_RADIUS
+            sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, self.color(threat)[:3], (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+    
+    def glyph(self, char, threat):
+        """One rendered label character"""
+        key = (char, threat)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            font = font_cache.get_font("Courier New", 9, bold=True)
+            glyph = font.render_uncached(char, True, self.color(threat)[:3])
+            self.glyphs[key] = glyph
+        return glyph
+    
+    def label(self, text, threat):
+        """ID label packed from cached glyphs, kept until the theme changes"""
+        key = (text, threat)
+        label = self.labels.get(key)
+        if label is None:
+            glyphs = [self.glyph(char, threat) for char in text]
+            label = pygame.Surface((sum(g.get_width() for g in glyphs), max(g.get_height() for g in glyphs)),
+                                   pygame.SRCALPHA)
+            x = 0
+            for glyph in glyphs:
+                label.blit(glyph, (x, 0))
+                x += glyph.get_width()
+            if len(self.labels) >= self.MAX_LABELS:
+                self.labels.clear()
+            self.labels[key] = label
+        return label
+    
+    def draw(self, items, surf=None):
+        """Draw (target, detail) pairs; detail adds trail, icon, label and vectors"""
+        surf = screen if surf is None else surf
+        self._check_theme()
+        size = self.SYMBOL_SIZE
+        radius = self.PREDICTION_RADIUS
+        draw_lines = pygame.draw.lines
+        entries = projection_cache.get_many([target for target, _ in items])
+        stamps = []
+        lines = 0
+        
+        for (target, detail), (_, pos, trail, predicted) in zip(items, entries):
+            threat = target.threat_level
+            x, y = int(pos[0]), int(pos[1])
+            sprite = self.sprites.get(threat) or self.sprite(threat)
+            
+            if not detail:
+                stamps.append((sprite, (x - size, y - size)))
+                continue
+            
+            if len(trail) >= 2:
+                draw_lines(surf, self.color(threat), False, trail, 1)
+                lines += 1
+            if predicted:
+                dot = self.prediction_sprite(threat)
+                stamps.extend((dot, (px - radius, py - radius)) for px, py in predicted)
+            
+            stamps.append((sprite, (x - size, y - size)))
+            
+            if target.classification and target.classification_confidence > 0.5:
+                font_icon = font_cache.get_font("Segoe UI Emoji", 12)
+                icon = target.classification.get("icon", "?")
+                stamps.append((font_icon.render(icon, True, target.get_color()), (x - 6, y - 20)))
+            
+            stamps.append((self.label(f"T{target.id}", threat), (x + 10, y - 10)))
+            
+            if abs(target.velocity) > 1:
+                draw_velocity_vector(target, pos, target.get_color())
         
-        # Convert to Python floats
-        vec_end_x = float(vec_end_x)
-        vec_end_y = float(vec_end_y)
+        surf.blits(stamps, doreturn=False)
+        self.stats = {"blits": len(stamps), "lines": lines}
+        return len(items)
+
+# Initialize blip renderer
+blip_renderer = BlipRenderer()
+
+class LODRenderer:
+    """Draws the contact picture with clustering and per-track level of detail
+
+    Selected, hostile and torpedo tracks are always drawn in full. Other
+    tracks that pile up in the same screen cell are merged into one cluster
+    marker, and when drawing runs over budget the least important remaining
+    tracks lose their labels, trails and predictions.
+    """
+    
+    THREAT_SEVERITY = {"FRIENDLY": 0, "NEUTRAL": 1, "UNKNOWN": 2, "HOSTILE": 3}
+    
+    def __init__(self, cell_size=24, cluster_threshold=4, budget_ms=6.0):
+        self.cell_size = cell_size  # screen-space binning grid (pixels)
+        self.cluster_threshold = cluster_threshold  # tracks per cell before merging
+        self.budget_ms = budget_ms
+        self.detail_limit = None  # low-priority tracks drawn in full (None = all)
+        self.draw_ms = 0.0
+        self.stats = {"full": 0, "reduced": 0, "clusters": 0, "clustered": 0}
+    
+    def is_priority(self, target):
+        return (target is target_manager.selected_target or target.threat_level == "HOSTILE"
+                or torpedo_detector.get_torpedo_for_target(target.id) is not None)
+    
+    def _adapt(self, others):
+        """Grow or shrink the full-detail allowance from last frame's draw time"""
+        if self.detail_limit is None:
+            if self.draw_ms <= self.budget_ms:
+                return
+            self.detail_limit = others
+        if self.draw_ms > self.budget_ms:
+            self.detail_limit = int(self.detail_limit * 0.7)
+        elif self.draw_ms < self.budget_ms * 0.6:
+            self.detail_limit = int(self.detail_limit * 1.2) + 1
+            if self.detail_limit >= others:
+                self.detail_limit = None
+    
+    def _cluster(self, tracks, positions):
+        """Split tracks into (singles, clusters) by screen cell occupancy"""
+        if len(tracks) < self.cluster_threshold:
+            return tracks, []
+        
+        cells = np.floor(positions / self.cell_size).astype(np.int64)
+        _, inverse, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+        crowded = counts[inverse] >= self.cluster_threshold
+        if not crowded.any():
+            return tracks, []
+        
+        singles = [track for track, flag in zip(tracks, crowded) if not flag]
+        
+        # One marker per crowded cell at the members' centroid
+        members = np.flatnonzero(crowded)
+        cell_ids = inverse[members]
+        n_cells = len(counts)
+        sum_x = np.bincount(cell_ids, weights=positions[members, 0], minlength=n_cells)
+        sum_y = np.bincount(cell_ids, weights=positions[members, 1], minlength=n_cells)
+        severity = np.zeros(n_cells, dtype=np.int64)
+        np.maximum.at(severity, cell_ids, [self.THREAT_SEVERITY.get(tracks[i].threat_level, 2) for i in members])
+        
+        clusters = []
+        for cell in np.unique(cell_ids):
+            count = int(counts[cell])
+            clusters.append(((int(sum_x[cell] / count), int(sum_y[cell] / count)), count, int(severity[cell])))
+        return singles, clusters
+    
+    def draw_cluster(self, center, count, severity):
+        """Cluster marker: ring sized by member count with the count inside"""
+        threat = ("FRIENDLY", "NEUTRAL", "UNKNOWN", "HOSTILE")[severity]
+        color = {"HOSTILE": get_color("danger"), "UNKNOWN": get_color("warning"),
+                 "NEUTRAL": get_color("secondary"), "FRIENDLY": get_color("primary")}[threat]
+        radius = int(8 + 3 * math.log2(count))
+        pygame.draw.circle(screen, color, center, radius, 2)
+        font = font_cache.get_font("Courier New", 9, bold=True)
+        label = font.render(str(count), True, color)
+        screen.blit(label, label.get_rect(center=center))
+    
+    def draw(self, targets):
+        """Draw all targets; returns the number of screen items drawn"""
+        start = time.perf_counter()
+        
+        priority = []
+        others = []
+        for target in targets:
+            (priority if self.is_priority(target) else others).append(target)
+        
+        self._adapt(len(others))
+        
+        # Merge crowded low-priority tracks
+        if others:
+            positions = np.array([projection_cache.position(t) for t in others], dtype=np.float64)
+            singles, clusters = self._cluster(others, positions)
+        else:
+            singles, clusters = [], []
+        
+        # Nearest tracks keep full detail when over budget
+        if self.detail_limit is not None and len(singles) > self.detail_limit:
+            singles.sort(key=lambda t: t.distance)
+        limit = len(singles) if self.detail_limit is None else self.detail_limit
+        
+        for center, count, severity in clusters:
+            self.draw_cluster(center, count, severity)
+        
+        # Plain tracks go through the batched blip renderer, priority ones last
+        # so they stay on top; torpedoes and the selected track keep their
+        # special markings from draw_target
+        special = [t for t in priority if t is target_manager.selected_target
+                   or torpedo_detector.get_torpedo_for_target(t.id) is not None]
+        special_ids = {t.id for t in special}
+        items = [(target, i < limit) for i, target in enumerate(singles)]
+        items.extend((target, True) for target in priority if target.id not in special_ids)
+        blip_renderer.draw(items)
+        for target in special:
+            draw_target(target)
         
-        # Draw if endpoints are valid
-        if (not math.isnan(vec_end_x) and not math.isnan(vec_end_y) and
-            math.isfinite(vec_end_x) and math.isfinite(vec_end_y)):
+        self.stats = {
+            "full": len(priority) + min(limit, len(singles)),
+            "reduced": max(0, len(singles) - limit),
+            "clusters": len(clusters),
+            "clustered": sum(count for _, count, _ in clusters),
+        }
+        self.draw_ms = (time.perf_counter() - start) * 1000
+        return len(priority) + len(singles) + len(clusters)
+
+# Initialize LOD renderer
+lod_renderer = LODRenderer()
+
+
+# ============================================================================
+# PANEL BINDINGS & FRAME COMPOSITOR
+# ============================================================================
+
+def update_tracker_state():
+    """Per-frame tracker updates that the panels only display"""
+    ticks = sim_clock.ticks()
+    for target_id, target in target_manager.targets.items():
+        bearing_tracker.update_target_bearing(target_id, target.angle, ticks)
+    
+    # SNR is tracked for the selected target (signal level simplified from intensity)
+    selected = target_manager.selected_target
+    if selected:
+        signal_db = 20 * math.log10(selected.intensity + 1e-10) + 100
+        snr_analyzer.update_target_snr(selected.id, signal_db)
+    
+    torpedo_detector.update_torpedo_tracking()
+    target_manager.update_tactical_data()
+
+def tracked_targets_version():
+    """What the tracked targets panel shows"""
+    sorted_targets = sorted(target_manager.targets.values(), key=lambda t: t.distance)
+    return tuple(
+        (t.id, f"{t.get_range_nm():.1f}", int(t.angle), f"{t.closing_rate:+.0f}",
+         f"{t.cpa_distance:.1f}", (t.closing_rate > 5) - (t.closing_rate < -5))
+        for t in sorted_targets[:20]
+    )
+
+def bearing_rate_version():
+    """What the bearing rate panel shows"""
+    rows = tuple(
+        (target_id, f"{bearing_tracker.get_bearing_rate(target_id):+.1f}", int(target.angle),
+         f"{target.get_range_nm():.1f}")
+        for target_id, target in list(target_manager.targets.items())[:6]
+    )
+    selected = target_manager.selected_target
+    return rows, (selected.id, f"{selected.angle:.1f}") if selected else None
+
+def snr_panel_version():
+    """What the SNR panel shows"""
+    noise = f"{snr_analyzer.background_noise_level:.1f}"
+    selected = target_manager.selected_target
+    if not selected:
+        return None, noise
+    history = snr_analyzer.target_snr_history.get(selected.id)
+    return selected.id, noise, history[-1]["timestamp"] if history else None
+
+def torpedo_panel_version():
+    """What the torpedo defense panel shows"""
+    now = sim_clock.now()
+    torpedoes = tuple(
+        (t["id"], t["type"], int(t["bearing"]), f"{t['range_nm']:.1f}",
+         t["impact_data"]["time_to_impact_str"])
+        for t in torpedo_detector.get_active_torpedoes()
+    )
+    cooldown = int(max(0, torpedo_detector.decoy_cooldown - (now - torpedo_detector.last_deploy_time)))
+    decoys = sum(1 for d in torpedo_detector.acoustic_decoys if now - d["deploy_time"] < d["active_duration"])
+    alerts = tuple(a["timestamp"] for a in torpedo_detector.get_recent_alerts(3) if now - a["timestamp"] < 60)
+    return torpedoes, cooldown, decoys, alerts
+
+def classification_version():
+    """What the classification panel shows for the selected target"""
+    target = target_manager.selected_target
+    if not target:
+        return None
+    return (target.id, target.classification_time, target.classification_confidence,
+            target.threat_level, id(target.acoustic_signature))
+
+def recording_version():
+    """What the recording panel shows"""
+    if not (recorder.recording and recorder.session_data):
+        return recorder.recording
+    return (True, int(sim_clock.now() - recorder.session_data.start_time),
+            len(recorder.frame_buffer), len(recorder.session_data.target_history))
+
+# Panel content, data version and refresh rate (Hz, None = on change), in panel order
+PANEL_BINDINGS = [
+    (draw_mode_selector, lambda: current_mode, None),
+    (draw_system_status, lambda: (paused, current_mode, len(target_manager.targets), range_setting,
+                                  f"{gain_control:.1f}", frequency_filter, recorder.recording,
+                                  int(clock.get_fps())), 4),
+    (draw_own_ship_data, lambda: tuple(own_ship.values()), 2),
+    (draw_tracked_targets, tracked_targets_version, 10),
+    (draw_acoustic_sensor, lambda: (int(current_noise_data["intensity"] * 250),
+                                    f"{current_noise_data['intensity']:.2f}",
+                                    int(current_noise_data["dominant_freq"]),
+                                    f"{math.degrees(current_noise_data['angle']):.1f}",
+                                    f"{current_noise_data['confidence']:.0f}"), 15),
+    (draw_recording_control, recording_version, 2),
+    (draw_analytics_dashboard, lambda: data_analyzer.next_seq, 2),
+    (draw_mission_control, lambda: (mission_system.scenario_running, mission_system.active_scenario,
+                                    mission_system.current_step), 2),
+    (lambda panel: draw_classification_panel(panel, target_manager.selected_target), classification_version, 5),
+    (draw_bearing_rate_panel, bearing_rate_version, 5),
+    (draw_snr_panel, snr_panel_version, 4),
+    (draw_torpedo_panel, torpedo_panel_version, 5),
+]
+
+for panel, (draw_fn, version_fn, refresh_hz) in zip(panels, PANEL_BINDINGS):
+    panel.bind(draw_fn, version_fn, refresh_hz)
+
+class PanelScheduler:
+    """Picks which panels re-render this frame from their refresh rates and a per-frame budget"""
+    
+    def __init__(self, max_renders_per_frame=3, budget_ms=4.0):
+        self.max_renders_per_frame = max_renders_per_frame
+        self.budget_ms = budget_ms
+        self.rate_scale = 1.0  # quality governor slows all panel rates under load
+        self.started = False
+        self.stats = {"rendered": 0, "deferred": 0, "frame_ms": 0.0}
+    
+    def period(self, panel):
+        """Seconds between scheduled re-renders of a panel"""
+        return 1.0 / (panel.refresh_hz * self.rate_scale)
+    
+    def stagger(self, panel_list, now):
+        """Spread first due times across each panel's period so they don't all land together"""
+        for i, panel in enumerate(panel_list):
+            if panel.refresh_hz:
+                panel.next_due = now + (i / len(panel_list)) / panel.refresh_hz
+        self.started = True
+    
+    def refresh(self, panel_list, now=None):
+        """Re-render the panels that are due; returns the set of panels re-rendered"""
+        if now is None:
+            now = time.perf_counter()
+        if not self.started:
+            self.stagger(panel_list, now)
+        
+        urgent, due = [], []
+        for panel in panel_list:
+            if not panel.visible or panel.draw_fn is None:
+                continue
+            if panel.surface is None or panel.render_key is None or panel.layout_key() != panel.render_key[1:]:
+                urgent.append(panel)
+            elif not panel.refresh_hz or now >= panel.next_due:
+                due.append(panel)
+        
+        # Most overdue first; panels without a rate only need a version check
+        due.sort(key=lambda p: p.next_due if p.refresh_hz else now)
+        
+        rendered = set()
+        spent = 0.0
+        deferred = 0
+        for panel in urgent:
+            panel.refresh()
+            spent += panel.last_render_ms
+            rendered.add(panel)
+            if panel.refresh_hz:
+                panel.next_due = now + self.period(panel)
+        
+        for panel in due:
+            key = panel.current_render_key()
+            if key == panel.render_key:
+                # Checked and unchanged: wait a full period before checking again
+                if panel.refresh_hz:
+                    panel.next_due = max(panel.next_due + self.period(panel), now)
+                continue
+            if len(rendered) >= self.max_renders_per_frame or spent >= self.budget_ms:
+                deferred += 1
+                continue
+            panel.refresh(key)
+            spent += panel.last_render_ms
+            rendered.add(panel)
+            if panel.refresh_hz:
+                panel.next_due = max(panel.next_due + self.period(panel), now)
+        
+        self.stats["rendered"] = len(rendered)
+        self.stats["deferred"] = deferred
+        self.stats["frame_ms"] = spent
+        return rendered
+
+# Initialize panel scheduler
+panel_scheduler = PanelScheduler()
+
+class FrameCompositor:
+    """Collects dirty screen rects each frame and presents only those"""
+    
+    def __init__(self, max_rects=32):
+        self.max_rects = max_rects
+        self.dirty = []
+        self.full_redraw = True
+        self.panel_rects = {}  # id(panel) -> rect at last blit
+        self.tracked_rects = {}  # overlay name -> rect it covered last frame
+        self.stats = {"full": 0, "partial": 0, "panel_renders": 0}
+    
+    def mark_dirty(self, rect):
+        """Mark a screen region as changed this frame"""
+        if rect is None:
+            return
+        rect = pygame.Rect(rect).clip(screen.get_rect())
+        if rect.width > 0 and rect.height > 0:
+            self.dirty.append(rect)
+    
+    def mark_tracked(self, name, rect):
+        """Mark an overlay that can move, shrink or vanish: its rect this frame
+        (None if not drawn) plus whatever it covered last frame"""
+        previous = self.tracked_rects.get(name)
+        self.tracked_rects[name] = None if rect is None else pygame.Rect(rect)
+        self.mark_dirty(previous)
+        self.mark_dirty(rect)
+    
+    def mark_full(self):
+        """Present the whole frame this time"""
+        self.full_redraw = True
+    
+    def draw_panels(self, surf, panel_list):
+        """Refresh the panels that are due and blit them all"""
+        rendered_panels = panel_scheduler.refresh(panel_list)
+        self.stats["panel_renders"] += len(rendered_panels)
+        
+        for panel in panel_list:
+            if not panel.visible or panel.surface is None:
+                continue
             
-            # Convert to integers for pygame
-            end_pos = (int(vec_end_x), int(vec_end_y))
-            start_pos = (int(pos[0]), int(pos[1]))
+            rendered = panel in rendered_panels
+            previous = self.panel_rects.get(id(panel))
+            if rendered or previous != panel.rect:
+                self.mark_dirty(panel.rect)
+                if previous is not None and previous != panel.rect:
+                    self.mark_dirty(previous)
+                self.panel_rects[id(panel)] = panel.rect.copy()
             
-            try:
-                pygame.draw.line(screen, color, start_pos, end_pos, 2)
-                
-                # Optional: Draw arrow head
-                arrow_size = 5
-                arrow_angle = velocity_angle + math.pi
-                arrow_points = [
-                    end_pos,
-                    (int(end_pos[0] + arrow_size * math.cos(arrow_angle + 0.5)),
-                     int(end_pos[1] + arrow_size * math.sin(arrow_angle + 0.5))),
-                    (int(end_pos[0] + arrow_size * math.cos(arrow_angle - 0.5)),
-                     int(end_pos[1] + arrow_size * math.sin(arrow_angle - 0.5)))
-                ]
-                pygame.draw.polygon(screen, color, arrow_points)
-            except Exception as e:
-                # Silently skip if there's an error
-                pass
+            surf.blit(panel.surface, panel.rect.topleft)
     
-    # Draw predicted positions (regular targets only)
-    for pred_angle, pred_dist in target.predicted_positions:
-        if math.isnan(pred_angle) or math.isnan(pred_dist):
+    def present(self):
+        """Push dirty regions (or the whole frame) to the display"""
+        if self.full_redraw or len(self.dirty) > self.max_rects:
+            pygame.display.flip()
+            self.stats["full"] += 1
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+            self.stats["partial"] += 1
+        
+        self.dirty = []
+        self.full_redraw = False
+
+# Initialize frame compositor
+frame_compositor = FrameCompositor()
+
+class PerfOverlay:
+    """Debug overlay with per-panel refresh rates and render cost"""
+    
+    def __init__(self, refresh_interval=0.25):
+        self.refresh_interval = refresh_interval
+        self.surface = None
+        self.last_build = 0.0
+    
+    def build(self):
+        font = font_cache.get_font("Courier New", 10, bold=True)
+        color = get_color("accent")
+        sched = panel_scheduler.stats
+        fonts = font_cache.get_stats()
+        
+        lines = [
+            f"FRAME {clock.get_time():3d} ms  FPS {clock.get_fps():5.1f}",
+            f"PANELS {sched['rendered']} rendered / {sched['deferred']} deferred  {sched['frame_ms']:.2f} ms",
+            f"BUDGET {panel_scheduler.budget_ms:.1f} ms, {panel_scheduler.max_renders_per_frame} renders/frame",
+            f"FONTS  {fonts['hit_rate']:.0%} hit  {fonts['surfaces']} cached",
+            f"PRESENT {frame_compositor.stats['full']} full / {frame_compositor.stats['partial']} partial",
+            f"LOD    {lod_renderer.stats['full']} full / {lod_renderer.stats['reduced']} reduced / "
+            f"{lod_renderer.stats['clusters']} clusters ({lod_renderer.stats['clustered']})  {lod_renderer.draw_ms:.2f} ms",
+            f"QUALITY {quality_governor.settings['name']} ({'auto' if quality_governor.enabled else 'off'})"
+            f"  {quality_governor.frame_ms:.1f} ms / {quality_governor.budget_ms:.1f} ms",
+            "STAGES " + " ".join(f"{stage[:3]}:{ms:.1f}" for stage, ms in frame_pipeline.last_ms.items()),
+            "",
+            f"{'PANEL':<22}{'HZ':>4}{'AVG MS':>8}{'LAST':>7}{'N':>6}",
+        ]
+        for panel in panels:
+            hz = f"{panel.refresh_hz}" if panel.refresh_hz else "chg"
+            lines.append(f"{panel.title[:21]:<22}{hz:>4}{panel.render_ms:8.2f}"
+                         f"{panel.last_render_ms:7.2f}{panel.render_count:6d}")
+        
+        line_height = 13
+        width = max(font.size(line)[0] for line in lines) + 16
+        self.surface = pygame.Surface((width, len(lines) * line_height + 12), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 190))
+        for i, line in enumerate(lines):
+            self.surface.blit(font.render_uncached(line, True, color), (8, 6 + i * line_height))
+    
+    def draw(self, surf):
+        """Draw the overlay; returns the rect it covers"""
+        now = time.perf_counter()
+        if self.surface is None or now - self.last_build >= self.refresh_interval:
+            self.build()
+            self.last_build = now
+        rect = self.surface.get_rect(bottomright=(WIDTH - 10, HEIGHT - 30))
+        surf.blit(self.surface, rect)
+        return rect
+
+# Initialize performance overlay
+perf_overlay = PerfOverlay()
+
+# Reach of target decorations past their projected points: labels, icons,
+# selection ring, velocity vectors and the torpedo speed trail (up to 100 px)
+TARGET_DRAW_MARGIN = 110
+
+def radar_dirty_rect():
+    """Screen area touched by the radar display this frame
+    (rings, compass labels, sweep, and targets with their decorations)"""
+    extent = int((RADAR_RADIUS + 45) * zoom_level)
+    rect = pygame.Rect(RADAR_CENTER[0] - extent, RADAR_CENTER[1] - extent, extent * 2, extent * 2)
+    content = projection_cache.bounds()
+    if content is not None:
+        rect.union_ip(content.inflate(TARGET_DRAW_MARGIN * 2, TARGET_DRAW_MARGIN * 2))
+    return rect
+
+# ============================================================================
+# FRAME PIPELINE
+# ============================================================================
+
+def update_tactical_state():
+    """Tracker, classification, mission and analytics updates for this tick"""
+    update_tracker_state()
+    
+    # Refresh stale or drifting classifications (bounded per frame)
+    classification_scheduler.run(target_manager.targets)
+    
+    # Update mission system
+    mission_system.update(target_manager)
+    
+    # Update analytics (decimated per track inside the analyzer)
+    data_analyzer.add_targets(list(target_manager.targets.values()))
+    
+    # Phosphor raster (decays and repaints only while shown)
+    if raster_ppi.enabled:
+        raster_ppi.update(list(target_manager.targets.values()), previous_sweep_angle, sweep_angle)
+
+def evaluate_alerts():
+    """Torpedo detection for all targets (rate-limited inside the detector)"""
+    torpedo_detector.evaluate_targets(target_manager.targets)
+
+def render_frame():
+    """Draw the radar, panels and overlays into the back buffer"""
+    # Draw radar (2D or 3D); the 3D layer covers the whole window, so the first
+    # frame after switching either way (key or quality governor) is a full update
+    show_3d = visualizer_3d.enabled and quality_governor.settings["allow_3d"]
+    if show_3d != visualizer_3d.shown:
+        visualizer_3d.shown = show_3d
+        frame_compositor.mark_full()
+    if show_3d:
+        visualizer_3d.draw_3d_radar(screen, target_manager.targets, render_sweep_angle())
+        frame_compositor.mark_full()
+    else:
+        background_rebuilds = radar_background_cache.rebuilds
+        draw_radar_background()
+        if radar_background_cache.rebuilds != background_rebuilds:
+            frame_compositor.mark_full()
+        draw_sweep_line()
+        
+        # Raster PPI and activity heatmap under the targets
+        if raster_ppi.enabled:
+            raster_ppi.draw(screen)
+        draw_heatmap_overlay()
+        
+        # Draw targets (screen positions projected once per frame)
+        projection_cache.update(target_manager.targets.values())
+        lod_renderer.draw(target_manager.targets.values())
+        frame_compositor.mark_tracked("radar", radar_dirty_rect())
+        
+        # CPA lines and markers for all targets in one pass
+        frame_compositor.mark_tracked("cpa", draw_cpa_visualization())
+    
+    # Draw UI panels (each re-renders offscreen only when its data changed)
+    frame_compositor.draw_panels(screen, panels)
+    
+    # Torpedo alert banner on top of everything; tracked so the last frame's
+    # banner is cleared once the final torpedo is gone
+    frame_compositor.mark_tracked("torpedo_alert", draw_torpedo_alerts())
+    
+    frame_compositor.mark_tracked("perf", perf_overlay.draw(screen) if show_perf_overlay else None)
+    
+    # Draw status bar
+    font_status = font_cache.get_font("Courier New", 10, bold=True)
+    status_items = [
+        f"MODE: {current_mode}",
+        f"TARGETS: {len(target_manager.targets)}",
+        f"RANGE: {range_setting}NM",
+        f"GAIN: {gain_control:.1f}x",
+        f"ZOOM: {zoom_level:.1f}x",
+        f"FPS: {int(clock.get_fps())}"
+    ]
+    status_text = " | ".join(status_items)
+    status_surf = font_status.render(status_text, True, get_color("primary"))
+    screen.blit(status_surf, (10, HEIGHT - 20))
+    frame_compositor.mark_dirty((0, HEIGHT - 25, WIDTH, 25))
+    
+    # Recording indicator
+    if recorder.recording:
+        rec_text = font_status.render("● REC", True, get_color("danger"))
+        screen.blit(rec_text, (WIDTH - 80, HEIGHT - 20))
+    
+    # CRT overlay over the whole finished frame
+    if crt_effect and quality_governor.settings["crt"]:
+        crt_overlay.apply(screen)
+        if crt_overlay.animated:
+            frame_compositor.mark_full()
+    
+    # Add frame to recording
+    if recorder.recording and recorder.record_video:
+        recorder.add_frame(screen)
+
+SWEEP_REFERENCE_HZ = 60  # sweep_speed values are degrees per frame at 60 FPS
+
+def advance_sweep(dt):
+    """Update sweep angle by one simulation step (silent - no sweep sounds)"""
+    global sweep_angle, previous_sweep_angle
+    config = ModeConfig.get_config(current_mode)
+    previous_sweep_angle = sweep_angle
+    if config["sweep_speed"] > 0 and not paused:
+        sweep_angle = (sweep_angle + config["sweep_speed"] * SWEEP_REFERENCE_HZ * dt) % 360
+
+def render_sweep_angle():
+    """Sweep angle interpolated between the last two simulation steps"""
+    delta = (sweep_angle - previous_sweep_angle + 180) % 360 - 180
+    return (previous_sweep_angle + delta * sim_clock.alpha) % 360
+
+class QualityGovernor:
+    """Steps display quality down under load and back up, with hysteresis"""
+    
+    LEVELS = (
+        {"name": "FULL", "trail": 20, "predictions": 5, "panel_rate": 1.0, "cluster_threshold": 4,
+         "crt": True, "crt_animation": True, "heatmap": True, "allow_3d": True,
+         "analytics_interval": 0.5},
+        {"name": "REDUCED", "trail": 10, "predictions": 3, "panel_rate": 0.5, "cluster_threshold": 4,
+         "crt": True, "crt_animation": False, "heatmap": True, "allow_3d": True,
+         "analytics_interval": 0.5},
+        {"name": "LOW", "trail": 4, "predictions": 1, "panel_rate": 0.25, "cluster_threshold": 3,
+         "crt": False, "crt_animation": False, "heatmap": False, "allow_3d": True,
+         "analytics_interval": 1.0},
+        {"name": "MINIMAL", "trail": 0, "predictions": 0, "panel_rate": 0.1, "cluster_threshold": 2,
+         "crt": False, "crt_animation": False, "heatmap": False, "allow_3d": False,
+         "analytics_interval": 2.0},
+    )
+    
+    def __init__(self, target_fps=30, downgrade_after=15, upgrade_after=120, cooldown=30):
+        self.enabled = True
+        self.budget_ms = 1000.0 / target_fps
+        self.downgrade_ms = self.budget_ms * 0.85  # sustained above this -> lower quality
+        self.upgrade_ms = self.budget_ms * 0.45  # sustained below this -> raise quality
+        self.downgrade_after = downgrade_after  # frames
+        self.upgrade_after = upgrade_after  # frames
+        self.cooldown = cooldown  # frames after any change before the next one
+        self.level = 0
+        self.settings = self.LEVELS[0]
+        self.frame_ms = 0.0  # smoothed frame work time
+        self.over = 0
+        self.under = 0
+        self.since_change = 0
+        self.changes = 0
+    
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.set_level(0, "governor disabled")
+        print(f"[QUALITY] Governor {'enabled' if enabled else 'disabled'}")
+    
+    def set_level(self, level, reason=""):
+        """Apply a quality level to the renderer, panels and analytics"""
+        if level == self.level:
+            return
+        old = self.settings["name"]
+        self.level = level
+        self.settings = settings = self.LEVELS[level]
+        
+        projection_cache.set_trail_limit(settings["trail"])
+        Target.prediction_steps = settings["predictions"]
+        panel_scheduler.rate_scale = settings["panel_rate"]
+        lod_renderer.cluster_threshold = settings["cluster_threshold"]
+        crt_overlay.allow_animation = settings["crt_animation"]
+        data_analyzer.default_sample_interval = settings["analytics_interval"]
+        frame_compositor.mark_full()
+        
+        self.over = self.under = self.since_change = 0
+        self.changes += 1
+        print(f"[QUALITY] {old} -> {settings['name']} ({reason})")
+    
+    def update(self, frame_ms):
+        """Feed one frame's work time; may change the quality level"""
+        if not self.enabled:
+            return
+        
+        self.frame_ms += 0.1 * (frame_ms - self.frame_ms)
+        self.since_change += 1
+        
+        if self.frame_ms > self.downgrade_ms:
+            self.over += 1
+            self.under = 0
+        elif self.frame_ms < self.upgrade_ms:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+        
+        if self.since_change < self.cooldown:
+            return
+        
+        reason = f"frame {self.frame_ms:.1f} ms, budget {self.budget_ms:.1f} ms"
+        if self.over >= self.downgrade_after and self.level < len(self.LEVELS) - 1:
+            self.set_level(self.level + 1, reason)
+        elif self.under >= self.upgrade_after and self.level > 0:
+            self.set_level(self.level - 1, reason)
+
+# Initialize quality governor
+quality_governor = QualityGovernor()
+
+class FramePipeline:
+    """Runs the frame stages in order, each with its own timing
+
+    The simulation stages (ingest..alert) run once per fixed simulation step,
+    so their results don't depend on the frame rate; render and present run
+    once per frame.
+    """
+    
+    STAGES = ("ingest", "detect", "associate", "tactical", "alert", "render", "present")
+    
+    def __init__(self, headless=False, history=600):
+        self.headless = headless  # skip render/present (no display needed)
+        self.timings = {stage: deque(maxlen=history) for stage in self.STAGES}
+        self.last_ms = {stage: 0.0 for stage in self.STAGES}
+        self.frame_ms = 0.0
+        self.ticks = 0
+    
+    def set_headless(self, headless):
+        self.headless = headless
+    
+    def _run(self, stage, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.timings[stage].append(elapsed)
+        self.last_ms[stage] = elapsed
+        return result
+    
+    def tick(self, dt=None):
+        """Run one frame: ingest -> detect -> associate -> tactical -> alert -> render -> present"""
+        start = time.perf_counter()
+        for _ in range(sim_clock.advance(dt)):
+            sim_clock.step()
+            audio_data = self._run("ingest", ingest_audio)
+            detection = self._run("detect", analyze_audio, audio_data)
+            self._run("associate", associate_detection, detection)
+            self._run("tactical", update_tactical_state)
+            self._run("alert", evaluate_alerts)
+            advance_sweep(sim_clock.step_seconds)
+        
+        if not self.headless:
+            self._run("render", render_frame)
+            self._run("present", frame_compositor.present)
+        
+        self.frame_ms = (time.perf_counter() - start) * 1000
+        quality_governor.update(self.frame_ms)
+        self.ticks += 1
+    
+    def percentiles(self, stage, qs=(50, 95, 99)):
+        """Timing percentiles (ms) for one stage over the recent history"""
+        samples = self.timings[stage]
+        if not samples:
+            return {q: 0.0 for q in qs}
+        values = np.percentile(np.fromiter(samples, dtype=np.float64), qs)
+        return dict(zip(qs, values.tolist()))
+    
+    def get_stats(self):
+        """Mean, p95 and last timing per stage"""
+        stats = {}
+        for stage in self.STAGES:
+            samples = self.timings[stage]
+            stats[stage] = {
+                "last_ms": self.last_ms[stage],
+                "mean_ms": sum(samples) / len(samples) if samples else 0.0,
+                "p95_ms": self.percentiles(stage, (95,))[95],
+                "count": len(samples),
+            }
+        return stats
+    
+    def reset(self):
+        for stage in self.STAGES:
+            self.timings[stage].clear()
+            self.last_ms[stage] = 0.0
+        self.ticks = 0
+
+# Initialize frame pipeline
+frame_pipeline = FramePipeline()
+
+# ============================================================================
+# HEADLESS BENCHMARK
+# ============================================================================
+
+class FixedStepClock:
+    """Stand-in for pygame.time.Clock that never sleeps and reports a fixed rate"""
+    
+    def __init__(self, fps):
+        self.fps = fps
+        self.step_ms = 1000.0 / fps
+        self.frames = 0
+    
+    def tick(self, framerate=0):
+        self.frames += 1
+        return int(self.step_ms)
+    
+    def get_time(self):
+        return int(self.step_ms)
+    
+    def get_rawtime(self):
+        return int(self.step_ms)
+    
+    def get_fps(self):
+        return float(self.fps)
+
+class SyntheticAudioSource:
+    """Stereo test signal: a few tones sweeping in bearing over noise"""
+    
+    def __init__(self, seed=0, tones=(180.0, 650.0, 1500.0), level=0.05, noise=0.002):
+        self.rng = np.random.default_rng(seed)
+        self.tones = tones
+        self.level = level
+        self.noise = noise
+        self.position = 0
+    
+    def read(self, frames):
+        t = (self.position + np.arange(frames)) / FS
+        # One tone at a time, switching every second
+        freq = self.tones[int(self.position / FS) % len(self.tones)]
+        tone = self.level * np.sin(2 * np.pi * freq * t)
+        # Slowly varying inter-channel delay gives the detector a moving bearing
+        delay = int(8 * math.sin(self.position / FS * 0.5))
+        left = tone + self.rng.normal(0, self.noise, frames)
+        right = np.roll(tone, delay) + self.rng.normal(0, self.noise, frames)
+        self.position += frames
+        return np.column_stack((left, right)).astype(np.float32)
+
+class WavAudioSource:
+    """Loops a WAV file block by block (mono files are duplicated to stereo)"""
+    
+    def __init__(self, path):
+        rate, data = wavfile.read(path)
+        if rate != FS:
+            print(f"[BENCH] Warning: {path} is {rate} Hz, analysis assumes {FS} Hz")
+        if np.issubdtype(data.dtype, np.integer):
+            data = data.astype(np.float32) / np.iinfo(data.dtype).max
+        if data.ndim == 1:
+            data = np.column_stack((data, data))
+        self.data = data[:, :CHANNELS].astype(np.float32)
+        self.position = 0
+    
+    def read(self, frames):
+        idx = (self.position + np.arange(frames)) % len(self.data)
+        self.position = (self.position + frames) % len(self.data)
+        return self.data[idx]
+
+def seed_benchmark_targets(count, seed=0):
+    """Create `count` targets moving on straight lines; returns their motion"""
+    rng = random.Random(seed)
+    motions = []
+    for _ in range(count):
+        target = Target(rng.uniform(0, 360), rng.uniform(20, RADAR_RADIUS * 0.9), rng.uniform(0.2, 1.0),
+                        ["Benchmark"], rng.choice(TargetHistoryStore.THREAT_LEVELS), current_mode)
+        target_manager.targets[target.id] = target
+        # Degrees and pixels per second (up to ~20 knots)
+        motions.append((target, rng.uniform(-0.5, 0.5), rng.uniform(-0.04, 0.04)))
+    return motions
+
+def run_benchmark(frames=600, input_path=None, targets=0, render=True, seed=0, time_scale=1.0,
+                  governor=False):
+    """Run the frame pipeline for a fixed number of ticks and print stage percentiles"""
+    global clock, audio_enabled
+    
+    sim_clock.set_time_scale(time_scale)
+    quality_governor.enabled = governor  # fixed quality unless asked, so runs compare
+    random.seed(seed)
+    np.random.seed(seed)
+    source = WavAudioSource(input_path) if input_path else SyntheticAudioSource(seed)
+    clock = FixedStepClock(FPS)
+    audio_enabled = True
+    
+    motions = seed_benchmark_targets(targets, seed)
+    frame_pipeline.reset()
+    frame_pipeline.set_headless(not render)
+    classification_service.start()
+    
+    print(f"[BENCH] {frames} frames, {'WAV ' + input_path if input_path else 'synthetic'} input, "
+          f"{targets} seeded targets, render {'on' if render else 'off'}")
+    
+    # One block per simulation step, so scaled replays read audio faster too
+    blocks_per_frame = max(1, int(round(time_scale)))
+    start = time.perf_counter()
+    for _ in range(frames):
+        for _ in range(blocks_per_frame):
+            audio_queue.append(source.read(CHUNK))
+        # Keep seeded tracks alive and moving
+        for target, d_angle, d_dist in motions:
+            target.update((target.angle + d_angle / FPS) % 360,
+                          min(max(target.distance + d_dist / FPS, 5.0), RADAR_RADIUS), target.intensity)
+        frame_pipeline.tick(1.0 / FPS)
+        clock.tick(FPS)
+    elapsed = time.perf_counter() - start
+    
+    classification_service.shutdown()
+    
+    report = {
+        "frames": frames,
+        "targets": len(target_manager.targets),
+        "wall_seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "quality": quality_governor.settings["name"],
+        "stages": {},
+    }
+    print(f"[BENCH] {'STAGE':<10}{'P50 MS':>9}{'P95 MS':>9}{'P99 MS':>9}{'MEAN MS':>9}")
+    for stage in FramePipeline.STAGES:
+        samples = frame_pipeline.timings[stage]
+        if not samples:
             continue
-            
-        try:
-            pred_x = RADAR_CENTER[0] + pred_dist * math.cos(math.radians(pred_angle - 90)) * zoom_level
-            pred_y = RADAR_CENTER[1] + pred_dist * math.sin(math.radians(pred_angle - 90)) * zoom_level
-            
-            pred_x = float(pred_x)
-            pred_y = float(pred_y)
-            
-            if not (math.isnan(pred_x) or math.isnan(pred_y)):
-                pred_color = (*color[:3], 100)
-                pygame.draw.circle(screen, pred_color, (int(pred_x), int(pred_y)), 3)
-        except Exception as e:
-            # Silently skip
-            pass
+        pct = frame_pipeline.percentiles(stage, (50, 95, 99))
+        mean = sum(samples) / len(samples)
+        report["stages"][stage] = {"p50_ms": pct[50], "p95_ms": pct[95], "p99_ms": pct[99], "mean_ms": mean}
+        print(f"[BENCH] {stage:<10}{pct[50]:9.3f}{pct[95]:9.3f}{pct[99]:9.3f}{mean:9.3f}")
+    print(f"[BENCH] {report['fps']:.1f} frames/s wall clock, {report['targets']} targets at end")
+    return report
 
+def run_blip_benchmark(counts=(10, 100, 1000), frames=100, seed=0):
+    """Time per-target draw_target against the batched blip renderer"""
+    print(f"[BENCH] Blip drawing, {frames} frames per size")
+    print(f"[BENCH] {'TARGETS':>7} {'DRAW_TARGET MS':>15} {'BLITS MS':>9} {'SPEEDUP':>8}")
+    results = []
+    for count in counts:
+        target_manager.targets.clear()
+        target_manager.selected_target = None
+        motions = seed_benchmark_targets(count, seed)
+        # Give every track a full trail and predictions so both paths draw the same detail
+        for _ in range(20):
+            for target, d_angle, d_dist in motions:
+                target.update((target.angle + d_angle) % 360,
+                              min(max(target.distance + d_dist * 20, 5.0), RADAR_RADIUS), target.intensity)
+        targets = list(target_manager.targets.values())
+        projection_cache.update(targets)
+        items = [(target, True) for target in targets]
+        
+        timings = {}
+        for name, draw in (("draw_target", lambda: [draw_target(t) for t in targets]),
+                           ("blits", lambda: blip_renderer.draw(items))):
+            draw()  # warm the caches
+            elapsed = 0.0
+            for _ in range(frames):
+                screen.fill((0, 0, 0))
+                start = time.perf_counter()
+                draw()
+                elapsed += time.perf_counter() - start
+            timings[name] = elapsed * 1000 / frames
+        
+        speedup = timings["draw_target"] / max(timings["blits"], 1e-9)
+        print(f"[BENCH] {count:>7} {timings['draw_target']:>15.3f} {timings['blits']:>9.3f} {speedup:>7.1f}x")
+        results.append({"targets": count, "draw_target_ms": timings["draw_target"],
+                        "blits_ms": timings["blits"], "speedup": speedup})
+    target_manager.targets.clear()
+    return {"blip_benchmark": results}
 
 def main():
     """Main application loop"""
-    global sweep_angle, current_mode, narrow_beam_angle, dragged_panel
+    global current_mode, narrow_beam_angle, dragged_panel
     global zoom_level, paused, brightness, show_grid, show_compass, crt_effect
     global range_setting, gain_control, frequency_filter, noise_gate
     global current_theme_name, theme, WIDTH, HEIGHT, screen
@@ -4905,6 +7458,9 @@ def main():
     print("\nPress H for keyboard shortcuts help")
     print("SOUND SYSTEM: Only plays for target detections\n")
     
+    # Fork classification workers before the audio stream thread starts
+    classification_service.start()
+    
     # Start audio stream if available
     if stream and audio_enabled:
         stream.start()
@@ -4954,201 +7510,17 @@ def main():
                 # Handle window resize
                 WIDTH, HEIGHT = event.w, event.h
                 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+                crt_overlay.invalidate()
+                frame_compositor.mark_full()
         
         if paused:
+            sim_clock.hold()
+            frame_compositor.mark_full()
             pygame.display.flip()
             clock.tick(FPS)
             continue
         
-        # Audio analysis
-        analyze_audio()
-        draw_torpedo_alerts()
-        
-        # ========== ADD THIS SECTION HERE ==========
-        # Update background noise level for SNR analyzer
-        if audio_enabled and len(audio_queue) > 0:
-            try:
-                audio_data = audio_queue[-1]
-                if audio_data.shape[1] == 2:
-                    audio_mono = np.mean(audio_data, axis=1)
-                else:
-                    audio_mono = audio_data[:, 0]
-                snr_analyzer.update_background_noise(audio_mono)
-            except:
-                pass
-
-        # Torpedo detection for all targets
-        for target_id, target in target_manager.targets.items():
-            # Calculate speed in knots
-            speed_knots = abs(target.velocity * 3600 * (50 / RADAR_RADIUS))
-            
-            # Only check high-speed targets
-            if speed_knots > 25:  # 25+ knots is suspicious
-                torpedo_prob, torpedo_type = torpedo_detector.analyze_for_torpedoes(
-                    target_id, 
-                    target, 
-                    target.acoustic_signature
-                )
-                
-                if torpedo_prob > 0.5:
-                    torpedo_detector.detect_torpedo(target_id, target, torpedo_prob, torpedo_type)
-        # ========== END OF ADDED SECTION ==========
-        
-        # Process sonar echoes
-        if current_mode == DetectionMode.ACTIVE_SONAR:
-            process_sonar_echoes()
-        
-        # Update mission system
-        mission_system.update(target_manager)
-        
-        # Update analytics
-        for target in target_manager.targets.values():
-            data_analyzer.add_target_data(target)
-        
-        # Draw radar (2D or 3D)
-        if visualizer_3d.enabled:
-            visualizer_3d.draw_3d_radar(screen, target_manager.targets, sweep_angle)
-        else:
-            draw_radar_background()
-            draw_sweep_line()
-            
-            # Draw targets
-            for target in target_manager.targets.values():
-                draw_target(target)
-                draw_cpa_visualization() 
-                   
-        # Draw radar
-        draw_radar_background()
-        draw_sweep_line()
-        
-        # Target detection and updates
-        config = ModeConfig.get_config(current_mode)
-        current_time = pygame.time.get_ticks()
-        
-        # Lower threshold for detection and add debug
-        detection_threshold = 0.001   # Very low threshold
-        
-        if current_noise_data["intensity"] > detection_threshold and current_noise_data["detected_sounds"]:
-            detected_angle = math.degrees(current_noise_data["angle"])
-            
-            # Debug output
-            if pygame.time.get_ticks() % 1000 < 20:
-                print(f"[DETECT] Angle: {detected_angle:.1f}° | Intensity: {current_noise_data['intensity']:.3f} | Freq: {current_noise_data['dominant_freq']:.0f}Hz")
-            
-            # Mode-specific detection logic
-            should_detect = False
-            
-            if current_mode == DetectionMode.OMNI_360:
-                should_detect = True
-            elif current_mode == DetectionMode.NARROW_BEAM:
-                angle_diff = abs(detected_angle - narrow_beam_angle)
-                if angle_diff > 180:
-                    angle_diff = 360 - angle_diff
-                if angle_diff < config["detection_arc"] / 2:
-                    should_detect = True
-            elif current_mode == DetectionMode.WIDE_BEAM:
-                angle_diff = abs((sweep_angle % 360) - (detected_angle % 360))
-                if angle_diff > 180:
-                    angle_diff = 360 - angle_diff
-                if angle_diff < config["detection_arc"] / 2:
-                    should_detect = True
-            else:  # PASSIVE or ACTIVE_SONAR
-                angle_diff = abs((sweep_angle % 360) - (detected_angle % 360))
-                if angle_diff < 15 or angle_diff > 345:
-                    should_detect = True
-            
-            if should_detect:
-                dist = min(current_noise_data["intensity"] * 15 * config["range_multiplier"], RADAR_RADIUS * 0.9)
-                types = [s["type"] for s in current_noise_data["detected_sounds"]]
-                
-                target = target_manager.update_or_create(
-                    detected_angle,
-                    dist,
-                    current_noise_data["intensity"],
-                    types,
-                    current_noise_data["primary_threat"],
-                    current_mode
-                )
-                
-                if target:
-                    print(f"[TARGET] Created/Updated target {target.id} at angle {detected_angle:.1f}°, distance {dist:.1f}")
-                    
-                    # PLAY SOUND ONLY WHEN TARGET IS DETECTED
-                    
-                    # Only play sound if enough time has passed since last detection for this target
-                    # or if it's a new target
-                    if (target.id not in last_detection_time or 
-                        current_time - last_detection_time[target.id] > 1000):  # 1 second cooldown
-                        
-                        sound_system.play_target_detection(
-                            target.threat_level, 
-                            target.intensity
-                        )
-                        last_detection_time[target.id] = current_time
-        
-        # Update all targets
-        target_manager.update_all()
-        target_manager.check_collisions()
-        
-        # Draw targets
-        for target in target_manager.targets.values():
-            draw_target(target)
-            draw_cpa_visualization()
-            
-        # Draw UI panels
-        for i, panel in enumerate(panels):
-            if i == 0:
-                draw_mode_selector(panel)
-            elif i == 1:
-                draw_system_status(panel)
-            elif i == 2:
-                draw_own_ship_data(panel)
-            elif i == 3:
-                draw_tracked_targets(panel)
-            elif i == 4:
-                draw_acoustic_sensor(panel)
-            elif i == 5:
-                draw_recording_control(panel)
-            elif i == 6:
-                    draw_analytics_dashboard(panel)  
-            elif i == 7:
-                draw_mission_control(panel)
-            elif i == 8:  # Bearing Rate panel
-                draw_bearing_rate_panel(panel)
-            elif i == 9:  # SNR Analysis panel
-                draw_snr_panel(panel)
-            elif i == 10: # Torpedo Defense panel
-                draw_torpedo_panel(panel) 
-                  
-        # Draw status bar
-        font_status = pygame.font.SysFont("Courier New", 10, bold=True)
-        status_items = [
-            f"MODE: {current_mode}",
-            f"TARGETS: {len(target_manager.targets)}",
-            f"RANGE: {range_setting}NM",
-            f"GAIN: {gain_control:.1f}x",
-            f"ZOOM: {zoom_level:.1f}x",
-            f"FPS: {int(clock.get_fps())}"
-        ]
-        status_text = " | ".join(status_items)
-        status_surf = font_status.render(status_text, True, get_color("primary"))
-        screen.blit(status_surf, (10, HEIGHT - 20))
-        
-        # Recording indicator
-        if recorder.recording:
-            rec_text = font_status.render("● REC", True, get_color("danger"))
-            screen.blit(rec_text, (WIDTH - 80, HEIGHT - 20))
-        
-        # Add frame to recording
-        if recorder.recording and recorder.record_video:
-            recorder.add_frame(screen)
-        
-        # Update display
-        pygame.display.flip()
-        
-        # Update sweep angle (silent - no sweep sounds)
-        if config["sweep_speed"] > 0 and not paused:
-            sweep_angle = (sweep_angle + config["sweep_speed"]) % 360
+        frame_pipeline.tick()
         
         clock.tick(FPS)
     
@@ -5160,8 +7532,38 @@ def main():
         stream.stop()
         stream.close()
     
+    classification_service.shutdown()
+    
     pygame.quit()
     print("\n[SYSTEM] Radar system shutdown complete")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if HEADLESS:
+        import argparse
+        parser = argparse.ArgumentParser(description="Headless frame pipeline benchmark")
+        parser.add_argument("--headless", action="store_true")
+        parser.add_argument("--frames", type=int, default=600, help="ticks to run")
+        parser.add_argument("--input", help="WAV file to loop instead of synthetic audio")
+        parser.add_argument("--targets", type=int, default=0, help="extra moving targets to seed")
+        parser.add_argument("--no-render", action="store_true", help="skip render/present stages")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--time-scale", type=float, default=1.0,
+                            help="simulation steps per frame step (replay faster than real time)")
+        parser.add_argument("--governor", action="store_true", help="let the quality governor adapt")
+        parser.add_argument("--blips", action="store_true",
+                            help="compare draw_target with batched blip drawing at 10/100/1000 targets")
+        parser.add_argument("--report", help="write the timing report to this JSON file")
+        args = parser.parse_args()
+        
+        if args.blips:
+            report = run_blip_benchmark(frames=args.frames, seed=args.seed)
+        else:
+            report = run_benchmark(args.frames, args.input, args.targets, not args.no_render, args.seed,
+                                   args.time_scale, args.governor)
+        if args.report:
+            with open(args.report, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"[BENCH] Report written to {args.report}")
+        pygame.quit()
+    else:
+        main()
\ No newline at end of file
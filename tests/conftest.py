@@ -0,0 +1,33 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# main.py opens a window at import time; use SDL's dummy drivers under test
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def radar(tmp_path_factory):
+    """The main module, imported from a scratch directory (it creates output folders)"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("radar"))
+    try:
+        module = importlib.import_module("main")
+    finally:
+        os.chdir(cwd)
+    return module
+
+
+@pytest.fixture
+def target_manager(radar):
+    """The shared target manager, emptied before and after each test"""
+    radar.target_manager.clear_all()
+    yield radar.target_manager
+    radar.target_manager.clear_all()
@@ -0,0 +1,30 @@
+def add_target(radar, manager, angle, distance):
+    target = radar.Target(angle, distance, 0.5, ["test"], "NEUTRAL", radar.current_mode)
+    manager.targets[target.id] = target
+    return target
+
+
+def test_no_targets(radar, target_manager):
+    target_manager.check_collisions()
+    assert target_manager.collision_pairs == []
+
+
+def test_single_target(radar, target_manager):
+    add_target(radar, target_manager, 0, 50)
+    target_manager.check_collisions()
+    assert target_manager.collision_pairs == []
+
+
+def test_no_collision_when_tracks_are_apart(radar, target_manager):
+    add_target(radar, target_manager, 0, 50)
+    add_target(radar, target_manager, 90, 200)
+    target_manager.check_collisions()
+    assert target_manager.collision_pairs == []
+
+
+def test_close_tracks_collide(radar, target_manager):
+    a = add_target(radar, target_manager, 45, 100)
+    b = add_target(radar, target_manager, 46, 105)
+    add_target(radar, target_manager, 200, 300)
+    target_manager.check_collisions()
+    assert [{id(x), id(y)} for x, y in target_manager.collision_pairs] == [{id(a), id(b)}]
@@ -0,0 +1,23 @@
+def test_tracked_overlay_clears_last_rect_when_it_vanishes(radar):
+    compositor = radar.FrameCompositor()
+    banner = radar.pygame.Rect(0, 400, 800, 80)
+
+    compositor.mark_tracked("banner", banner)
+    assert compositor.dirty == [banner]
+    compositor.present()
+
+    compositor.mark_tracked("banner", None)
+    assert compositor.dirty == [banner]
+    compositor.present()
+
+    compositor.mark_tracked("banner", None)
+    assert compositor.dirty == []
+
+
+def test_tracked_overlay_marks_old_and_new_rect_when_it_shrinks(radar):
+    compositor = radar.FrameCompositor()
+    compositor.mark_tracked("perf", (10, 10, 300, 200))
+    compositor.present()
+
+    compositor.mark_tracked("perf", (10, 10, 300, 100))
+    assert compositor.dirty == [radar.pygame.Rect(10, 10, 300, 200), radar.pygame.Rect(10, 10, 300, 100)]
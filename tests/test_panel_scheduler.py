@@ -0,0 +1,36 @@
+def make_panel(radar, refresh_hz=2):
+    calls = {"version": 0, "draw": 0}
+
+    def version():
+        calls["version"] += 1
+        return "unchanged"
+
+    def draw(panel):
+        calls["draw"] += 1
+
+    panel = radar.DraggablePanel(0, 0, 100, 50, "Test")
+    panel.bind(draw, version, refresh_hz=refresh_hz)
+    return panel, calls
+
+
+def test_due_but_unchanged_panel_waits_a_full_period(radar):
+    scheduler = radar.PanelScheduler()
+    panel, calls = make_panel(radar, refresh_hz=2)  # 0.5 s period
+
+    scheduler.refresh([panel], now=0.0)  # first render
+    assert calls["draw"] == 1
+    checks = calls["version"]
+
+    # Due at 0.5 s: version checked once, nothing to redraw
+    scheduler.refresh([panel], now=0.6)
+    assert calls["version"] == checks + 1
+    assert calls["draw"] == 1
+
+    # Not checked again until the next period
+    for now in (0.65, 0.8, 0.95):
+        scheduler.refresh([panel], now=now)
+    assert calls["version"] == checks + 1
+
+    scheduler.refresh([panel], now=1.05)
+    assert calls["version"] == checks + 2
+    assert calls["draw"] == 1
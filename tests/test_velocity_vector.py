@@ -0,0 +1,19 @@
+import math
+
+import pytest
+
+
+@pytest.mark.parametrize("course, probe", [
+    (0, (400, 360)),    # north is up
+    (90, (440, 400)),   # east is right
+    (180, (400, 440)),
+    (270, (360, 400)),
+])
+def test_velocity_vector_follows_compass_course(radar, course, probe):
+    target = radar.Target(0, 100, 0.5, ["test"], "NEUTRAL", radar.current_mode)
+    target.velocity = 20
+    target.velocity_angle = math.radians(course)
+
+    radar.screen.fill((0, 0, 0))
+    radar.draw_velocity_vector(target, (400, 400), (255, 255, 255))
+    assert radar.screen.get_at(probe)[:3] == (255, 255, 255)